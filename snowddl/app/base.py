@@ -1,5 +1,5 @@
 from argparse import ArgumentParser, HelpFormatter
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from cryptography.hazmat.primitives import serialization
 from importlib.util import module_from_spec, spec_from_file_location
 from json import loads as json_loads
@@ -12,12 +12,18 @@ from string import ascii_uppercase, digits
 from time import perf_counter
 from traceback import TracebackException
 
-from snowddl.blueprint import Ident, ObjectType
+from snowddl.blueprint import Ident, IdentPattern, ObjectType
 from snowddl.config import SnowDDLConfig
+from snowddl.connection_pool import SnowDDLConnectionPool
 from snowddl.engine import SnowDDLEngine
+from snowddl.error import SnowDDLExecuteError
 from snowddl.parser import default_parse_sequence, DirectoryScanner, PermissionModelParser, PlaceholderParser
-from snowddl.resolver import default_resolve_sequence, default_destroy_sequence
+from snowddl.resolver import default_resolve_sequence, default_destroy_sequence, ResolverScheduler
+from snowddl.plan_output import SnowDDLPlanOutput
+from snowddl.saved_plan import SnowDDLSavedPlan
 from snowddl.settings import SnowDDLSettings
+from snowddl.snapshot import SnowDDLRecordConnection, SnowDDLReplayConnection
+from snowddl.trace import SnowDDLTracer
 from snowddl.validator import default_validate_sequence
 from snowddl.version import __version__
 
@@ -37,6 +43,7 @@ class BaseApp:
         self.arg_parser = self.init_arguments_parser()
         self.args = self.init_arguments()
         self.logger = self.init_logger()
+        self.tracer = self.init_tracer()
 
         with self.measure_elapsed_time("InitConfig"):
             self.env_prefix = self.init_env_prefix()
@@ -144,6 +151,109 @@ class BaseApp:
         parser.add_argument(
             "--max-workers", help="Maximum number of workers to resolve objects in parallel", default=None, type=int
         )
+        parser.add_argument(
+            "--max-resolver-workers",
+            help="Maximum number of independent resolvers running concurrently (default: 1, resolvers run one by one)",
+            default=None,
+            type=int,
+        )
+        parser.add_argument(
+            "--connection-pool-size",
+            help="Number of additional Snowflake sessions used by parallel workers (default: 0, all workers share one session)",
+            default=None,
+            type=int,
+        )
+        parser.add_argument(
+            "--async-ddl",
+            help="Submit DDL queries asynchronously and poll query status, keeps many queries in flight without extra threads",
+            default=False,
+            action="store_true",
+        )
+        parser.add_argument(
+            "--max-async-queries",
+            help="Maximum number of asynchronous DDL queries in flight (default: 200)",
+            default=None,
+            type=int,
+        )
+        parser.add_argument(
+            "--max-batch-statements",
+            help="Send GRANT and REVOKE statements of the same object in multi-statement batches of this size (default: 0, no batching)",
+            default=None,
+            type=int,
+        )
+        parser.add_argument(
+            "--max-query-retries",
+            help="Retry queries failed due to network errors or throttling up to this number of times (default: 0, no retries)",
+            default=None,
+            type=int,
+        )
+        parser.add_argument(
+            "--adaptive-concurrency",
+            help="Adjust number of concurrently running queries (up to --max-workers) based on query latency and throttling errors",
+            default=False,
+            action="store_true",
+        )
+        parser.add_argument(
+            "--metadata-cache",
+            help="Path to persistent cache of SHOW and DESC results, read by {plan} and {validate}, invalidated by {apply} and {destroy}",
+            metavar="PATH",
+            default=None,
+        )
+        parser.add_argument(
+            "--metadata-cache-ttl",
+            help="Time to live of metadata cache entries in seconds (default: 3600)",
+            default=None,
+            type=int,
+        )
+        parser.add_argument(
+            "--state-file",
+            help="Path to state file, compare is skipped for objects unchanged since previous successful apply",
+            metavar="PATH",
+            default=None,
+        )
+        parser.add_argument(
+            "--out",
+            help="Action [plan] only: save resolved changes to this file, apply them later with --plan",
+            metavar="PATH",
+            default=None,
+        )
+        parser.add_argument(
+            "--plan",
+            help="Action [apply] only: apply changes from saved plan file without resolving objects again",
+            metavar="PATH",
+            default=None,
+        )
+        parser.add_argument(
+            "--trace-file",
+            help="Write execution trace in Chrome trace event format (Perfetto, speedscope) to this file",
+            metavar="PATH",
+            default=None,
+        )
+        parser.add_argument(
+            "--query-metrics-file",
+            help="Write query latency metrics to this file, Prometheus text format for *.prom files, JSON otherwise",
+            metavar="PATH",
+            default=None,
+        )
+        parser.add_argument(
+            "--query-metrics-top",
+            help="Number of the slowest objects in query latency metrics (default: 10)",
+            metavar="N",
+            default=10,
+            type=int,
+        )
+        parser.add_argument(
+            "--plan-output",
+            help="Write executed and suggested DDL to this file as soon as each object is resolved, instead of keeping it in memory",
+            metavar="PATH",
+            default=None,
+        )
+        parser.add_argument(
+            "--plan-output-format",
+            help="Format of plan output file (possible values: jsonl, sql; default: sql for *.sql files, jsonl otherwise)",
+            choices=SnowDDLPlanOutput.formats,
+            default=None,
+        )
         parser.add_argument(
             "--query-tag",
             help="Add QUERY_TAG to all queries produced by SnowDDL",
@@ -162,6 +272,12 @@ class BaseApp:
             "--show-timers", help="Show debug timers", default=False, action="store_true"
         )
         # fmt: on
+        parser.add_argument(
+            "--show-query-metrics",
+            help="Show query latency percentiles per resolver and per statement kind, and the slowest objects",
+            default=False,
+            action="store_true",
+        )
         parser.add_argument(
             "--show-unused-files", help="Show warnings for unused config files", default=False, action="store_true"
         )
@@ -184,6 +300,19 @@ class BaseApp:
             default=None,
             metavar="",
         )
+        parser.add_argument(
+            "--target",
+            help="Resolve only objects matching pattern (e.g. DB1.SCHEMA_*, !DB2.*) and objects nested into them, can be repeated",
+            default=None,
+            metavar="PATTERN",
+            action="append",
+        )
+        parser.add_argument(
+            "--check-affected-views-only",
+            help="Query unchanged views only if objects they refer to were changed during this run, instead of querying every view",
+            default=False,
+            action="store_true",
+        )
 
         # Apply even more unsafe changes
         parser.add_argument(
@@ -294,6 +423,20 @@ class BaseApp:
             help="Clone from another environment with different env_prefix",
         )
 
+        # Metadata snapshots
+        parser.add_argument(
+            "--record-snapshot",
+            help="Record results of all queries into snapshot file, which can be replayed later for offline {plan}",
+            default=None,
+            metavar="PATH",
+        )
+        parser.add_argument(
+            "--replay-snapshot",
+            help="Serve results of all queries from previously recorded snapshot file, do not connect to Snowflake",
+            default=None,
+            metavar="PATH",
+        )
+
         # Destroy without env prefix
         parser.add_argument(
             "--destroy-without-prefix", help="Allow {destroy} action without --env-prefix", default=False, action="store_true"
@@ -315,7 +458,8 @@ class BaseApp:
     def init_arguments(self):
         args = vars(self.arg_parser.parse_args())
 
-        if not self.validate_auth_args(args):
+        # Replay does not connect to Snowflake, no authentication is required
+        if not args.get("replay_snapshot") and not self.validate_auth_args(args):
             self.arg_parser.print_help()
             exit(1)
 
@@ -356,6 +500,12 @@ class BaseApp:
 
         return logger
 
+    def init_tracer(self):
+        if self.args.get("trace_file"):
+            return SnowDDLTracer(Path(self.args.get("trace_file")))
+
+        return None
+
     def init_env_prefix(self):
         env_prefix_value = self.args.get("env_prefix")
         env_prefix_separator = self.args.get("env_prefix_separator")
@@ -423,8 +573,9 @@ class BaseApp:
 
         # All blueprints
         for parser_cls in self.parse_sequence:
-            parser = parser_cls(config, scanner)
-            parser.load_blueprints()
+            with self.trace_span(parser_cls.__name__, "parse"):
+                parser = parser_cls(config, scanner)
+                parser.load_blueprints()
 
             parser_error_count += len(parser.errors)
 
@@ -448,8 +599,9 @@ class BaseApp:
 
         # Run validators after all parsers and programmatic configs
         for validator_cls in self.validate_sequence:
-            validator = validator_cls(config)
-            validator.validate()
+            with self.trace_span(validator_cls.__name__, "validate"):
+                validator = validator_cls(config)
+                validator.validate()
 
             validator_error_count += len(validator.errors)
 
@@ -465,7 +617,8 @@ class BaseApp:
     def init_settings(self):
         settings = SnowDDLSettings()
 
-        if self.args.get("action") in ("apply", "destroy"):
+        # Saved plan is resolved with the same settings as apply, statements to execute are recorded instead
+        if self.args.get("action") in ("apply", "destroy") or (self.args.get("action") == "plan" and self.args.get("out")):
             settings.execute_safe_ddl = True
 
             if self.args.get("apply_unsafe") or self.args.get("action") == "destroy":
@@ -569,14 +722,113 @@ class BaseApp:
             except KeyError as e:
                 raise ValueError(f"Invalid object type [{str(e)}]")
 
+        if self.args.get("target"):
+            sub_patterns = [p for t in self.args.get("target") for p in str(t).split("|")]
+
+            # Exclusions without positive sub-patterns target all other objects
+            if all(p.startswith("!") for p in sub_patterns):
+                sub_patterns.insert(0, "*")
+
+            settings.target = IdentPattern("|".join(sub_patterns))
+
+        if self.args.get("check_affected_views_only"):
+            settings.check_affected_views_only = True
+
         if self.args.get("max_workers"):
             settings.max_workers = int(self.args.get("max_workers"))
 
+        if self.args.get("max_resolver_workers"):
+            settings.max_resolver_workers = int(self.args.get("max_resolver_workers"))
+
+        if self.args.get("connection_pool_size"):
+            settings.connection_pool_size = int(self.args.get("connection_pool_size"))
+
+        if self.args.get("async_ddl"):
+            settings.execute_async_ddl = True
+
+        if self.args.get("max_async_queries"):
+            settings.max_async_queries = int(self.args.get("max_async_queries"))
+
+        if self.args.get("max_batch_statements"):
+            settings.max_batch_statements = int(self.args.get("max_batch_statements"))
+
+        if settings.execute_async_ddl and settings.max_batch_statements > 1:
+            raise ValueError("Arguments --async-ddl and --max-batch-statements cannot be used together")
+
+        if self.args.get("adaptive_concurrency"):
+            settings.adaptive_concurrency = True
+
+        if self.args.get("max_query_retries"):
+            settings.max_query_retries = int(self.args.get("max_query_retries"))
+
+        if settings.execute_async_ddl and settings.adaptive_concurrency:
+            raise ValueError("Arguments --async-ddl and --adaptive-concurrency cannot be used together")
+
+        if self.args.get("metadata_cache"):
+            # Cached metadata might be outdated, it must never drive execution of DDL
+            # Actions executing DDL only invalidate cached results of objects touched by DDL
+            if self.args.get("action") == "plan" and self.args.get("out"):
+                raise ValueError("Argument --metadata-cache cannot be used together with --out")
+
+            settings.metadata_cache_path = self.args.get("metadata_cache")
+
+        if self.args.get("metadata_cache_ttl"):
+            settings.metadata_cache_ttl = int(self.args.get("metadata_cache_ttl"))
+
+        if self.args.get("state_file"):
+            settings.state_file_path = self.args.get("state_file")
+
+        if self.args.get("out"):
+            if self.args.get("action") != "plan":
+                raise ValueError("Argument --out requires action [plan]")
+
+            settings.saved_plan_path = self.args.get("out")
+
+        if self.args.get("plan"):
+            if self.args.get("action") != "apply":
+                raise ValueError("Argument --plan requires action [apply]")
+
+        if self.args.get("record_snapshot") and self.args.get("replay_snapshot"):
+            raise ValueError("Arguments --record-snapshot and --replay-snapshot cannot be used together")
+
+        if settings.connection_pool_size and (self.args.get("record_snapshot") or self.args.get("replay_snapshot")):
+            raise ValueError("Argument --connection-pool-size cannot be used together with snapshot arguments")
+
+        if settings.execute_async_ddl and (self.args.get("record_snapshot") or self.args.get("replay_snapshot")):
+            raise ValueError("Argument --async-ddl cannot be used together with snapshot arguments")
+
+        if settings.metadata_cache_path and (self.args.get("record_snapshot") or self.args.get("replay_snapshot")):
+            raise ValueError("Argument --metadata-cache cannot be used together with snapshot arguments")
+
+        if self.args.get("replay_snapshot"):
+            if self.args.get("action") not in ("plan", "validate"):
+                raise ValueError("Argument --replay-snapshot requires action [plan] or [validate]")
+
+            if not Path(self.args.get("replay_snapshot")).is_file():
+                raise ValueError(f"Snapshot path [{self.args.get('replay_snapshot')}] does not exist or not a file")
+
         return settings
 
     def get_engine(self):
         with self.measure_elapsed_time("GetEngine"):
-            engine = SnowDDLEngine(self.get_connection(), self.config, self.settings)
+            if self.args.get("replay_snapshot"):
+                connection = SnowDDLReplayConnection(Path(self.args.get("replay_snapshot")))
+            elif self.args.get("record_snapshot"):
+                connection = SnowDDLRecordConnection(self.get_connection(), Path(self.args.get("record_snapshot")))
+            else:
+                connection = self.get_connection()
+
+            connection_pool = None
+
+            if self.settings.connection_pool_size > 0:
+                connection_pool = SnowDDLConnectionPool(self.get_connection, self.settings.connection_pool_size)
+
+            plan_output = None
+
+            if self.args.get("plan_output"):
+                plan_output = SnowDDLPlanOutput(Path(self.args.get("plan_output")), self.args.get("plan_output_format"))
+
+            engine = SnowDDLEngine(connection, self.config, self.settings, connection_pool, self.tracer, plan_output)
 
         return engine
 
@@ -655,6 +907,7 @@ class BaseApp:
 
     def execute(self):
         if self.args.get("action") == "validate":
+            self.output_trace()
             return
 
         total_error_count = 0
@@ -674,14 +927,20 @@ class BaseApp:
                     total_error_count += len(resolver.errors)
 
                 engine.context.destroy_role_with_prefix()
+            elif self.args.get("plan"):
+                total_error_count += self.apply_saved_plan(engine)
             else:
-                for resolver_cls in self.resolve_sequence:
-                    with self.measure_elapsed_time(resolver_cls.__name__):
-                        resolver = resolver_cls(engine)
-                        resolver.resolve()
+                scheduler = ResolverScheduler(self.resolve_sequence, self.settings.max_resolver_workers)
 
+                for resolver in scheduler.run(lambda resolver_cls: self.run_resolver(engine, resolver_cls)):
                     total_error_count += len(resolver.errors)
 
+            if engine.state and self.args.get("action") == "apply" and not self.args.get("plan") and total_error_count == 0:
+                engine.state.save()
+
+            if engine.saved_plan:
+                self.save_plan(engine, total_error_count)
+
             engine.connection.close()
 
             self.output_engine_stats(engine)
@@ -690,14 +949,82 @@ class BaseApp:
             if self.args.get("show_timers"):
                 self.output_app_timers()
 
+            if self.args.get("show_query_metrics"):
+                self.output_query_metrics(engine)
+
             if self.args.get("show_sql"):
                 self.output_executed_ddl(engine)
 
             self.output_suggested_ddl(engine)
+            self.output_trace()
+            self.save_query_metrics(engine)
 
             if total_error_count > 0:
                 exit(8)
 
+    def apply_saved_plan(self, engine: SnowDDLEngine):
+        saved_plan = SnowDDLSavedPlan(Path(self.args.get("plan")), __version__, engine.settings, engine.get_scope())
+        saved_plan.load()
+
+        resolver_classes = {resolver_cls.__name__: resolver_cls for resolver_cls in self.resolve_sequence}
+
+        with self.measure_elapsed_time("CheckSavedPlan"):
+            for resolver_name, steps in saved_plan.get_planned_steps_by_resolver().items():
+                if resolver_name not in resolver_classes:
+                    raise ValueError(f"Saved plan contains unknown resolver [{resolver_name}]")
+
+                resolver = resolver_classes[resolver_name](engine)
+                existing_objects = resolver.get_existing_objects_for_saved_plan({step["object"] for step in steps})
+                object_fingerprints = SnowDDLSavedPlan.get_object_fingerprints(existing_objects, resolver.runtime_fields)
+
+                for step in steps:
+                    existing_fingerprint = SnowDDLSavedPlan.get_existing_fingerprint(object_fingerprints, step["object"])
+
+                    if existing_fingerprint != step["existing_fingerprint"]:
+                        raise ValueError(
+                            f"Saved plan is stale, objects of resolver [{resolver_name}] were changed since plan was created"
+                        )
+
+                queries = [query for step in steps for query in step["queries"]]
+
+                for query, fingerprint in zip(queries, engine.map(engine.get_saved_plan_query_fingerprint, queries)):
+                    if fingerprint != query["fingerprint"]:
+                        raise ValueError(
+                            f"Saved plan is stale, result of query [{query['sql']}] was changed since plan was created"
+                        )
+
+        error_count = 0
+
+        with self.measure_elapsed_time("ApplySavedPlan"):
+            for step in saved_plan.steps:
+                step_name = f"{step['resolver']} [{step['object']}]" if step["object"] else step["resolver"]
+
+                try:
+                    engine.execute_saved_plan_step(step)
+                    self.logger.info(f"Applied saved plan for {step_name}")
+                except SnowDDLExecuteError as e:
+                    self.logger.warning(f"Applied saved plan for {step_name}: ERROR\n{e.verbose_message()}")
+                    error_count += 1
+
+        return error_count
+
+    def save_plan(self, engine: SnowDDLEngine, error_count: int):
+        if error_count > 0:
+            self.logger.warning(f"Saved plan was not written to [{engine.saved_plan.path}] due to errors")
+            return
+
+        engine.saved_plan.save()
+        self.logger.info(
+            f"Saved plan with {engine.saved_plan.get_statement_count()} DDL queries was written to [{engine.saved_plan.path}]"
+        )
+
+    def run_resolver(self, engine: SnowDDLEngine, resolver_cls):
+        with self.measure_elapsed_time(resolver_cls.__name__):
+            resolver = resolver_cls(engine)
+            resolver.resolve()
+
+        return resolver
+
     def output_engine_context(self, engine: SnowDDLEngine):
         system_roles = []
 
@@ -759,7 +1086,42 @@ class BaseApp:
         return None
 
     def output_engine_stats(self, engine: SnowDDLEngine):
-        self.logger.info(f"Executed {len(engine.executed_ddl)} DDL queries, Suggested {len(engine.suggested_ddl)} DDL queries")
+        self.logger.info(f"Executed {engine.executed_ddl_count} DDL queries, Suggested {engine.suggested_ddl_count} DDL queries")
+
+        if engine.plan_output:
+            self.logger.info(
+                f"Plan with {engine.plan_output.statement_count} DDL queries was written to [{engine.plan_output.path}]"
+            )
+
+        if engine.connection_pool:
+            self.logger.info(
+                f"Used {len(engine.connection_pool.query_counts)} pooled sessions, "
+                f"queries per session: {engine.connection_pool.query_counts}"
+            )
+
+        if engine.metadata_cache and not engine.metadata_cache.is_invalidate_only:
+            self.logger.info(
+                f"Metadata cache hits: {engine.metadata_cache.hit_count}, misses: {engine.metadata_cache.miss_count}"
+            )
+
+        if engine.concurrency_limiter:
+            self.logger.info(
+                f"Adaptive concurrency limit: final [{engine.concurrency_limiter.limit}], "
+                f"most used [{engine.concurrency_limiter.get_most_used_limit()}], "
+                f"range [{engine.concurrency_limiter.lowest_limit}..{engine.concurrency_limiter.highest_limit}], "
+                f"throttling errors: {engine.concurrency_limiter.throttled_count}"
+            )
+
+        if engine.retry_policy:
+            self.logger.info(
+                f"Retried {engine.retry_policy.get_retry_count()} times after transient errors "
+                f"({', '.join(f'{reason}: {count}' for reason, count in sorted(engine.retry_policy.retry_counts.items())) or 'none'}), "
+                f"recovered queries: {engine.retry_policy.recovered_count}, "
+                f"failed after all retries: {engine.retry_policy.exhausted_count}"
+            )
+
+        if engine.state:
+            self.logger.info(f"Skipped compare for {engine.state.skip_count} objects unchanged since previous run")
 
     def output_engine_warnings(self, engine: SnowDDLEngine):
         for object_type, object_names in engine.intention_cache.object_name_warning.items():
@@ -777,6 +1139,26 @@ class BaseApp:
         for timer_name, timer_value in self.elapsed_timers.items():
             self.logger.info(f"Timer [{timer_name}] elapsed time is {timer_value:.3f}s")
 
+    def output_query_metrics(self, engine: SnowDDLEngine):
+        total_stats = engine.query_metrics.get_total_stats()
+        self.logger.info(f"Query latency {self.format_query_stats(total_stats)}")
+
+        for resolver_name, stats in engine.query_metrics.get_stats_by_resolver().items():
+            self.logger.info(f"Query latency for resolver [{resolver_name}] {self.format_query_stats(stats)}")
+
+        for kind, stats in engine.query_metrics.get_stats_by_kind().items():
+            self.logger.info(f"Query latency for statement kind [{kind}] {self.format_query_stats(stats)}")
+
+        for resolver_name, object_name, stats in engine.query_metrics.get_slowest_objects(self.args.get("query_metrics_top")):
+            self.logger.info(f"Slow object [{object_name}] in resolver [{resolver_name}] {self.format_query_stats(stats)}")
+
+    def format_query_stats(self, stats):
+        return (
+            f"count: {stats.count}, errors: {stats.error_count}, total: {stats.total:.3f}s, "
+            f"p50: {stats.percentile(0.5):.3f}s, p95: {stats.percentile(0.95):.3f}s, p99: {stats.percentile(0.99):.3f}s, "
+            f"max: {stats.max:.3f}s"
+        )
+
     def output_suggested_ddl(self, engine: SnowDDLEngine):
         if engine.suggested_ddl:
             print("--- Suggested DDL ---\n")
@@ -791,15 +1173,32 @@ class BaseApp:
         for sql in engine.executed_ddl:
             print(f"{sql};\n")
 
+    def output_trace(self):
+        if self.tracer:
+            self.tracer.save()
+            self.logger.info(f"Execution trace with {len(self.tracer.events)} events was written to [{self.tracer.path}]")
+
+    def save_query_metrics(self, engine: SnowDDLEngine):
+        if self.args.get("query_metrics_file"):
+            engine.query_metrics.save(Path(self.args.get("query_metrics_file")), self.args.get("query_metrics_top"))
+            self.logger.info(f"Query latency metrics were written to [{self.args.get('query_metrics_file')}]")
+
     @contextmanager
     def measure_elapsed_time(self, timer_name: str):
         start_counter = perf_counter()
 
         try:
-            yield
+            with self.trace_span(timer_name, "app"):
+                yield
         finally:
             self.elapsed_timers[timer_name] = perf_counter() - start_counter
 
+    def trace_span(self, name: str, category: str):
+        if self.tracer:
+            return self.tracer.span(name, category)
+
+        return nullcontext()
+
 
 def entry_point():
     app = BaseApp()
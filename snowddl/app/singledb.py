@@ -15,7 +15,8 @@ from snowddl.blueprint import (
 )
 from snowddl.config import SnowDDLConfig
 from snowddl.parser import singledb_parse_sequence
-from snowddl.resolver import singledb_resolve_sequence, singledb_destroy_sequence
+from snowddl.plan_output import SnowDDLPlanOutput
+from snowddl.resolver import singledb_resolve_sequence, singledb_destroy_sequence, ResolverScheduler
 
 
 class SingleDbApp(BaseApp):
@@ -136,6 +137,109 @@ class SingleDbApp(BaseApp):
         parser.add_argument(
             "--max-workers", help="Maximum number of workers to resolve objects in parallel", default=None, type=int
         )
+        parser.add_argument(
+            "--max-resolver-workers",
+            help="Maximum number of independent resolvers running concurrently (default: 1, resolvers run one by one)",
+            default=None,
+            type=int,
+        )
+        parser.add_argument(
+            "--connection-pool-size",
+            help="Number of additional Snowflake sessions used by parallel workers (default: 0, all workers share one session)",
+            default=None,
+            type=int,
+        )
+        parser.add_argument(
+            "--async-ddl",
+            help="Submit DDL queries asynchronously and poll query status, keeps many queries in flight without extra threads",
+            default=False,
+            action="store_true",
+        )
+        parser.add_argument(
+            "--max-async-queries",
+            help="Maximum number of asynchronous DDL queries in flight (default: 200)",
+            default=None,
+            type=int,
+        )
+        parser.add_argument(
+            "--max-batch-statements",
+            help="Send GRANT and REVOKE statements of the same object in multi-statement batches of this size (default: 0, no batching)",
+            default=None,
+            type=int,
+        )
+        parser.add_argument(
+            "--max-query-retries",
+            help="Retry queries failed due to network errors or throttling up to this number of times (default: 0, no retries)",
+            default=None,
+            type=int,
+        )
+        parser.add_argument(
+            "--adaptive-concurrency",
+            help="Adjust number of concurrently running queries (up to --max-workers) based on query latency and throttling errors",
+            default=False,
+            action="store_true",
+        )
+        parser.add_argument(
+            "--metadata-cache",
+            help="Path to persistent cache of SHOW and DESC results, read by {plan} and {validate}, invalidated by {apply} and {destroy}",
+            metavar="PATH",
+            default=None,
+        )
+        parser.add_argument(
+            "--metadata-cache-ttl",
+            help="Time to live of metadata cache entries in seconds (default: 3600)",
+            default=None,
+            type=int,
+        )
+        parser.add_argument(
+            "--state-file",
+            help="Path to state file, compare is skipped for objects unchanged since previous successful apply",
+            metavar="PATH",
+            default=None,
+        )
+        parser.add_argument(
+            "--out",
+            help="Action [plan] only: save resolved changes to this file, apply them later with --plan",
+            metavar="PATH",
+            default=None,
+        )
+        parser.add_argument(
+            "--plan",
+            help="Action [apply] only: apply changes from saved plan file without resolving objects again",
+            metavar="PATH",
+            default=None,
+        )
+        parser.add_argument(
+            "--trace-file",
+            help="Write execution trace in Chrome trace event format (Perfetto, speedscope) to this file",
+            metavar="PATH",
+            default=None,
+        )
+        parser.add_argument(
+            "--query-metrics-file",
+            help="Write query latency metrics to this file, Prometheus text format for *.prom files, JSON otherwise",
+            metavar="PATH",
+            default=None,
+        )
+        parser.add_argument(
+            "--query-metrics-top",
+            help="Number of the slowest objects in query latency metrics (default: 10)",
+            metavar="N",
+            default=10,
+            type=int,
+        )
+        parser.add_argument(
+            "--plan-output",
+            help="Write executed and suggested DDL to this file as soon as each object is resolved, instead of keeping it in memory",
+            metavar="PATH",
+            default=None,
+        )
+        parser.add_argument(
+            "--plan-output-format",
+            help="Format of plan output file (possible values: jsonl, sql; default: sql for *.sql files, jsonl otherwise)",
+            choices=SnowDDLPlanOutput.formats,
+            default=None,
+        )
 
         # Logging
         parser.add_argument(
@@ -149,6 +253,12 @@ class SingleDbApp(BaseApp):
             "--show-timers", help="Show debug timers", default=False, action="store_true"
         )
         # fmt: on
+        parser.add_argument(
+            "--show-query-metrics",
+            help="Show query latency percentiles per resolver and per statement kind, and the slowest objects",
+            default=False,
+            action="store_true",
+        )
         parser.add_argument(
             "--show-unused-files", help="Show warnings for unused config files", default=False, action="store_true"
         )
@@ -171,6 +281,19 @@ class SingleDbApp(BaseApp):
             default=None,
             metavar="",
         )
+        parser.add_argument(
+            "--target",
+            help="Resolve only objects matching pattern (e.g. DB1.SCHEMA_*, !DB2.*) and objects nested into them, can be repeated",
+            default=None,
+            metavar="PATTERN",
+            action="append",
+        )
+        parser.add_argument(
+            "--check-affected-views-only",
+            help="Query unchanged views only if objects they refer to were changed during this run, instead of querying every view",
+            default=False,
+            action="store_true",
+        )
 
         # Apply even more unsafe changes
         parser.add_argument(
@@ -334,6 +457,7 @@ class SingleDbApp(BaseApp):
 
     def execute(self):
         if self.args.get("action") == "validate":
+            self.output_trace()
             return
 
         error_count = 0
@@ -349,14 +473,20 @@ class SingleDbApp(BaseApp):
 
                     error_count += len(resolver.errors)
 
+            elif self.args.get("plan"):
+                error_count += self.apply_saved_plan(engine)
             else:
-                for resolver_cls in self.resolve_sequence:
-                    with self.measure_elapsed_time(resolver_cls.__name__):
-                        resolver = resolver_cls(engine)
-                        resolver.resolve()
+                scheduler = ResolverScheduler(self.resolve_sequence, self.settings.max_resolver_workers)
 
+                for resolver in scheduler.run(lambda resolver_cls: self.run_resolver(engine, resolver_cls)):
                     error_count += len(resolver.errors)
 
+            if engine.state and self.args.get("action") == "apply" and not self.args.get("plan") and error_count == 0:
+                engine.state.save()
+
+            if engine.saved_plan:
+                self.save_plan(engine, error_count)
+
             engine.connection.close()
 
             self.output_engine_stats(engine)
@@ -365,10 +495,15 @@ class SingleDbApp(BaseApp):
             if self.args.get("show_timers"):
                 self.output_app_timers()
 
+            if self.args.get("show_query_metrics"):
+                self.output_query_metrics(engine)
+
             if self.args.get("show_sql"):
                 self.output_executed_ddl(engine)
 
             self.output_suggested_ddl(engine)
+            self.output_trace()
+            self.save_query_metrics(engine)
 
             if error_count > 0:
                 exit(8)
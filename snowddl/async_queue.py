@@ -0,0 +1,176 @@
+from collections import deque
+from logging import getLogger, NullHandler
+from threading import Condition, Lock, Thread, BoundedSemaphore
+from time import sleep
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from snowflake.connector import SnowflakeConnection, Error
+
+from snowddl.error import SnowDDLExecuteError
+
+logger = getLogger(__name__)
+logger.addHandler(NullHandler())
+
+
+class SnowDDLAsyncChain:
+    # Statements produced by a single task, each statement is submitted only after previous statement was completed
+    def __init__(self, queue: "SnowDDLAsyncQueue", context=None):
+        self.queue = queue
+        # Opaque value passed to success callback of queue together with each completed statement
+        self.context = context
+
+        self.pending: Deque[Tuple[SnowflakeConnection, str]] = deque()
+        self.is_running = False
+        self.is_closed = False
+        self.error: Optional[Exception] = None
+
+        self._callbacks: List[Callable[[Optional[Exception]], None]] = []
+        self._condition = Condition()
+
+    def add(self, connection: SnowflakeConnection, sql: str):
+        with self._condition:
+            # Remaining statements are skipped after the first error, same as with synchronous execution
+            if self.error:
+                return
+
+            if self.is_running:
+                self.pending.append((connection, sql))
+                return
+
+            self.is_running = True
+
+        self.queue.submit(self, connection, sql)
+
+    def close(self):
+        with self._condition:
+            self.is_closed = True
+
+        self._check_done()
+
+    def wait_idle(self):
+        with self._condition:
+            while self.is_running:
+                self._condition.wait()
+
+            if self.error:
+                raise self.error
+
+    def add_done_callback(self, fn: Callable[[Optional[Exception]], None]):
+        with self._condition:
+            if not self._is_done():
+                self._callbacks.append(fn)
+                return
+
+        fn(self.error)
+
+    def on_complete(self, error: Optional[Exception] = None) -> Optional[Tuple[SnowflakeConnection, str]]:
+        # Returns next statement to submit, if any
+        with self._condition:
+            if error:
+                self.error = error
+                self.pending.clear()
+
+            if self.pending:
+                return self.pending.popleft()
+
+            self.is_running = False
+            self._condition.notify_all()
+
+        self._check_done()
+
+        return None
+
+    def _is_done(self):
+        return self.is_closed and not self.is_running
+
+    def _check_done(self):
+        with self._condition:
+            if not self._is_done():
+                return
+
+            callbacks = self._callbacks
+            self._callbacks = []
+
+        for fn in callbacks:
+            fn(self.error)
+
+
+class SnowDDLAsyncQueue:
+    def __init__(self, on_success: Callable[[str, Any], None], max_in_flight: int = 200, poll_interval: float = 0.05):
+        self.on_success = on_success
+        self.max_in_flight = max_in_flight
+        self.poll_interval = poll_interval
+
+        self.in_flight: Dict[str, Tuple[SnowDDLAsyncChain, SnowflakeConnection, str]] = {}
+
+        self._in_flight_lock = Lock()
+        self._in_flight_semaphore = BoundedSemaphore(max_in_flight)
+        self._is_stopped = False
+
+        self._poller = Thread(target=self._poll, name=self.__class__.__name__, daemon=True)
+        self._poller.start()
+
+    def start_chain(self, context=None):
+        return SnowDDLAsyncChain(self, context)
+
+    def submit(self, chain: SnowDDLAsyncChain, connection: SnowflakeConnection, sql: str, has_slot: bool = False):
+        # Limit number of queries in flight, caller waits for a free slot
+        # Next statement of chain re-uses slot of previous statement, so poller never waits for itself
+        if not has_slot:
+            self._in_flight_semaphore.acquire()
+
+        try:
+            cur = connection.cursor()
+            cur.execute_async(sql)
+        except Error as e:
+            # Failed chain never returns next statement, so slot is released immediately
+            chain.on_complete(SnowDDLExecuteError(e, sql))
+            self._in_flight_semaphore.release()
+            return
+
+        with self._in_flight_lock:
+            self.in_flight[cur.sfqid] = (chain, connection, sql)
+
+    def stop(self):
+        self._is_stopped = True
+        self._poller.join()
+
+    def _poll(self):
+        while not self._is_stopped:
+            with self._in_flight_lock:
+                in_flight_queries = list(self.in_flight.items())
+
+            completed_count = 0
+
+            for sfqid, (chain, connection, sql) in in_flight_queries:
+                error = None
+
+                try:
+                    status = connection.get_query_status_throw_if_error(sfqid)
+
+                    if connection.is_still_running(status):
+                        continue
+                except Error as e:
+                    error = SnowDDLExecuteError(e, sql)
+                except Exception as e:
+                    # Chain must be completed regardless of error type, otherwise waiting task will never finish
+                    logger.exception(f"Failed to get status of query [{sfqid}]")
+                    error = e
+
+                with self._in_flight_lock:
+                    del self.in_flight[sfqid]
+
+                completed_count += 1
+
+                if error is None:
+                    self.on_success(sql, chain.context)
+
+                next_statement = chain.on_complete(error)
+
+                if next_statement:
+                    self.submit(chain, *next_statement, has_slot=True)
+                else:
+                    self._in_flight_semaphore.release()
+
+            if completed_count == 0:
+                sleep(self.poll_interval)
@@ -50,6 +50,7 @@ from .blueprint import (
     ViewBlueprint,
     WarehouseBlueprint,
     T_Blueprint,
+    get_fingerprint,
 )
 
 from .column import (
@@ -62,6 +63,7 @@ from .column import (
     SearchOptimizationItem,
 )
 from .data_type import BaseDataType, DataType
+from .dependency_graph import DependencyGraph
 from .edition import Edition
 from .grant import Grant, AccountGrant, FutureGrant, GrantPattern, FutureGrantPattern
 
@@ -1,4 +1,7 @@
 from abc import ABC
+from enum import Enum
+from hashlib import sha256
+from json import dumps as json_dumps
 from pathlib import Path
 from typing import Optional, List, Dict, Set, Union, TypeVar
 
@@ -47,6 +50,33 @@ from .stage import StageWithPath
 from ..model import BaseModelWithConfig
 
 
+def get_fingerprint(value) -> str:
+    return sha256(json_dumps(_normalize_fingerprint_value(value), sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _normalize_fingerprint_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+
+    if isinstance(value, dict):
+        return {str(k): _normalize_fingerprint_value(v) for k, v in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return [_normalize_fingerprint_value(v) for v in value]
+
+    if isinstance(value, (set, frozenset)):
+        return sorted((_normalize_fingerprint_value(v) for v in value), key=lambda v: json_dumps(v, sort_keys=True))
+
+    if isinstance(value, Enum):
+        return _normalize_fingerprint_value(value.value)
+
+    if isinstance(value, bytes):
+        return value.hex()
+
+    # Identifiers, paths, dates and other values with stable string representation
+    return str(value)
+
+
 class DependsOnMixin(BaseModelWithConfig, ABC):
     depends_on: Set[AbstractIdent] = set()
 
@@ -55,6 +85,10 @@ class AbstractBlueprint(BaseModelWithConfig, ABC):
     full_name: AbstractIdent
     comment: Optional[str] = None
 
+    def get_fingerprint(self) -> str:
+        # Stable hash of blueprint content, does not depend on order of items in sets and on Python process
+        return get_fingerprint(self.model_dump())
+
 
 class SchemaObjectBlueprint(AbstractBlueprint, ABC):
     full_name: SchemaObjectIdent
@@ -0,0 +1,125 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+from .blueprint import AbstractBlueprint, DependsOnMixin
+
+
+class DependencyGraph:
+    def __init__(self):
+        # Node name => names of nodes it depends on
+        self.dependencies: Dict[str, Set[str]] = {}
+
+        self.cycles: List[List[str]] = []
+
+    @classmethod
+    def build_from_blueprints(cls, blueprints: Dict[str, AbstractBlueprint]):
+        graph = cls()
+
+        for full_name, bp in blueprints.items():
+            if isinstance(bp, DependsOnMixin):
+                graph.add_node(full_name, {str(d) for d in bp.depends_on})
+            else:
+                graph.add_node(full_name)
+
+        return graph.build()
+
+    def add_node(self, name: str, dependencies: Optional[Set[str]] = None):
+        self.dependencies[name] = set(dependencies) if dependencies else set()
+
+    def get_known_dependencies(self, name: str) -> Set[str]:
+        # Dependencies on nodes outside of graph are ignored
+        return {d for d in self.dependencies[name] if d in self.dependencies}
+
+    def build(self):
+        in_degree = {}
+        dependents = defaultdict(list)
+
+        for name in self.dependencies:
+            known_dependencies = self.get_known_dependencies(name)
+            in_degree[name] = len(known_dependencies)
+
+            for dependency_name in known_dependencies:
+                dependents[dependency_name].append(name)
+
+        # Kahn's algorithm, each node and each edge are processed exactly once
+        # Nodes left with unresolved dependencies are either in cycles or depend on cycles
+        resolved_names = [name for name, degree in in_degree.items() if degree == 0]
+
+        while resolved_names:
+            name = resolved_names.pop()
+
+            for dependent_name in dependents[name]:
+                in_degree[dependent_name] -= 1
+
+                if in_degree[dependent_name] == 0:
+                    resolved_names.append(dependent_name)
+
+        self.cycles = self._find_cycles({name for name, degree in in_degree.items() if degree > 0})
+
+        return self
+
+    def get_cycle(self, name: str) -> List[str]:
+        for cycle in self.cycles:
+            if name in cycle:
+                return cycle
+
+        return []
+
+    def _find_cycles(self, names: Set[str]) -> List[List[str]]:
+        # Tarjan's algorithm for strongly connected components, iterative to avoid recursion limit
+        index_counter = 0
+        indexes = {}
+        low_links = {}
+        stack = []
+        on_stack = set()
+        cycles = []
+
+        for start_name in sorted(names):
+            if start_name in indexes:
+                continue
+
+            work_stack = [(start_name, iter(sorted(self.get_known_dependencies(start_name) & names)))]
+            indexes[start_name] = low_links[start_name] = index_counter
+            index_counter += 1
+            stack.append(start_name)
+            on_stack.add(start_name)
+
+            while work_stack:
+                name, dependencies_iter = work_stack[-1]
+                next_name = next(dependencies_iter, None)
+
+                if next_name is not None:
+                    if next_name not in indexes:
+                        indexes[next_name] = low_links[next_name] = index_counter
+                        index_counter += 1
+                        stack.append(next_name)
+                        on_stack.add(next_name)
+
+                        work_stack.append((next_name, iter(sorted(self.get_known_dependencies(next_name) & names))))
+                    elif next_name in on_stack:
+                        low_links[name] = min(low_links[name], indexes[next_name])
+
+                    continue
+
+                work_stack.pop()
+
+                if work_stack:
+                    parent_name = work_stack[-1][0]
+                    low_links[parent_name] = min(low_links[parent_name], low_links[name])
+
+                if low_links[name] == indexes[name]:
+                    component = []
+
+                    while True:
+                        component_name = stack.pop()
+                        on_stack.remove(component_name)
+                        component.append(component_name)
+
+                        if component_name == name:
+                            break
+
+                    # Single node is a cycle only if it depends on itself
+                    if len(component) > 1 or name in self.dependencies[name]:
+                        cycles.append(sorted(component))
+
+        return cycles
@@ -26,10 +26,31 @@ class Grant(BaseModelWithConfig):
 
         return True
 
+    def __hash__(self):
+        return hash((self.privilege, self.on.singular_for_grant, self.name))
+
+    def get_future_grant_keys(self):
+        # Keys of future grants which might match this grant, see FutureGrant.is_matching_grant()
+        if not self.on.is_future_grant_supported:
+            return []
+
+        keys = []
+
+        if isinstance(self.name, (SchemaIdent, SchemaObjectIdent)):
+            keys.append((self.privilege, self.on.singular_for_grant, ObjectType.DATABASE, self.name.database_full_name))
+
+        if isinstance(self.name, SchemaObjectIdent):
+            keys.append((self.privilege, self.on.singular_for_grant, ObjectType.SCHEMA, self.name.schema_full_name))
+
+        return keys
+
 
 class AccountGrant(BaseModelWithConfig):
     privilege: str
 
+    def __hash__(self):
+        return hash(self.privilege)
+
 
 class FutureGrant(BaseModelWithConfig):
     privilege: str
@@ -63,6 +84,13 @@ class FutureGrant(BaseModelWithConfig):
 
         return True
 
+    def __hash__(self):
+        return hash((self.privilege, self.on_future, self.in_parent, self.name))
+
+    def get_key(self):
+        # Key for lookup of future grants matching normal grant, see Grant.get_future_grant_keys()
+        return (self.privilege, self.on_future.singular_for_grant, self.in_parent, self.name)
+
 
 class GrantPattern(BaseModelWithConfig):
     privilege: str
@@ -1,7 +1,7 @@
 from fnmatch import translate
 from re import compile
 from string import ascii_letters, digits
-from typing import List, Pattern
+from typing import List, Pattern, Set
 
 from snowddl.blueprint.ident import AbstractIdentWithPrefix
 
@@ -17,6 +17,9 @@ class IdentPattern:
         self.include_regexp: List[Pattern] = []
         self.exclude_regexp: List[Pattern] = []
 
+        self.include_sub_patterns: List[str] = []
+        self.exclude_sub_patterns: List[str] = []
+
         if self.is_complex_pattern:
             for sub_pattern in self.pattern.split("|"):
                 is_exclude = False
@@ -32,8 +35,10 @@ class IdentPattern:
 
                 if is_exclude:
                     self.exclude_regexp.append(compiled_regexp)
+                    self.exclude_sub_patterns.append(sub_pattern)
                 else:
                     self.include_regexp.append(compiled_regexp)
+                    self.include_sub_patterns.append(sub_pattern)
 
             if not self.include_regexp:
                 raise ValueError(f"Identifier pattern [{self.pattern}] does not contain any positive sub-patterns")
@@ -43,15 +48,36 @@ class IdentPattern:
         return cls(cls._get_str_ident_without_prefix(ident))
 
     def is_match_ident(self, ident: AbstractIdentWithPrefix) -> bool:
-        str_ident_without_prefix = self._get_str_ident_without_prefix(ident)
+        return self.is_match_str(self._get_str_ident_without_prefix(ident))
+
+    def is_match_str(self, str_ident_without_prefix: str) -> bool:
+        return self.is_match_str_include(str_ident_without_prefix) and not self.is_match_str_exclude(str_ident_without_prefix)
+
+    def is_match_str_include(self, str_ident_without_prefix: str) -> bool:
+        if self.is_complex_pattern:
+            return any(regexp.match(str_ident_without_prefix) for regexp in self.include_regexp)
+
+        return str_ident_without_prefix == self.pattern
+
+    def is_match_str_exclude(self, str_ident_without_prefix: str) -> bool:
+        return any(regexp.match(str_ident_without_prefix) for regexp in self.exclude_regexp)
+
+    def is_match_str_descendant(self, str_ident_without_prefix: str) -> bool:
+        # Check if pattern may match any object nested into this object, e.g. schema in database, table in schema
+        str_parent_prefix = f"{str_ident_without_prefix}."
 
         if self.is_complex_pattern:
-            is_match_include = any(regexp.match(str_ident_without_prefix) for regexp in self.include_regexp)
-            is_match_exclude = any(regexp.match(str_ident_without_prefix) for regexp in self.exclude_regexp)
+            is_match_include = any(_is_match_fnmatch_prefix(str_parent_prefix, p) for p in self.include_sub_patterns)
+
+            # Only exclusions like "DB.*" are guaranteed to match all nested objects
+            is_match_exclude = any(
+                p.endswith("*") and not self._is_complex_pattern(p[:-1]) and str_parent_prefix.startswith(p[:-1])
+                for p in self.exclude_sub_patterns
+            )
 
             return is_match_include and not is_match_exclude
 
-        return str_ident_without_prefix == self.pattern
+        return self.pattern.startswith(str_parent_prefix)
 
     def __str__(self):
         return self.pattern
@@ -80,3 +106,66 @@ class IdentPattern:
                 )
 
         return val.upper()
+
+
+def _is_match_fnmatch_prefix(str_prefix: str, pattern: str) -> bool:
+    # Check if any string starting with prefix matches Unix-style pattern
+    tokens = []
+    pos = 0
+
+    while pos < len(pattern):
+        end_pos = -1
+
+        if pattern[pos] == "[":
+            # Character set, "!" negates set, "]" right after opening bracket is a regular character
+            end_pos = pos + 1
+
+            if pattern[end_pos : end_pos + 1] == "!":
+                end_pos += 1
+
+            if pattern[end_pos : end_pos + 1] == "]":
+                end_pos += 1
+
+            end_pos = pattern.find("]", end_pos)
+
+        if end_pos == -1:
+            tokens.append(pattern[pos])
+            pos += 1
+        else:
+            tokens.append(compile(translate(pattern[pos : end_pos + 1])))
+            pos = end_pos + 1
+
+    # Positions in pattern which can be reached after consuming characters of prefix, "*" may match empty string
+    states = _skip_fnmatch_stars(tokens, {0})
+
+    for char in str_prefix:
+        next_states = set()
+
+        for state in states:
+            if state == len(tokens):
+                continue
+
+            token = tokens[state]
+
+            if token == "*":
+                next_states.add(state)
+            elif token == "?" or (isinstance(token, str) and token == char) or (not isinstance(token, str) and token.match(char)):
+                next_states.add(state + 1)
+
+        states = _skip_fnmatch_stars(tokens, next_states)
+
+        if not states:
+            return False
+
+    return True
+
+
+def _skip_fnmatch_stars(tokens: List, states: Set[int]) -> Set[int]:
+    result = set(states)
+
+    for state in states:
+        while state < len(tokens) and tokens[state] == "*":
+            state += 1
+            result.add(state)
+
+    return result
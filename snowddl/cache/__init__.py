@@ -1,2 +1,4 @@
+from .grant_cache import GrantCache
 from .intention_cache import IntentionCache
 from .schema_cache import SchemaCache
+from .table_column_cache import TableColumnCache
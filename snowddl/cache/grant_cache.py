@@ -0,0 +1,115 @@
+from math import ceil
+from re import compile, IGNORECASE
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from snowddl.error import SnowDDLExecuteError
+
+if TYPE_CHECKING:
+    from snowddl.engine import SnowDDLEngine
+
+# Statements which create, drop, rename roles or change owner of roles
+ROLE_DDL_PATTERN = compile(
+    r"^\s*(?:(?:CREATE(?:\s+OR\s+REPLACE)?|DROP|ALTER)\s+ROLE|GRANT\s+OWNERSHIP\s+ON\s+ROLE)\s", IGNORECASE
+)
+
+
+# Roles and grants used by role resolvers
+# Roles of all resolvers are loaded once by a single SHOW ROLES query, each resolver picks roles matching its own pattern
+# Roles are loaded again after any DDL changing roles
+# Grants of roles are loaded by multi-statement queries in parallel chunks, right before resolver compares roles
+# Each grant result is used only once, grants might be changed afterwards
+class GrantCache:
+    # Maximum number of SHOW GRANTS statements in one multi-statement query
+    bulk_show_grants_max_statements = 50
+
+    def __init__(self, engine: "SnowDDLEngine"):
+        self.engine = engine
+
+        self.roles: Optional[List[Dict]] = None
+        self.grants: Dict[str, List[Dict]] = {}
+
+        self._lock = Lock()
+
+    def get_roles(self, role_pattern: Tuple[str, str]) -> List[Dict]:
+        # Without env prefix single SHOW ROLES would return all roles in account, so roles are loaded for each resolver
+        if not self.engine.config.env_prefix:
+            cur = self.engine.execute_meta(
+                "SHOW ROLES LIKE {pattern:lse}",
+                {
+                    "pattern": role_pattern,
+                },
+            )
+
+            return list(cur)
+
+        with self._lock:
+            if self.roles is None:
+                cur = self.engine.execute_meta(
+                    "SHOW ROLES LIKE {env_prefix:ls}",
+                    {
+                        "env_prefix": self.engine.config.env_prefix,
+                    },
+                )
+
+                self.roles = list(cur)
+
+            roles = self.roles
+
+        prefix, suffix = (p.upper() for p in role_pattern)
+
+        # Prefix and suffix must not overlap, the same as in LIKE 'prefix%suffix'
+        return [
+            r
+            for r in roles
+            if len(r["name"]) >= len(prefix) + len(suffix)
+            and r["name"].upper().startswith(prefix)
+            and r["name"].upper().endswith(suffix)
+        ]
+
+    def invalidate(self, sql: str):
+        if ROLE_DDL_PATTERN.match(sql):
+            with self._lock:
+                self.roles = None
+
+    def prefetch_grants(self, sql_list: List[str], role_names: List):
+        queries = [(sql, {"role_name": role_name}) for role_name in role_names for sql in sql_list]
+
+        # Queries are split evenly between workers, but number of statements in one query is limited
+        chunk_size = min(self.bulk_show_grants_max_statements, ceil(len(queries) / self.engine.settings.max_workers))
+
+        # Small number of queries is executed on demand in parallel by resolver
+        if chunk_size < 2:
+            return
+
+        chunks = [queries[i : i + chunk_size] for i in range(0, len(queries), chunk_size)]
+
+        for grants in self.engine.map(self._show_bulk_grants, chunks):
+            with self._lock:
+                self.grants.update(grants)
+
+    def show_grants(self, sql: str, role_name) -> List[Dict]:
+        params = {
+            "role_name": role_name,
+        }
+
+        formatted_sql = self.engine.format(sql, params)
+
+        with self._lock:
+            rows = self.grants.pop(formatted_sql, None)
+
+        if rows is not None:
+            self.engine.add_planned_query(formatted_sql, rows)
+            return rows
+
+        return list(self.engine.execute_meta(sql, params))
+
+    def _show_bulk_grants(self, queries: List[Tuple[str, Dict]]):
+        try:
+            results = self.engine.execute_meta_multi(queries)
+        except SnowDDLExecuteError:
+            # Error does not point to exact role, e.g. role was dropped concurrently
+            # Grants are loaded on demand one by one, so error is raised for exact role
+            return {}
+
+        return {self.engine.format(sql, params): rows for (sql, params), rows in zip(queries, results)}
@@ -1,5 +1,6 @@
 from collections import defaultdict
-from typing import Dict, Set, TYPE_CHECKING
+from re import compile, IGNORECASE
+from typing import Dict, Set, Tuple, TYPE_CHECKING
 
 from snowddl.blueprint import (
     DatabaseRoleBlueprint,
@@ -16,6 +17,20 @@ if TYPE_CHECKING:
     from snowddl.engine import SnowDDLEngine
 
 
+# Quoted name of schema object, e.g. "DB"."SCHEMA"."TABLE", name of object is captured
+SCHEMA_OBJECT_IDENT_PATTERN = compile(r'"(?:[^"]|"")*"\."(?:[^"]|"")*"\."((?:[^"]|"")*)"')
+
+# Quoted name of database or schema, e.g. "DB" or "DB"."SCHEMA"
+CONTAINER_IDENT_PATTERN = compile(r'"((?:[^"]|"")*)"(?:\."((?:[^"]|"")*)")?')
+
+# Statements which replace, drop or rename database or schema, all objects inside might be affected
+CONTAINER_DDL_PATTERN = compile(
+    r"^\s*(?:(?:CREATE(?:\s+OR\s+REPLACE)?|DROP|UNDROP)\s+(?:TRANSIENT\s+)?(?:DATABASE|SCHEMA)\s"
+    r"|ALTER\s+(?:DATABASE|SCHEMA)\s.*\s(?:RENAME\s+TO|SWAP\s+WITH)\s)",
+    IGNORECASE,
+)
+
+
 class IntentionCache:
     def __init__(self, engine: "SnowDDLEngine"):
         self.engine = engine
@@ -25,6 +40,11 @@ class IntentionCache:
 
         self.column_drop_intention: Dict[str, Set[str]] = defaultdict(set)
 
+        # Names of schema objects, databases and schemas changed by DDL executed during this run
+        self.changed_object_names: Set[str] = set()
+        self.changed_database_names: Set[str] = set()
+        self.changed_schema_names: Set[Tuple[str, str]] = set()
+
     def add_object_drop_intention(self, object_type: ObjectType, object_full_name: str):
         self.object_drop_intention[object_type].add(object_full_name)
 
@@ -34,6 +54,21 @@ class IntentionCache:
     def add_column_drop_intention(self, object_full_name: str, column_name: str):
         self.column_drop_intention[object_full_name].add(column_name)
 
+    def add_executed_ddl(self, sql: str):
+        if CONTAINER_DDL_PATTERN.match(sql):
+            for m in CONTAINER_IDENT_PATTERN.finditer(sql):
+                database_name = m.group(1).replace('""', '"')
+
+                if m.group(2) is None:
+                    self.changed_database_names.add(database_name)
+                else:
+                    self.changed_schema_names.add((database_name, m.group(2).replace('""', '"')))
+
+            return
+
+        for m in SCHEMA_OBJECT_IDENT_PATTERN.finditer(sql):
+            self.changed_object_names.add(m.group(1).replace('""', '"'))
+
     def check_object_drop_intention(self, object_type: ObjectType, object_full_name: str):
         return object_full_name in self.object_drop_intention[object_type]
 
@@ -1,12 +1,20 @@
-from typing import TYPE_CHECKING
+from collections import defaultdict
+from typing import Dict, List, Tuple, TYPE_CHECKING
 
 from snowddl.blueprint import Ident
+from snowddl.error import SnowDDLExecuteError
 
 if TYPE_CHECKING:
     from snowddl.engine import SnowDDLEngine
 
 
 class SchemaCache:
+    # Parameters of schemas are loaded by one multi-statement query per database, if database has at least this number of schemas
+    bulk_schema_params_min_schemas = 2
+
+    # Maximum number of statements in one multi-statement query
+    bulk_schema_params_max_schemas = 100
+
     def __init__(self, engine: "SnowDDLEngine"):
         self.engine = engine
 
@@ -16,6 +24,9 @@ class SchemaCache:
         self.database_params = {}
         self.schema_params = {}
 
+        # Raw results of SHOW PARAMETERS by database or schema full name, kept only for saved plan
+        self.params_queries: Dict[str, Tuple[str, List[Dict]]] = {}
+
         self.reload()
 
     def reload(self):
@@ -24,6 +35,7 @@ class SchemaCache:
 
         self.database_params = {}
         self.schema_params = {}
+        self.params_queries = {}
 
         cur = self.engine.execute_meta(
             "SHOW DATABASES LIKE {env_prefix:ls}",
@@ -45,6 +57,10 @@ class SchemaCache:
             if self.engine.settings.include_databases and Ident(r["name"]) not in self.engine.settings.include_databases:
                 continue
 
+            # Skip databases which cannot contain targeted objects
+            if not self.engine.is_target_parent(r["name"]):
+                continue
+
             self.databases[r["name"]] = {
                 "database": r["name"],
                 "owner": r["owner"],
@@ -54,15 +70,46 @@ class SchemaCache:
             }
 
         # Load schemas in parallel
-        for database_schemas in self.engine.executor.map(self._get_database_schemas, self.databases.values()):
+        # Parameters are loaded on demand, only a few resolvers need them
+        for database_schemas in self.engine.map(self._get_database_schemas, self.databases.values()):
             self.schemas.update(database_schemas)
 
-        # Load database parameters in parallel
-        for database_params in self.engine.executor.map(self._get_database_params, self.databases.values()):
-            self.database_params.update(database_params)
+    def get_database_params(self, database_full_name: str) -> Dict:
+        if database_full_name not in self.database_params:
+            self.database_params.update(self._get_database_params(self.databases[database_full_name]))
+
+        self._add_planned_params_query(database_full_name)
+
+        return self.database_params[database_full_name]
+
+    def get_schema_params(self, schema_full_name: str) -> Dict:
+        if schema_full_name not in self.schema_params:
+            self.schema_params.update(self._get_schema_params(self.schemas[schema_full_name]))
+
+        self._add_planned_params_query(schema_full_name)
+
+        return self.schema_params[schema_full_name]
+
+    def prefetch_schema_params(self, schema_full_names: List[str]):
+        schemas_by_database = defaultdict(list)
+
+        for schema_full_name in schema_full_names:
+            if schema_full_name in self.schemas and schema_full_name not in self.schema_params:
+                schema_row = self.schemas[schema_full_name]
+                schemas_by_database[schema_row["database"]].append(schema_row)
+
+        chunks = []
+
+        for schema_rows in schemas_by_database.values():
+            # Parameters of remaining schemas are loaded on demand
+            if len(schema_rows) < self.bulk_schema_params_min_schemas:
+                continue
+
+            for i in range(0, len(schema_rows), self.bulk_schema_params_max_schemas):
+                chunks.append(schema_rows[i : i + self.bulk_schema_params_max_schemas])
 
-        # Load schema params parameters in parallel
-        for schema_params in self.engine.executor.map(self._get_schema_params, self.schemas.values()):
+        # Load chunks in parallel
+        for schema_params in self.engine.map(self._get_bulk_schema_params, chunks):
             self.schema_params.update(schema_params)
 
     def _get_database_schemas(self, database_row):
@@ -80,6 +127,10 @@ class SchemaCache:
             if r["name"] == "INFORMATION_SCHEMA":
                 continue
 
+            # Skip schemas which cannot contain targeted objects
+            if not self.engine.is_target_parent(f"{r['database_name']}.{r['name']}"):
+                continue
+
             schemas[f"{r['database_name']}.{r['name']}"] = {
                 "database": r["database_name"],
                 "schema": r["name"],
@@ -95,14 +146,19 @@ class SchemaCache:
     def _get_database_params(self, database_row):
         database_params = {database_row["database"]: {}}
 
-        cur = self.engine.execute_meta(
+        sql = self.engine.format(
             "SHOW PARAMETERS IN DATABASE {database:i}",
             {
                 "database": database_row["database"],
             },
         )
 
-        for r in cur:
+        cur = self.engine.execute_meta(sql)
+        rows = list(cur)
+
+        self._save_params_query(database_row["database"], sql, rows)
+
+        for r in rows:
             if r["level"] == "DATABASE":
                 database_params[database_row["database"]][r["key"]] = self._cast_param_value(r["value"], r["type"])
 
@@ -112,7 +168,7 @@ class SchemaCache:
         schema_name = f"{schema_row['database']}.{schema_row['schema']}"
         schema_params = {schema_name: {}}
 
-        cur = self.engine.execute_meta(
+        sql = self.engine.format(
             "SHOW PARAMETERS IN SCHEMA {database:i}.{schema:i}",
             {
                 "database": schema_row["database"],
@@ -120,12 +176,59 @@ class SchemaCache:
             },
         )
 
-        for r in cur:
+        cur = self.engine.execute_meta(sql)
+        rows = list(cur)
+
+        self._save_params_query(schema_name, sql, rows)
+
+        for r in rows:
             if r["level"] == "SCHEMA":
                 schema_params[schema_name][r["key"]] = self._cast_param_value(r["value"], r["type"])
 
         return schema_params
 
+    def _get_bulk_schema_params(self, schema_rows):
+        schema_params = {}
+
+        queries = [
+            (
+                "SHOW PARAMETERS IN SCHEMA {database:i}.{schema:i}",
+                {
+                    "database": schema_row["database"],
+                    "schema": schema_row["schema"],
+                },
+            )
+            for schema_row in schema_rows
+        ]
+
+        try:
+            results = self.engine.execute_meta_multi(queries)
+        except SnowDDLExecuteError:
+            # Error does not point to exact schema, e.g. schema was dropped concurrently
+            # Parameters are loaded on demand one by one, so error is raised for exact schema
+            return schema_params
+
+        for schema_row, (sql, params), rows in zip(schema_rows, queries, results):
+            schema_name = f"{schema_row['database']}.{schema_row['schema']}"
+            schema_params[schema_name] = {}
+
+            self._save_params_query(schema_name, self.engine.format(sql, params), rows)
+
+            for r in rows:
+                if r["level"] == "SCHEMA":
+                    schema_params[schema_name][r["key"]] = self._cast_param_value(r["value"], r["type"])
+
+        return schema_params
+
+    def _save_params_query(self, full_name: str, sql: str, rows: List[Dict]):
+        # Parameters are shared by all objects in database or schema, but saved plan requires results for each object
+        if self.engine.saved_plan:
+            self.params_queries[full_name] = (sql, rows)
+
+    def _add_planned_params_query(self, full_name: str):
+        if full_name in self.params_queries:
+            self.engine.add_planned_query(*self.params_queries[full_name])
+
     def _cast_param_value(self, value, value_type):
         if value_type == "BOOLEAN":
             return value == "true"
@@ -0,0 +1,104 @@
+from threading import Lock
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from collections import defaultdict
+
+from snowddl.error import SnowDDLExecuteError
+
+if TYPE_CHECKING:
+    from snowddl.engine import SnowDDLEngine
+
+
+class TableColumnChunk:
+    def __init__(self, table_rows: List[Dict]):
+        self.table_rows = table_rows
+        self.columns: Optional[Dict[str, List[Dict]]] = None
+
+        self._lock = Lock()
+
+    def pop_columns(self, engine: "SnowDDLEngine", full_name: str) -> Optional[List[Dict]]:
+        with self._lock:
+            if self.columns is None:
+                self.columns = self._desc_tables(engine)
+
+            return self.columns.pop(full_name, None)
+
+    def _desc_tables(self, engine: "SnowDDLEngine"):
+        try:
+            results = engine.execute_meta_multi(
+                [
+                    (
+                        "DESC TABLE {database:i}.{schema:i}.{name:i}",
+                        {
+                            "database": r["database"],
+                            "schema": r["schema"],
+                            "name": r["name"],
+                        },
+                    )
+                    for r in self.table_rows
+                ]
+            )
+        except SnowDDLExecuteError:
+            # Error does not point to exact table, e.g. table was dropped concurrently
+            # Tables are described one by one, so error is raised for exact table
+            return {}
+
+        return {f"{r['database']}.{r['schema']}.{r['name']}": rows for r, rows in zip(self.table_rows, results)}
+
+
+# Results of DESC TABLE for tables which are going to be described soon
+# Tables of the same schema are described by one multi-statement query when the first table of chunk is requested
+# Output of DESC TABLE is returned as is, so normalization of columns remains exactly the same
+class TableColumnCache:
+    # Maximum number of DESC TABLE statements in one multi-statement query
+    bulk_desc_max_tables = 50
+
+    def __init__(self, engine: "SnowDDLEngine"):
+        self.engine = engine
+
+        self.chunks: Dict[str, TableColumnChunk] = {}
+        self._lock = Lock()
+
+    def register_tables(self, table_rows: List[Dict]):
+        tables_by_schema = defaultdict(list)
+
+        for r in table_rows:
+            tables_by_schema[(r["database"], r["schema"])].append(r)
+
+        with self._lock:
+            for schema_table_rows in tables_by_schema.values():
+                # Tables are usually processed in order of names, so chunk contains tables requested at about the same time
+                schema_table_rows = sorted(schema_table_rows, key=lambda r: r["name"])
+
+                for i in range(0, len(schema_table_rows), self.bulk_desc_max_tables):
+                    chunk = TableColumnChunk(schema_table_rows[i : i + self.bulk_desc_max_tables])
+
+                    for r in chunk.table_rows:
+                        self.chunks[f"{r['database']}.{r['schema']}.{r['name']}"] = chunk
+
+    def desc_table(self, database: str, schema: str, name: str) -> List[Dict]:
+        full_name = f"{database}.{schema}.{name}"
+
+        # Each result is used only once, table might be altered afterwards
+        with self._lock:
+            chunk = self.chunks.pop(full_name, None)
+
+        sql = self.engine.format(
+            "DESC TABLE {database:i}.{schema:i}.{name:i}",
+            {
+                "database": database,
+                "schema": schema,
+                "name": name,
+            },
+        )
+
+        if chunk:
+            columns = chunk.pop_columns(self.engine, full_name)
+
+            if columns is not None:
+                self.engine.add_planned_query(sql, columns)
+                return columns
+
+        cur = self.engine.execute_meta(sql)
+
+        return list(cur)
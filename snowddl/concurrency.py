@@ -0,0 +1,129 @@
+from collections import Counter
+from contextlib import contextmanager
+from logging import getLogger, NullHandler
+from statistics import median
+from threading import Condition
+from time import perf_counter
+from typing import Dict, List
+
+from snowflake.connector import Error
+
+from snowddl.retry import is_throttling_error
+
+logger = getLogger(__name__)
+logger.addHandler(NullHandler())
+
+
+# Limits number of queries running concurrently, limit is adjusted with AIMD (additive increase, multiplicative decrease)
+# Limit is increased by 1 after each window of queries without congestion
+# Limit is decreased on throttling errors or when latency grows well above the lowest latency of the same statement kind
+class SnowDDLConcurrencyLimiter:
+    def __init__(
+        self,
+        min_limit: int,
+        max_limit: int,
+        initial_limit: int,
+        latency_tolerance: float = 2.0,
+        decrease_factor: float = 0.75,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = max(min_limit, min(initial_limit, max_limit))
+
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+
+        self.in_flight = 0
+        self.throttled_count = 0
+
+        # Number of queries started with each limit, used to report the limit which was used most
+        self.limit_query_counts = Counter()
+        self.lowest_limit = self.limit
+        self.highest_limit = self.limit
+
+        self._min_latency: Dict[str, float] = {}
+        self._window_ratios: List[float] = []
+        self._window_throttled = False
+
+        # Incremented on each decrease, queries started before decrease do not affect the next window
+        self._generation = 0
+
+        self._condition = Condition()
+
+    @contextmanager
+    def slot(self, kind: str):
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+
+            self.in_flight += 1
+            self.limit_query_counts[self.limit] += 1
+            generation = self._generation
+
+        start_counter = perf_counter()
+        is_error = False
+        is_throttled = False
+
+        try:
+            yield
+        except Exception as e:
+            is_error = True
+            is_throttled = isinstance(e, Error) and is_throttling_error(e)
+            raise
+        finally:
+            self._on_complete(kind, perf_counter() - start_counter, is_error, is_throttled, generation)
+
+    def get_most_used_limit(self):
+        if not self.limit_query_counts:
+            return self.limit
+
+        return self.limit_query_counts.most_common(1)[0][0]
+
+    def _on_complete(self, kind: str, duration: float, is_error: bool, is_throttled: bool, generation: int):
+        with self._condition:
+            self.in_flight -= 1
+
+            if is_throttled:
+                self.throttled_count += 1
+
+            # Latency of failed queries is not representative, e.g. compilation errors are returned immediately
+            if not is_error:
+                self._min_latency[kind] = min(self._min_latency.get(kind, duration), duration)
+
+            if generation == self._generation:
+                if is_throttled:
+                    self._window_throttled = True
+                elif not is_error:
+                    # Very fast queries are not affected by concurrency, ratio is not meaningful
+                    self._window_ratios.append(duration / max(self._min_latency[kind], 0.01))
+
+            # Window is roughly one "round trip" of all concurrent queries, limit is adjusted at most once per window
+            if self._window_throttled or len(self._window_ratios) >= self.limit:
+                self._adjust_limit()
+
+            self._condition.notify_all()
+
+    def _adjust_limit(self):
+        prev_limit = self.limit
+
+        if self._window_throttled:
+            self.limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+            reason = "throttling error"
+        elif median(self._window_ratios) > self.latency_tolerance:
+            self.limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+            reason = "increased latency"
+        else:
+            self.limit = min(self.max_limit, self.limit + 1)
+            reason = "no congestion"
+
+        self._window_ratios = []
+        self._window_throttled = False
+
+        if self.limit < prev_limit:
+            self._generation += 1
+
+        if self.limit != prev_limit:
+            self.lowest_limit = min(self.lowest_limit, self.limit)
+            self.highest_limit = max(self.highest_limit, self.limit)
+
+            logger.debug(f"Adaptive concurrency limit changed from [{prev_limit}] to [{self.limit}] due to {reason}")
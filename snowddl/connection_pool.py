@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, get_ident as threading_get_ident
+from typing import Callable, Dict, List
+
+from snowflake.connector import SnowflakeConnection
+
+
+class SnowDDLConnectionPool:
+    def __init__(self, connection_factory: Callable[[], SnowflakeConnection], size: int):
+        self.connection_factory = connection_factory
+        self.size = size
+
+        self.connections: List[SnowflakeConnection] = []
+        self.query_counts: List[int] = []
+
+        self._thread_connection_idx: Dict[int, int] = {}
+        self._lock = Lock()
+
+    def open(self, prepare_fn: Callable[[SnowflakeConnection], None]):
+        # Sessions are opened and prepared in parallel, since each login is a separate round-trip
+        with ThreadPoolExecutor(max_workers=self.size, thread_name_prefix=self.__class__.__name__) as executor:
+            self.connections = list(executor.map(lambda _: self._open_connection(prepare_fn), range(self.size)))
+
+        self.query_counts = [0] * len(self.connections)
+
+    def get_connection(self) -> SnowflakeConnection:
+        thread_ident = threading_get_ident()
+
+        with self._lock:
+            # Each thread is pinned to a single session, sessions are shared only if there are more threads than sessions
+            if thread_ident not in self._thread_connection_idx:
+                self._thread_connection_idx[thread_ident] = len(self._thread_connection_idx) % len(self.connections)
+
+            connection_idx = self._thread_connection_idx[thread_ident]
+            self.query_counts[connection_idx] += 1
+
+        return self.connections[connection_idx]
+
+    def get_all_connections(self) -> List[SnowflakeConnection]:
+        return list(self.connections)
+
+    def close(self):
+        for connection in self.connections:
+            connection.close()
+
+        self.connections = []
+        self._thread_connection_idx = {}
+
+    def _open_connection(self, prepare_fn: Callable[[SnowflakeConnection], None]):
+        connection = self.connection_factory()
+        prepare_fn(connection)
+
+        return connection
@@ -16,6 +16,14 @@ class TableConverter(AbstractSchemaObjectConverter):
     def get_object_type(self) -> ObjectType:
         return ObjectType.TABLE
 
+    def get_existing_objects(self):
+        existing_objects = super().get_existing_objects()
+
+        # Columns of all tables are described in bulk
+        self.engine.table_column_cache.register_tables(list(existing_objects.values()))
+
+        return existing_objects
+
     def get_existing_objects_in_schema(self, schema: dict):
         existing_objects = {}
 
@@ -99,14 +107,7 @@ class TableConverter(AbstractSchemaObjectConverter):
         cols = {}
         identities = {}
 
-        cur = self.engine.execute_meta(
-            "DESC TABLE {database:i}.{schema:i}.{name:i}",
-            {
-                "database": row["database"],
-                "schema": row["schema"],
-                "name": row["name"],
-            },
-        )
+        cur = self.engine.table_column_cache.desc_table(row["database"], row["schema"], row["name"])
 
         for c in cur:
             m = collate_type_syntax_re.match(c["type"])
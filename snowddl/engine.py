@@ -1,16 +1,32 @@
+from contextlib import contextmanager, nullcontext
 from logging import getLogger, NullHandler
-from threading import get_ident as threading_get_ident
+from pathlib import Path
+from threading import Lock, get_ident as threading_get_ident, local as threading_local
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
 
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from snowflake.connector import DictCursor, SnowflakeConnection, Error
 
-from snowddl.cache import IntentionCache, SchemaCache
+from snowddl.async_queue import SnowDDLAsyncQueue
+from snowddl.cache import GrantCache, IntentionCache, SchemaCache, TableColumnCache
+from snowddl.concurrency import SnowDDLConcurrencyLimiter
 from snowddl.config import SnowDDLConfig
+from snowddl.connection_pool import SnowDDLConnectionPool
 from snowddl.settings import SnowDDLSettings
+from snowddl.state import SnowDDLState
+from snowddl.trace import SnowDDLTracer
 from snowddl.formatter import SnowDDLFormatter
+from snowddl.metadata_cache import SnowDDLMetadataCache
+from snowddl.metrics import SnowDDLQueryMetrics
+from snowddl.plan_output import SnowDDLPlanOutput
 from snowddl.query_builder import SnowDDLQueryBuilder
+from snowddl.retry import SnowDDLRetryPolicy
+from snowddl.saved_plan import SnowDDLSavedPlan
+from snowddl.snapshot import SnowDDLSnapshotCursor
 from snowddl.context import SnowDDLContext
+from snowddl.version import __version__
 from snowddl.error import SnowDDLExecuteError
 
 
@@ -19,8 +35,19 @@ logger.addHandler(NullHandler())
 
 
 class SnowDDLEngine:
-    def __init__(self, connection: SnowflakeConnection, config: SnowDDLConfig, settings: SnowDDLSettings):
+    def __init__(
+        self,
+        connection: SnowflakeConnection,
+        config: SnowDDLConfig,
+        settings: SnowDDLSettings,
+        connection_pool: Optional[SnowDDLConnectionPool] = None,
+        tracer: Optional[SnowDDLTracer] = None,
+        plan_output: Optional[SnowDDLPlanOutput] = None,
+    ):
         self.connection = connection
+        self.connection_pool = connection_pool
+        self.tracer = tracer
+        self.plan_output = plan_output
         self.config = config
         self.settings = settings
         self.logger = logger
@@ -30,17 +57,77 @@ class SnowDDLEngine:
 
         self.executor = ThreadPoolExecutor(max_workers=self.settings.max_workers, thread_name_prefix=self.__class__.__name__)
 
+        # Statements are not kept in memory if plan output is used, but they are still counted
         self.executed_ddl = []
         self.suggested_ddl = []
+        self.executed_ddl_count = 0
+        self.suggested_ddl_count = 0
 
         self._executed_ddl_buffer = defaultdict(list)
         self._suggested_ddl_buffer = defaultdict(list)
+        self._planned_ddl_buffer = defaultdict(list)
+        self._planned_query_buffer = defaultdict(list)
+        self._ddl_buffer_lock = Lock()
+
+        self.query_metrics = SnowDDLQueryMetrics()
+
+        self.async_queue = None
+        self.concurrency_limiter = None
+        self.retry_policy = None
+        self.metadata_cache = None
+        self.state = None
+        self.saved_plan = None
+        self._thread_local = threading_local()
+
+        # Intention cache and grant cache track all executed DDL, including statements executed during initialization
+        self.intention_cache = IntentionCache(self)
+        self.grant_cache = GrantCache(self)
+
+        if self.settings.execute_async_ddl:
+            self.async_queue = SnowDDLAsyncQueue(self._add_executed_ddl, self.settings.max_async_queries)
+
+        if self.settings.max_query_retries > 0:
+            self.retry_policy = SnowDDLRetryPolicy(self.settings.max_query_retries)
+
+        if self.settings.adaptive_concurrency:
+            # Executor size is the upper bound, limit starts low and grows while latency remains stable
+            self.concurrency_limiter = SnowDDLConcurrencyLimiter(1, self.settings.max_workers, min(8, self.settings.max_workers))
+
+        # Main session is used by thread which created engine, pooled sessions are used by all other threads
+        self._main_thread_ident = threading_get_ident()
 
         self.context = SnowDDLContext(self)
         self.context.activate_role_with_prefix()
 
-        self.intention_cache = IntentionCache(self)
+        if self.connection_pool:
+            self.connection_pool.open(self._prepare_pooled_connection)
+
+        # Cached metadata might be outdated, so it is only read when DDL is not executed
+        # Runs executing DDL remove cached results of touched objects, so subsequent runs do not read outdated results
+        if self.settings.metadata_cache_path:
+            self.metadata_cache = SnowDDLMetadataCache(
+                Path(self.settings.metadata_cache_path),
+                self.settings.metadata_cache_ttl,
+                self.get_scope(),
+                is_invalidate_only=self.settings.execute_safe_ddl or bool(self.settings.saved_plan_path),
+            )
+            self.metadata_cache.load()
+
+        if self.settings.state_file_path:
+            self.state = SnowDDLState(
+                Path(self.settings.state_file_path),
+                __version__,
+                self.settings,
+                self.get_scope(),
+            )
+            self.state.load()
+
+        if self.settings.saved_plan_path:
+            # Statements are recorded to saved plan instead of execution, saved plan is applied later
+            self.saved_plan = SnowDDLSavedPlan(Path(self.settings.saved_plan_path), __version__, self.settings, self.get_scope())
+
         self.schema_cache = SchemaCache(self)
+        self.table_column_cache = TableColumnCache(self)
 
     def __enter__(self):
         return self
@@ -48,6 +135,18 @@ class SnowDDLEngine:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.executor.shutdown()
 
+        if self.async_queue:
+            self.async_queue.stop()
+
+        if self.connection_pool:
+            self.connection_pool.close()
+
+        if self.metadata_cache:
+            self.metadata_cache.save()
+
+        if self.plan_output:
+            self.plan_output.close()
+
     def query_builder(self):
         return SnowDDLQueryBuilder(self.formatter)
 
@@ -57,59 +156,539 @@ class SnowDDLEngine:
     def execute_meta(self, sql, params=None):
         return self._execute(sql, params, is_meta=True)
 
+    def execute_meta_multi(self, queries: List[Tuple[str, Optional[Dict]]]) -> List[List[Dict]]:
+        # Multiple metadata queries are executed by a single multi-statement query, returns rows of each query
+        sql_list = [self.format(sql, params) for sql, params in queries]
+
+        # Metadata cache stores results of individual queries, snapshot cursors do not support multiple result sets
+        # Queries in tasks must wait for deferred DDL, which is handled by regular execution
+        if (
+            len(sql_list) < 2
+            or (self.metadata_cache and not self.metadata_cache.is_invalidate_only)
+            or getattr(self._thread_local, "async_chain", None)
+            or getattr(self._thread_local, "ddl_batch", None) is not None
+        ):
+            return [list(self._execute(sql, None, is_meta=True)) for sql in sql_list]
+
+        cur = self._get_thread_connection().cursor(DictCursor)
+
+        if not hasattr(cur, "nextset"):
+            return [list(self._execute(sql, None, is_meta=True)) for sql in sql_list]
+
+        batch_sql = ";\n".join(sql_list)
+
+        with self.trace_span("BATCH", "meta", sql=batch_sql) as span_args:
+            start_counter = perf_counter()
+
+            try:
+                self._run_query(batch_sql, "BATCH", lambda: cur.execute(batch_sql, num_statements=len(sql_list)))
+            except Error as e:
+                self.query_metrics.add("BATCH", perf_counter() - start_counter, True)
+                span_args["error"] = str(e)
+                raise SnowDDLExecuteError(e, batch_sql)
+
+            self.query_metrics.add("BATCH", perf_counter() - start_counter)
+
+            span_args["query_id"] = getattr(cur, "sfqid", None)
+
+        results = [list(cur)]
+
+        # Results of each statement are fetched one by one
+        while len(results) < len(sql_list) and cur.nextset():
+            results.append(list(cur))
+
+        return results
+
     def execute_clone(self, sql, params=None):
         return self._execute(sql, params)
 
     def execute_context_ddl(self, sql, params=None):
         return self._execute(sql, params)
 
+    def execute_session_ddl(self, sql, params=None):
+        # Changes state of session (e.g. USE WAREHOUSE), must be applied to main session and to all pooled sessions
+        result = self._execute(sql, params, connection=self.connection)
+
+        # Session state is changed again when saved plan is applied, e.g. after CREATE WAREHOUSE
+        if self.saved_plan:
+            with self._ddl_buffer_lock:
+                self._planned_ddl_buffer[self._get_buffer_key()].append(
+                    SnowDDLSavedPlan.make_statement(self.format(sql, params), True, is_session=True)
+                )
+
+        if self.connection_pool:
+            for connection in self.connection_pool.get_all_connections():
+                self._execute(sql, params, is_meta=True, connection=connection)
+
+        return result
+
     def execute_safe_ddl(self, sql, params=None, condition=True, file_stream=None):
         if self.settings.execute_safe_ddl and condition:
-            self._execute(sql, params, False, file_stream)
+            self._execute_ddl(sql, params, file_stream)
         else:
             self._suggest(sql, params)
 
     def execute_unsafe_ddl(self, sql, params=None, condition=True, file_stream=None):
         if self.settings.execute_unsafe_ddl and condition:
-            self._execute(sql, params, False, file_stream)
+            self._execute_ddl(sql, params, file_stream)
         else:
             self._suggest(sql, params)
 
+    def execute_saved_plan_step(self, step):
+        buffer_key = (step["resolver"], step["object"])
+
+        with self.buffer_key_context(buffer_key):
+            try:
+                for statement in step["statements"]:
+                    if statement.get("session"):
+                        self.execute_session_ddl(statement["sql"])
+                    elif statement["execute"]:
+                        file_stream = SnowDDLSavedPlan.get_file_stream(statement)
+                        self._execute(statement["sql"], None, False, file_stream, is_deferrable=True)
+                    else:
+                        self._suggest(statement["sql"], None)
+            finally:
+                self.flush_task_buffer(buffer_key)
+
+    def get_saved_plan_query_fingerprint(self, query: Dict):
+        # Metadata query used by saved plan step is executed again, result must remain the same
+        try:
+            if query.get("describe"):
+                rows = self._describe(query["sql"], None)
+            else:
+                rows = list(self._execute(query["sql"], None, is_meta=True))
+        except SnowDDLExecuteError as e:
+            return SnowDDLSavedPlan.get_query_fingerprint(error=e.snow_exc)
+
+        return SnowDDLSavedPlan.get_query_fingerprint(rows)
+
+    def add_planned_query(self, sql, rows=None, error=None, is_describe=False):
+        # Metadata queries of tasks are saved together with planned statements to detect changes made after plan
+        # Queries executed outside of tasks (e.g. SHOW for all objects) are covered by fingerprint of existing objects
+        buffer_key = self._get_buffer_key()
+
+        if not self.saved_plan or not self._is_task_buffer_key(buffer_key):
+            return
+
+        query = SnowDDLSavedPlan.make_query(sql, SnowDDLSavedPlan.get_query_fingerprint(rows, error), is_describe)
+
+        with self._ddl_buffer_lock:
+            # The same query might be executed by task and returned by cache (e.g. parameters of schema)
+            if query not in self._planned_query_buffer[buffer_key]:
+                self._planned_query_buffer[buffer_key].append(query)
+
+    def get_scope(self):
+        # Account, role and env prefix, results of metadata queries are valid only within the same scope
+        return (
+            f"{self.context.current_region}|{self.context.current_account}|"
+            f"{self.context.current_role}|{self.config.env_prefix}"
+        )
+
+    def is_target(self, full_name: str):
+        # Objects matching target pattern and all objects nested into matching objects are targeted
+        if self.settings.target is None:
+            return True
+
+        str_name = full_name.removeprefix(self.config.env_prefix)
+
+        # Arguments of functions and procedures, paths of stage files are not part of parent names
+        name_parts = str_name.partition("(")[0].split(".")
+        str_names = [str_name] + [".".join(name_parts[:i]) for i in range(1, len(name_parts) + 1)]
+
+        return any(self.settings.target.is_match_str_include(n) for n in str_names) and not any(
+            self.settings.target.is_match_str_exclude(n) for n in str_names
+        )
+
+    def is_target_parent(self, full_name: str):
+        # Metadata of nested objects is loaded only if object is targeted or may contain targeted objects
+        if self.settings.target is None:
+            return True
+
+        return self.is_target(full_name) or self.settings.target.is_match_str_descendant(
+            full_name.removeprefix(self.config.env_prefix)
+        )
+
+    def trace_span(self, name, category, **args):
+        if self.tracer:
+            return self.tracer.span(name, category, **args)
+
+        return nullcontext({})
+
+    def query_slot(self, kind):
+        if self.concurrency_limiter:
+            return self.concurrency_limiter.slot(kind)
+
+        return nullcontext()
+
+    def has_executed_ddl(self):
+        with self._ddl_buffer_lock:
+            return self.executed_ddl_count > 0 or any(self._executed_ddl_buffer.values())
+
+    def submit_task(self, fn, *args, buffer_key=None) -> Future:
+        # DDL of task with buffer key is buffered separately and flushed by flush_task_buffer, when object is resolved
+        if self.async_queue:
+            return self._submit_async_task(self._wrap_buffer_key(fn, buffer_key), *args, buffer_key=buffer_key)
+
+        if self.settings.max_batch_statements > 1:
+            return self.executor.submit(self._wrap_buffer_key(self._run_batched_task, buffer_key), fn, *args)
+
+        return self.executor.submit(self._wrap_buffer_key(fn, buffer_key), *args)
+
+    def map(self, fn, *iterables):
+        # Worker threads inherit query metric labels, trace span arguments and buffer key of current thread
+        # Otherwise metadata queries executed by resolver in parallel would not be attributed to resolver
+        name = fn.__name__
+        fn = self.query_metrics.wrap(fn, **self.query_metrics.get_current_labels())
+
+        if self.tracer:
+            fn = self.tracer.wrap(fn, name, "map", **self.tracer.get_current_args())
+
+        return self.executor.map(self._wrap_buffer_key(fn, getattr(self._thread_local, "buffer_key", None)), *iterables)
+
     def flush_thread_buffers(self):
-        for thread_sql in self._executed_ddl_buffer.values():
-            for sql in thread_sql:
-                self.executed_ddl.append(sql)
+        # Lock is required, since multiple resolvers may run concurrently
+        # Buffers of tasks which are still running in other resolvers are not flushed
+        with self._ddl_buffer_lock:
+            keys = [
+                key
+                for key in {**self._executed_ddl_buffer, **self._suggested_ddl_buffer, **self._planned_ddl_buffer}
+                if not self._is_task_buffer_key(key)
+            ]
+
+            self._flush_buffers(keys)
+
+            for key in keys:
+                self._flush_planned_buffer(key)
+
+    def flush_task_buffer(self, buffer_key):
+        with self._ddl_buffer_lock:
+            self._flush_buffers([buffer_key])
+
+    def flush_planned_buffer(self, buffer_key):
+        # Saved plan steps are flushed in order of completion, which respects dependencies between objects
+        with self._ddl_buffer_lock:
+            self._flush_planned_buffer(buffer_key)
+
+    @contextmanager
+    def buffer_key_context(self, buffer_key):
+        parent_buffer_key = getattr(self._thread_local, "buffer_key", None)
+        self._thread_local.buffer_key = buffer_key
 
-        for thread_sql in self._suggested_ddl_buffer.values():
-            for sql in thread_sql:
-                self.suggested_ddl.append(sql)
+        try:
+            yield
+        finally:
+            self._thread_local.buffer_key = parent_buffer_key
 
-        self._executed_ddl_buffer = defaultdict(list)
-        self._suggested_ddl_buffer = defaultdict(list)
+    def _flush_buffers(self, keys):
+        for key in keys:
+            statements = self._executed_ddl_buffer.pop(key, [])
+            self.executed_ddl_count += len(statements)
 
-    def _execute(self, sql, params, is_meta=False, file_stream=None):
-        sql = self.format(sql, params)
+            if self.plan_output:
+                self.plan_output.write("executed", statements, *self._get_buffer_key_names(key))
+            else:
+                self.executed_ddl.extend(statements)
+
+        for key in keys:
+            statements = self._suggested_ddl_buffer.pop(key, [])
+            self.suggested_ddl_count += len(statements)
+
+            if self.plan_output:
+                self.plan_output.write("suggested", statements, *self._get_buffer_key_names(key))
+            else:
+                self.suggested_ddl.extend(statements)
+
+    def _flush_planned_buffer(self, key):
+        statements = self._planned_ddl_buffer.pop(key, [])
+        queries = self._planned_query_buffer.pop(key, [])
+
+        if self.saved_plan:
+            self.saved_plan.add_step(statements, queries, *self._get_buffer_key_names(key))
+
+    def _wrap_buffer_key(self, fn, buffer_key):
+        def wrapper(*fn_args):
+            with self.buffer_key_context(buffer_key):
+                return fn(*fn_args)
+
+        return wrapper
+
+    def _get_buffer_key(self):
+        return getattr(self._thread_local, "buffer_key", None) or threading_get_ident()
+
+    def _get_buffer_key_names(self, buffer_key):
+        # Task buffer key is a tuple of resolver name and object name, resolver buffer key has no object name
+        # Thread buffer key is a thread ident, it is used for DDL executed outside of resolvers
+        if isinstance(buffer_key, tuple):
+            return buffer_key
+
+        return None, None
+
+    def _is_task_buffer_key(self, buffer_key):
+        return isinstance(buffer_key, tuple) and buffer_key[1] is not None
+
+    def _submit_async_task(self, fn, *args, buffer_key=None) -> Future:
+        # Task is completed only when all asynchronous statements produced by task are completed
+        # Worker thread is released as soon as task function returns, statements remain in flight
+        task_future = Future()
+
+        def run_task():
+            chain = self.async_queue.start_chain(buffer_key)
+            self._thread_local.async_chain = chain
+
+            try:
+                result = fn(*args)
+                error = None
+            except Exception as e:
+                result = None
+                error = e
+            finally:
+                self._thread_local.async_chain = None
+
+            def on_chain_done(chain_error):
+                if error or chain_error:
+                    task_future.set_exception(error or chain_error)
+                else:
+                    task_future.set_result(result)
+
+            chain.close()
+            chain.add_done_callback(on_chain_done)
+
+        self.executor.submit(run_task)
+
+        return task_future
+
+    def _run_batched_task(self, fn, *args):
+        self._thread_local.ddl_batch = []
 
         try:
-            result = self.connection.cursor(DictCursor).execute(sql, file_stream=file_stream)
-        except Error as e:
-            raise SnowDDLExecuteError(e, sql)
+            result = fn(*args)
+        except Exception:
+            # Statements queued before error would have been executed without batching
+            # Original error is more important than possible error in batch
+            try:
+                self._flush_ddl_batch()
+            except SnowDDLExecuteError:
+                pass
+
+            raise
+        else:
+            self._flush_ddl_batch()
+        finally:
+            self._thread_local.ddl_batch = None
+
+        return result
+
+    def _execute(self, sql, params, is_meta=False, file_stream=None, connection=None, is_deferrable=False):
+        sql = self.format(sql, params)
+
+        if connection is None:
+            connection = self._get_thread_connection()
+
+        async_chain = getattr(self._thread_local, "async_chain", None)
+
+        if async_chain:
+            if is_deferrable and file_stream is None:
+                async_chain.add(connection, sql)
+                return None
+
+            # Synchronous query must see results of all previous asynchronous statements of the same task
+            async_chain.wait_idle()
+
+        ddl_batch = getattr(self._thread_local, "ddl_batch", None)
+
+        if ddl_batch is not None:
+            if is_deferrable and file_stream is None and self._is_batchable_sql(sql):
+                ddl_batch.append(sql)
+
+                if len(ddl_batch) >= self.settings.max_batch_statements:
+                    self._flush_ddl_batch()
+
+                return None
+
+            # Any other query must be executed after all previous statements of the same task
+            self._flush_ddl_batch()
+
+        is_cacheable = is_meta and self.metadata_cache and self.metadata_cache.is_cacheable(sql)
+
+        if is_cacheable:
+            cached_result = self.metadata_cache.get(sql)
+
+            if cached_result:
+                return cached_result
+
+            generation = self.metadata_cache.generation
+
+        sql_kind = self._get_sql_kind(sql)
+
+        with self.trace_span(sql_kind, "meta" if is_meta else "ddl", sql=sql) as span_args:
+            start_counter = perf_counter()
+
+            try:
+                # File stream is consumed by the first attempt, query cannot be retried
+                result = self._run_query(
+                    sql,
+                    sql_kind,
+                    lambda: connection.cursor(DictCursor).execute(sql, file_stream=file_stream),
+                    file_stream is None,
+                )
+            except Error as e:
+                self.query_metrics.add(sql_kind, perf_counter() - start_counter, True)
+                span_args["error"] = str(e)
+
+                if is_meta:
+                    self.add_planned_query(sql, error=e)
+
+                raise SnowDDLExecuteError(e, sql)
+
+            self.query_metrics.add(sql_kind, perf_counter() - start_counter)
+
+            span_args["query_id"] = getattr(result, "sfqid", None)
 
         if not is_meta:
-            self._executed_ddl_buffer[threading_get_ident()].append(sql)
+            self._add_executed_ddl(sql)
+        elif self.saved_plan and self._is_task_buffer_key(self._get_buffer_key()):
+            rows = list(result)
+            self.add_planned_query(sql, rows)
+
+            return SnowDDLSnapshotCursor(rows, result.rowcount, getattr(result, "sfqid", None))
+
+        if is_cacheable:
+            return self.metadata_cache.add(sql, result, generation)
 
         return result
 
+    def _flush_ddl_batch(self):
+        ddl_batch = getattr(self._thread_local, "ddl_batch", None)
+
+        if not ddl_batch:
+            return
+
+        statements = list(ddl_batch)
+        ddl_batch.clear()
+
+        if len(statements) > 1:
+            batch_sql = ";\n".join(statements)
+            start_counter = perf_counter()
+
+            try:
+                with self.trace_span("BATCH", "ddl", sql=batch_sql) as span_args:
+                    cur = self._get_thread_connection().cursor(DictCursor)
+                    self._run_query(batch_sql, "BATCH", lambda: cur.execute(batch_sql, num_statements=len(statements)))
+
+                    span_args["query_id"] = getattr(cur, "sfqid", None)
+            except Error as e:
+                self.query_metrics.add("BATCH", perf_counter() - start_counter, True)
+
+                # Error in batch does not point to exact statement, but all batchable statements are idempotent
+                # Statements are executed again one by one to find exact failed statement
+                self.logger.debug(f"Batch of {len(statements)} statements failed, executing statements one by one: {e}")
+            else:
+                self.query_metrics.add("BATCH", perf_counter() - start_counter)
+
+                for sql in statements:
+                    self._add_executed_ddl(sql)
+
+                return
+
+        for sql in statements:
+            sql_kind = self._get_sql_kind(sql)
+
+            with self.trace_span(sql_kind, "ddl", sql=sql) as span_args:
+                start_counter = perf_counter()
+
+                try:
+                    cur = self._get_thread_connection().cursor(DictCursor)
+                    self._run_query(sql, sql_kind, lambda: cur.execute(sql))
+                except Error as e:
+                    self.query_metrics.add(sql_kind, perf_counter() - start_counter, True)
+                    span_args["error"] = str(e)
+                    raise SnowDDLExecuteError(e, sql)
+
+                self.query_metrics.add(sql_kind, perf_counter() - start_counter)
+
+                span_args["query_id"] = getattr(cur, "sfqid", None)
+
+            self._add_executed_ddl(sql)
+
+    def _run_query(self, sql, kind, fn, is_retryable_sql=True):
+        def run_attempt():
+            with self.query_slot(kind):
+                return fn()
+
+        if self.retry_policy:
+            return self.retry_policy.execute(sql, run_attempt, is_retryable_sql)
+
+        return run_attempt()
+
+    def _is_batchable_sql(self, sql: str):
+        # Only idempotent statements without ordering constraints between each other can be batched
+        return sql.startswith(("GRANT ", "REVOKE ")) and ";" not in sql
+
     def _describe(self, sql, params):
         sql = self.format(sql, params)
 
-        try:
-            result = self.connection.cursor(DictCursor).describe(sql)
-        except Error as e:
-            raise SnowDDLExecuteError(e, sql)
+        with self.trace_span("DESCRIBE", "meta", sql=sql) as span_args:
+            start_counter = perf_counter()
+
+            try:
+                result = self._run_query(sql, "DESCRIBE", lambda: self._get_thread_connection().cursor(DictCursor).describe(sql))
+            except Error as e:
+                self.query_metrics.add("DESCRIBE", perf_counter() - start_counter, True)
+                span_args["error"] = str(e)
+                self.add_planned_query(sql, error=e, is_describe=True)
+                raise SnowDDLExecuteError(e, sql)
+
+            self.query_metrics.add("DESCRIBE", perf_counter() - start_counter)
+
+        self.add_planned_query(sql, result, is_describe=True)
 
         return result
 
-    def _suggest(self, sql, params):
+    def _execute_ddl(self, sql, params, file_stream):
+        if self.saved_plan:
+            self._suggest(sql, params, file_stream, is_executed_by_saved_plan=True)
+        else:
+            self._execute(sql, params, False, file_stream, is_deferrable=True)
+
+    def _suggest(self, sql, params, file_stream=None, is_executed_by_saved_plan=False):
         sql = self.format(sql, params)
-        self._suggested_ddl_buffer[threading_get_ident()].append(sql)
+
+        with self._ddl_buffer_lock:
+            self._suggested_ddl_buffer[self._get_buffer_key()].append(sql)
+
+            if self.saved_plan:
+                self._planned_ddl_buffer[self._get_buffer_key()].append(
+                    SnowDDLSavedPlan.make_statement(sql, is_executed_by_saved_plan, file_stream)
+                )
+
+    def _add_executed_ddl(self, sql, buffer_key=None):
+        # Statements executed asynchronously are completed in poller thread, buffer key of task is passed explicitly
+        with self._ddl_buffer_lock:
+            self._executed_ddl_buffer[buffer_key or self._get_buffer_key()].append(sql)
+
+        self.intention_cache.add_executed_ddl(sql)
+        self.grant_cache.invalidate(sql)
+
+        if self.metadata_cache:
+            self.metadata_cache.invalidate(sql)
+
+    def _get_sql_kind(self, sql: str):
+        # First keyword of statement, e.g. SHOW, CREATE, GRANT, used as statement kind for traces and metrics
+        return sql.lstrip().split(None, 1)[0].upper() if sql.strip() else "SQL"
+
+    def _get_thread_connection(self) -> SnowflakeConnection:
+        if self.connection_pool and threading_get_ident() != self._main_thread_ident:
+            return self.connection_pool.get_connection()
+
+        return self.connection
+
+    def _prepare_pooled_connection(self, connection: SnowflakeConnection):
+        # Pooled session should have the same role and warehouse as main session
+        # Query tag is set by connection factory in session parameters
+        if self.context.current_role != self.context.original_role:
+            self._execute("USE ROLE {role:i}", {"role": self.context.current_role}, is_meta=True, connection=connection)
+
+        if self.context.current_warehouse:
+            self._execute(
+                "USE WAREHOUSE {warehouse:i}", {"warehouse": self.context.current_warehouse}, is_meta=True, connection=connection
+            )
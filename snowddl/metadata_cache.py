@@ -0,0 +1,158 @@
+from gzip import open as gzip_open
+from hashlib import sha256
+from json import dump as json_dump, load as json_load
+from os import replace
+from pathlib import Path
+from re import compile
+from threading import Lock
+from time import time
+from typing import Dict, Optional, Set, Tuple
+
+from snowddl.snapshot import SnowDDLSnapshotCursor, encode_json_value, decode_json_value
+
+# Sequence of quoted identifiers separated by dots, e.g. "DB"."SCHEMA"."TABLE"
+IDENT_CHAIN_PATTERN = compile(r'(?:"(?:[^"]|"")*"\.)*"(?:[^"]|"")*"')
+IDENT_PART_PATTERN = compile(r'"((?:[^"]|"")*)"')
+
+
+# Persistent cache for results of metadata queries (SHOW, DESC), stored in a single file
+# Results are isolated by scope (account, role, env prefix), each result expires after TTL
+# Results related to objects touched by executed DDL are invalidated immediately
+# Runs executing DDL use cache in invalidate-only mode, results are never read, but entries affected by DDL are removed
+class SnowDDLMetadataCache:
+    format_version = 1
+
+    cacheable_prefixes = ("SHOW ", "DESC ", "DESCRIBE ")
+
+    # Grants may change after DDL on any object (e.g. DROP TABLE removes all grants on this table)
+    always_invalidated_prefixes = ("SHOW GRANTS ", "SHOW FUTURE GRANTS ")
+
+    def __init__(self, path: Path, ttl: int, scope: str, is_invalidate_only: bool = False):
+        self.path = path
+        self.ttl = ttl
+        self.scope = sha256(scope.encode("utf-8")).hexdigest()
+        self.is_invalidate_only = is_invalidate_only
+
+        self.entries: Dict[str, dict] = {}
+        self.other_scope_entries: Dict[str, Dict[str, dict]] = {}
+
+        self.hit_count = 0
+        self.miss_count = 0
+
+        # Incremented on each invalidation, prevents caching of results obtained concurrently with DDL
+        self.generation = 0
+
+        self._lock = Lock()
+
+    def load(self):
+        if not self.path.is_file():
+            return
+
+        try:
+            with gzip_open(self.path, "rt", encoding="utf-8") as f:
+                data = json_load(f, object_hook=decode_json_value)
+        except (OSError, ValueError):
+            # Broken cache file is ignored and overwritten on save
+            return
+
+        if data.get("format_version") != self.format_version:
+            return
+
+        scopes = data.get("scopes", {})
+
+        self.entries = scopes.pop(self.scope, {})
+        self.other_scope_entries = scopes
+
+    def save(self):
+        with self._lock:
+            scopes = {
+                scope: self._get_valid_entries(entries)
+                for scope, entries in {**self.other_scope_entries, self.scope: self.entries}.items()
+            }
+
+        data = {
+            "format_version": self.format_version,
+            "scopes": {scope: entries for scope, entries in scopes.items() if entries},
+        }
+
+        # Cache file is replaced atomically, concurrent runs never read partially written file
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+
+        with gzip_open(tmp_path, "wt", encoding="utf-8") as f:
+            json_dump(data, f, default=encode_json_value, separators=(",", ":"))
+
+        replace(tmp_path, self.path)
+
+    def is_cacheable(self, sql: str):
+        if self.is_invalidate_only:
+            return False
+
+        return sql.lstrip().upper().startswith(self.cacheable_prefixes)
+
+    def get(self, sql: str) -> Optional[SnowDDLSnapshotCursor]:
+        with self._lock:
+            entry = self.entries.get(sql)
+
+            if entry is None or not self._is_valid_entry(entry):
+                self.miss_count += 1
+                return None
+
+            self.hit_count += 1
+
+        return SnowDDLSnapshotCursor(entry["rows"], entry["rowcount"], entry["sfqid"])
+
+    def add(self, sql: str, cur, generation: int) -> SnowDDLSnapshotCursor:
+        rows = list(cur)
+        entry = {
+            "created_at": time(),
+            "rows": rows,
+            "rowcount": cur.rowcount,
+            "sfqid": cur.sfqid,
+            "idents": [list(chain) for chain in self._get_ident_chains(sql)],
+        }
+
+        with self._lock:
+            if generation == self.generation:
+                self.entries[sql] = entry
+
+        return SnowDDLSnapshotCursor(rows, entry["rowcount"], entry["sfqid"])
+
+    def invalidate(self, ddl_sql: str):
+        ddl_chains = self._get_ident_chains(ddl_sql)
+        ddl_prefixes = self._get_prefixes(ddl_chains)
+
+        with self._lock:
+            self.generation += 1
+
+            for sql in list(self.entries):
+                if self._is_affected(sql, self.entries[sql], ddl_chains, ddl_prefixes):
+                    del self.entries[sql]
+
+    def _is_affected(self, sql: str, entry: dict, ddl_chains: Set[Tuple[str, ...]], ddl_prefixes: Set[Tuple[str, ...]]):
+        # Queries without identifiers usually list objects in account (e.g. SHOW ROLES LIKE ...)
+        if not entry["idents"] or sql.lstrip().upper().startswith(self.always_invalidated_prefixes):
+            return True
+
+        entry_chains = {tuple(chain) for chain in entry["idents"]}
+
+        # Parent of DDL object (e.g. SHOW TABLES IN SCHEMA after CREATE TABLE) or DDL object itself
+        if entry_chains & ddl_prefixes:
+            return True
+
+        # Child of DDL object (e.g. DESC TABLE after DROP SCHEMA)
+        if self._get_prefixes(entry_chains) & ddl_chains:
+            return True
+
+        return False
+
+    def _is_valid_entry(self, entry: dict):
+        return time() - entry["created_at"] <= self.ttl
+
+    def _get_valid_entries(self, entries: Dict[str, dict]):
+        return {sql: entry for sql, entry in entries.items() if self._is_valid_entry(entry)}
+
+    def _get_ident_chains(self, sql: str) -> Set[Tuple[str, ...]]:
+        return {tuple(IDENT_PART_PATTERN.findall(m.group(0))) for m in IDENT_CHAIN_PATTERN.finditer(sql)}
+
+    def _get_prefixes(self, chains: Set[Tuple[str, ...]]) -> Set[Tuple[str, ...]]:
+        return {chain[:i] for chain in chains for i in range(1, len(chain) + 1)}
@@ -0,0 +1,183 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from json import dump as json_dump
+from math import ceil
+from os import replace
+from pathlib import Path
+from threading import Lock, local as threading_local
+from typing import Dict, List, Optional, Tuple
+
+UNKNOWN_LABEL = "-"
+
+
+class SnowDDLQueryStats:
+    quantiles = (0.5, 0.95, 0.99)
+
+    def __init__(self, durations: List[float], error_count: int):
+        self.durations = sorted(durations)
+        self.error_count = error_count
+
+    @property
+    def count(self):
+        return len(self.durations)
+
+    @property
+    def total(self):
+        return sum(self.durations)
+
+    @property
+    def max(self):
+        return self.durations[-1] if self.durations else 0.0
+
+    def percentile(self, q: float):
+        # Nearest-rank method, returns actually observed value
+        if not self.durations:
+            return 0.0
+
+        return self.durations[max(ceil(q * len(self.durations)), 1) - 1]
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.error_count,
+            "total_seconds": round(self.total, 6),
+            "p50_seconds": round(self.percentile(0.5), 6),
+            "p95_seconds": round(self.percentile(0.95), 6),
+            "p99_seconds": round(self.percentile(0.99), 6),
+            "max_seconds": round(self.max, 6),
+        }
+
+
+# Collects latency of every query executed by engine
+# Each query is labeled with resolver and object name of current thread, e.g. task running in worker thread
+class SnowDDLQueryMetrics:
+    def __init__(self):
+        # (statement kind, resolver, object, duration in seconds, is error)
+        self.queries: List[Tuple[str, str, Optional[str], float, bool]] = []
+
+        self._thread_local = threading_local()
+        self._lock = Lock()
+
+    @contextmanager
+    def labels(self, **labels):
+        parent_labels = getattr(self._thread_local, "labels", {})
+        self._thread_local.labels = {**parent_labels, **labels}
+
+        try:
+            yield
+        finally:
+            self._thread_local.labels = parent_labels
+
+    def wrap(self, fn, **labels):
+        def wrapper(*fn_args):
+            with self.labels(**labels):
+                return fn(*fn_args)
+
+        return wrapper
+
+    def get_current_labels(self):
+        return dict(getattr(self._thread_local, "labels", {}))
+
+    def add(self, kind: str, duration: float, is_error: bool = False):
+        labels = getattr(self._thread_local, "labels", {})
+
+        with self._lock:
+            self.queries.append((kind, labels.get("resolver", UNKNOWN_LABEL), labels.get("object"), duration, is_error))
+
+    def get_total_stats(self) -> SnowDDLQueryStats:
+        with self._lock:
+            return SnowDDLQueryStats([q[3] for q in self.queries], sum(1 for q in self.queries if q[4]))
+
+    def get_stats_by_resolver(self) -> Dict[str, SnowDDLQueryStats]:
+        return self._get_stats(lambda kind, resolver, object_name: resolver)
+
+    def get_stats_by_kind(self) -> Dict[str, SnowDDLQueryStats]:
+        return self._get_stats(lambda kind, resolver, object_name: kind)
+
+    def get_slowest_objects(self, limit: int) -> List[Tuple[str, str, SnowDDLQueryStats]]:
+        stats = self._get_stats(lambda kind, resolver, object_name: (resolver, object_name) if object_name else None)
+        slowest = sorted(stats.items(), key=lambda item: (-item[1].total, item[0]))[:limit]
+
+        return [(resolver, object_name, object_stats) for (resolver, object_name), object_stats in slowest]
+
+    def to_dict(self, slowest_objects_limit: int):
+        return {
+            "total": self.get_total_stats().to_dict(),
+            "by_resolver": {name: stats.to_dict() for name, stats in self.get_stats_by_resolver().items()},
+            "by_statement_kind": {name: stats.to_dict() for name, stats in self.get_stats_by_kind().items()},
+            "slowest_objects": [
+                {"resolver": resolver, "object": object_name, **stats.to_dict()}
+                for resolver, object_name, stats in self.get_slowest_objects(slowest_objects_limit)
+            ],
+        }
+
+    def to_prometheus(self, slowest_objects_limit: int):
+        lines = []
+
+        for label_name, stats in (("resolver", self.get_stats_by_resolver()), ("kind", self.get_stats_by_kind())):
+            metric_name = f"snowddl_query_by_{label_name}_duration_seconds"
+
+            lines.append(f"# HELP {metric_name} Latency of queries executed by SnowDDL grouped by {label_name}")
+            lines.append(f"# TYPE {metric_name} summary")
+
+            for name, group_stats in stats.items():
+                label = f'{label_name}="{self._escape_label_value(name)}"'
+
+                for q in SnowDDLQueryStats.quantiles:
+                    lines.append(f'{metric_name}{{{label},quantile="{q}"}} {group_stats.percentile(q):.6f}')
+
+                lines.append(f"{metric_name}_sum{{{label}}} {group_stats.total:.6f}")
+                lines.append(f"{metric_name}_count{{{label}}} {group_stats.count}")
+
+            lines.append(
+                f"# HELP snowddl_query_by_{label_name}_errors_total Failed queries executed by SnowDDL grouped by {label_name}"
+            )
+            lines.append(f"# TYPE snowddl_query_by_{label_name}_errors_total counter")
+
+            for name, group_stats in stats.items():
+                label = f'{label_name}="{self._escape_label_value(name)}"'
+                lines.append(f"snowddl_query_by_{label_name}_errors_total{{{label}}} {group_stats.error_count}")
+
+        lines.append("# HELP snowddl_slowest_object_duration_seconds Total latency of queries executed for the slowest objects")
+        lines.append("# TYPE snowddl_slowest_object_duration_seconds gauge")
+
+        for resolver, object_name, stats in self.get_slowest_objects(slowest_objects_limit):
+            label = f'resolver="{self._escape_label_value(resolver)}",object="{self._escape_label_value(object_name)}"'
+            lines.append(f"snowddl_slowest_object_duration_seconds{{{label}}} {stats.total:.6f}")
+
+        return "\n".join(lines) + "\n"
+
+    def save(self, path: Path, slowest_objects_limit: int):
+        # Prometheus textfile collector may read file at any moment, so file is replaced atomically
+        tmp_path = path.with_name(f"{path.name}.tmp")
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            if path.suffix == ".prom":
+                f.write(self.to_prometheus(slowest_objects_limit))
+            else:
+                json_dump(self.to_dict(slowest_objects_limit), f, indent=2)
+
+        replace(tmp_path, path)
+
+    def _get_stats(self, key_fn) -> Dict:
+        durations = defaultdict(list)
+        error_counts = defaultdict(int)
+
+        with self._lock:
+            queries = list(self.queries)
+
+        for kind, resolver, object_name, duration, is_error in queries:
+            key = key_fn(kind, resolver, object_name)
+
+            if key is None:
+                continue
+
+            durations[key].append(duration)
+
+            if is_error:
+                error_counts[key] += 1
+
+        return {key: SnowDDLQueryStats(durations[key], error_counts[key]) for key in sorted(durations)}
+
+    def _escape_label_value(self, value: str):
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,61 @@
+from json import dumps as json_dumps
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional
+
+
+# Writes executed and suggested DDL to file as soon as object is resolved, statements are not kept in memory
+# Statements of each resolver are written in order of object names, regardless of order of completion of parallel tasks
+class SnowDDLPlanOutput:
+    formats = ("jsonl", "sql")
+
+    def __init__(self, path: Path, output_format: Optional[str] = None):
+        if output_format is None:
+            output_format = "sql" if path.suffix.lower() == ".sql" else "jsonl"
+
+        if output_format not in self.formats:
+            raise ValueError(f"Unsupported plan output format [{output_format}], supported formats: {', '.join(self.formats)}")
+
+        self.path = path
+        self.output_format = output_format
+
+        self.statement_count = 0
+
+        self._file = open(path, "w", encoding="utf-8")
+        self._lock = Lock()
+
+    def write(self, status: str, statements: List[str], resolver: Optional[str] = None, object_name: Optional[str] = None):
+        if not statements:
+            return
+
+        with self._lock:
+            if self.output_format == "jsonl":
+                for sql in statements:
+                    self.statement_count += 1
+                    self._file.write(
+                        json_dumps(
+                            {
+                                "seq": self.statement_count,
+                                "status": status,
+                                "resolver": resolver,
+                                "object": object_name,
+                                "sql": sql,
+                            }
+                        )
+                    )
+                    self._file.write("\n")
+            else:
+                if object_name:
+                    self._file.write(f"-- {status} [{object_name}] ({resolver})\n")
+                else:
+                    self._file.write(f"-- {status}\n")
+
+                for sql in statements:
+                    self.statement_count += 1
+                    self._file.write(f"{sql};\n\n")
+
+            # Consumers may read file while SnowDDL is still running
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
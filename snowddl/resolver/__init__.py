@@ -37,6 +37,7 @@ from .procedure import ProcedureResolver
 from .projection_policy import ProjectionPolicyResolver
 from .resource_monitor import ResourceMonitorResolver
 from .row_access_policy import RowAccessPolicyResolver
+from .scheduler import ResolverScheduler
 from .sequence import SequenceResolver
 from .share_access_role import ShareAccessRoleResolver
 from .schema import SchemaResolver
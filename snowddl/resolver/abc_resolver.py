@@ -1,12 +1,14 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from enum import Enum
 from traceback import format_exc
 
-from concurrent.futures import as_completed
-from typing import Dict, TYPE_CHECKING
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Dict, List, Optional, Set, Tuple, Type, TYPE_CHECKING
 
 from snowddl.error import SnowDDLExecuteError, SnowDDLUnsupportedError
-from snowddl.blueprint import AbstractBlueprint, DependsOnMixin, Edition, ObjectType
+from snowddl.blueprint import AbstractBlueprint, DependencyGraph, Edition, ObjectType, get_fingerprint
 
 if TYPE_CHECKING:
     from snowddl.engine import SnowDDLEngine
@@ -28,6 +30,20 @@ class AbstractResolver(ABC):
     skip_on_empty_blueprints = False
     skip_min_edition = Edition.STANDARD
 
+    # Resolvers which must be completed before this resolver starts, used to resolve independent resolvers concurrently
+    # None means dependency on all previous resolvers in sequence
+    resolve_after: Optional[List[Type["AbstractResolver"]]] = None
+
+    # Compare is skipped for objects with the same blueprint and the same existing object as in state file
+    # Existing object must include creation and last altered timestamps, so objects changed outside of SnowDDL are compared again
+    skip_unchanged_compare = False
+
+    # Validity of object depends on other objects (e.g. view), compare is skipped only if no DDL was executed yet
+    skip_unchanged_compare_without_ddl_only = False
+
+    # Fields of existing objects changed by Snowflake at runtime (e.g. warehouse state), not used to detect stale saved plan
+    runtime_fields: Tuple[str, ...] = ()
+
     def __init__(self, engine: "SnowDDLEngine"):
         self.engine = engine
         self.config = engine.config
@@ -43,49 +59,106 @@ class AbstractResolver(ABC):
         if self._is_skipped():
             return
 
-        self.blueprints = self.get_blueprints()
+        self.blueprints = self._filter_targets(self.get_blueprints())
 
-        try:
-            self.existing_objects = self.get_existing_objects()
-        except SnowDDLExecuteError as e:
-            self.engine.logger.info(
-                f"Could not get existing objects for resolver [{self.__class__.__name__}]: \n{e.verbose_message()}"
-            )
-            raise e.snow_exc
+        # DDL executed outside of tasks (e.g. in pre-process) is attributed to resolver
+        with self.engine.buffer_key_context(self._get_buffer_key(None)):
+            try:
+                with self._trace_phase("get_existing_objects"):
+                    self.existing_objects = self._filter_targets(self.get_existing_objects())
+            except SnowDDLExecuteError as e:
+                self.engine.logger.info(
+                    f"Could not get existing objects for resolver [{self.__class__.__name__}]: \n{e.verbose_message()}"
+                )
+                raise e.snow_exc
+
+            if self.engine.saved_plan:
+                self.engine.saved_plan.set_existing_objects(self.__class__.__name__, self.existing_objects, self.runtime_fields)
+
+            with self._trace_phase("pre_process"):
+                self._pre_process()
+
+            with self._trace_phase("resolve_drop"):
+                self._resolve_drop()
+
+            with self._trace_phase("resolve_create_compare"):
+                self._resolve_create_compare()
 
-        self._pre_process()
-        self._resolve_drop()
-        self._resolve_create_compare()
-        self._post_process()
+            with self._trace_phase("post_process"):
+                self._post_process()
+
+            self.engine.flush_thread_buffers()
 
     def destroy(self):
         if self._is_skipped():
             return
 
-        try:
-            self.existing_objects = self.get_existing_objects()
-        except SnowDDLExecuteError as e:
-            self.engine.logger.info(
-                f"Could not get existing objects for resolver [{self.__class__.__name__}]: \n{e.verbose_message()}"
-            )
-            raise e.snow_exc
+        with self.engine.buffer_key_context(self._get_buffer_key(None)):
+            try:
+                with self._trace_phase("get_existing_objects"):
+                    self.existing_objects = self._filter_targets(self.get_existing_objects())
+            except SnowDDLExecuteError as e:
+                self.engine.logger.info(
+                    f"Could not get existing objects for resolver [{self.__class__.__name__}]: \n{e.verbose_message()}"
+                )
+                raise e.snow_exc
+
+            with self._trace_phase("pre_process"):
+                self._pre_process()
+
+            with self._trace_phase("destroy_drop"):
+                self._destroy_drop()
+
+            with self._trace_phase("post_process"):
+                self._post_process()
+
+            self.engine.flush_thread_buffers()
+
+    def get_existing_objects_for_saved_plan(self, object_names: Set[Optional[str]]) -> Dict[str, Dict]:
+        # Used to check if saved plan is stale, without resolving objects again
+        # None in object names means statements outside of tasks, which may depend on all existing objects
+        if self._is_skipped():
+            return {}
 
-        self._pre_process()
-        self._destroy_drop()
-        self._post_process()
+        self.blueprints = self._filter_targets(self.get_blueprints())
+
+        if None in object_names:
+            self.existing_objects = self._filter_targets(self.get_existing_objects())
+        else:
+            self.existing_objects = self._filter_targets(self.get_existing_objects_by_names(object_names))
+
+        return self.existing_objects
+
+    def get_existing_objects_by_names(self, object_names: Set[str]) -> Dict[str, Dict]:
+        # Resolvers may load existing objects selectively, result may include other objects
+        return self.get_existing_objects()
 
     def _resolve_create_compare(self):
-        # Process blueprints in batches sorted in order of dependencies
-        for blueprint_names_batch in self._split_blueprints_into_batches():
-            tasks = {}
+        tasks = {}
 
-            for full_name in sorted(blueprint_names_batch):
-                if full_name in self.existing_objects:
-                    tasks[full_name] = (self.compare_object, self.blueprints[full_name], self.existing_objects[full_name])
-                else:
-                    tasks[full_name] = (self.create_object, self.blueprints[full_name])
+        for full_name in sorted(self.blueprints):
+            if full_name in self.existing_objects:
+                if self._is_unchanged_since_previous_run(full_name):
+                    self.engine.logger.debug(
+                        f"Resolved {self.object_type.name} [{full_name}]: {ResolveResult.NOCHANGE.value} (unchanged since previous run)"
+                    )
+                    self.engine.state.add_skipped()
+                    self.resolved_objects[full_name] = ResolveResult.NOCHANGE
+                    continue
+
+                tasks[full_name] = (self.compare_object, self.blueprints[full_name], self.existing_objects[full_name])
+            else:
+                tasks[full_name] = (self.create_object, self.blueprints[full_name])
+
+        dependency_graph = DependencyGraph.build_from_blueprints(self.blueprints)
+
+        for cycle in dependency_graph.cycles:
+            self.engine.logger.warning(
+                f"Detected circular dependency between {self.object_type.name} objects [{', '.join(cycle)}]"
+            )
 
-            self._process_tasks(tasks)
+        # Each blueprint is processed as soon as all its own dependencies were processed
+        self._process_tasks(tasks, dependency_graph.dependencies)
 
     def _resolve_drop(self):
         tasks = {}
@@ -116,6 +189,13 @@ class AbstractResolver(ABC):
 
         self._process_tasks(tasks)
 
+    def _filter_targets(self, objects: Dict):
+        # Objects which are not targeted are neither created, altered nor dropped
+        if self.engine.settings.target is None:
+            return objects
+
+        return {full_name: obj for full_name, obj in objects.items() if self.engine.is_target(full_name)}
+
     def _check_implicit_drop_intention(self, object_full_name: str) -> bool:
         # Dropping or replacing any parent object implicitly drops this object
         if self.engine.intention_cache.check_parent_object_drop_intention(self.object_type, object_full_name):
@@ -123,75 +203,137 @@ class AbstractResolver(ABC):
 
         return False
 
-    def _process_tasks(self, tasks):
-        futures = {}
+    def _process_tasks(self, tasks, dependencies: Optional[Dict[str, Set[str]]] = None):
+        futures: Dict[Future, str] = {}
+
+        # DDL of tasks is flushed in order of object names, as soon as all previous objects are resolved
+        # DDL executed before tasks (e.g. in pre-process) is flushed first
+        flush_order = deque(sorted(tasks))
+        completed_names: Set[str] = set()
+
+        self.engine.flush_thread_buffers()
+
+        waiting_tasks: Dict[str, Set[str]] = {}
+        dependent_tasks: Dict[str, List[str]] = defaultdict(list)
 
+        # Start tasks without dependencies, postpone other tasks until all dependencies are processed
         for full_name, args in tasks.items():
-            futures[self.engine.executor.submit(*args)] = full_name
+            unresolved_names = {d for d in (dependencies or {}).get(full_name, ()) if d in tasks and d != full_name}
 
-        for f in as_completed(futures):
-            full_name = futures[f]
+            if unresolved_names:
+                waiting_tasks[full_name] = unresolved_names
 
-            try:
-                result = f.result()
+                for dependency_name in unresolved_names:
+                    dependent_tasks[dependency_name].append(full_name)
+            else:
+                futures[self._submit_task(full_name, *args)] = full_name
 
-                if result in (ResolveResult.REPLACE, ResolveResult.DROP):
-                    self.engine.intention_cache.add_object_drop_intention(self.object_type, full_name)
+        while futures or waiting_tasks:
+            # Dependencies cannot be satisfied due to cycle, start all remaining tasks
+            if not futures:
+                for full_name in sorted(waiting_tasks):
+                    futures[self._submit_task(full_name, *tasks[full_name])] = full_name
 
-                if result == ResolveResult.NOCHANGE:
-                    self.engine.logger.debug(f"Resolved {self.object_type.name} [{full_name}]: {result.value}")
-                else:
-                    self.engine.logger.info(f"Resolved {self.object_type.name} [{full_name}]: {result.value}")
-            except Exception as e:
-                if isinstance(e, SnowDDLUnsupportedError):
-                    result = ResolveResult.UNSUPPORTED
-                else:
-                    result = ResolveResult.ERROR
+                waiting_tasks.clear()
 
-                if isinstance(e, SnowDDLExecuteError):
-                    error_text = e.verbose_message()
-                else:
-                    error_text = format_exc()
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
 
-                self.engine.logger.warning(f"Resolved {self.object_type.name} [{full_name}]: {result.value}\n{error_text}")
-                self.errors[full_name] = e
+            for f in done:
+                full_name = futures.pop(f)
+                self._process_task_result(full_name, f)
 
-            self.resolved_objects[full_name] = result
+                self.engine.flush_planned_buffer(self._get_buffer_key(full_name))
+                completed_names.add(full_name)
 
-        self.engine.flush_thread_buffers()
+                while flush_order and flush_order[0] in completed_names:
+                    self.engine.flush_task_buffer(self._get_buffer_key(flush_order.popleft()))
+
+                # Start dependent tasks which have no other unresolved dependencies
+                for dependent_name in dependent_tasks.pop(full_name, []):
+                    if dependent_name not in waiting_tasks:
+                        continue
+
+                    waiting_tasks[dependent_name].discard(full_name)
 
-    def _split_blueprints_into_batches(self):
-        all_batches = []
-        allocated_full_names = set()
+                    if not waiting_tasks[dependent_name]:
+                        del waiting_tasks[dependent_name]
+                        futures[self._submit_task(dependent_name, *tasks[dependent_name])] = dependent_name
 
-        remaining_blueprints = self.blueprints.copy()
+        self.engine.flush_thread_buffers()
 
-        # Create new batches as long as at least one unallocated blueprint remains
-        while remaining_blueprints:
-            batch = []
+    def _submit_task(self, full_name: str, fn, *args) -> Future:
+        fn = self.engine.query_metrics.wrap(fn, resolver=self.__class__.__name__, object=full_name)
 
-            # Allocate blueprints with no dependencies or fully resolved dependencies
-            for full_name, bp in remaining_blueprints.items():
-                if (
-                    not isinstance(bp, DependsOnMixin)
-                    or not bp.depends_on
-                    or all((str(d) in allocated_full_names) for d in bp.depends_on)
-                ):
-                    batch.append(full_name)
+        if self.engine.tracer:
+            fn = self.engine.tracer.wrap(fn, fn.__name__, "task", resolver=self.__class__.__name__, object=full_name)
 
-            # Allocate blueprints with unresolved dependencies to the last batch
-            if len(batch) == 0:
-                for full_name in remaining_blueprints:
-                    batch.append(full_name)
+        return self.engine.submit_task(fn, *args, buffer_key=self._get_buffer_key(full_name))
 
-            # Forget blueprints allocated during this iteration
-            for full_name in batch:
-                del remaining_blueprints[full_name]
+    def _get_buffer_key(self, full_name: Optional[str]):
+        return self.__class__.__name__, full_name
 
-            all_batches.append(batch)
-            allocated_full_names.update(batch)
+    @contextmanager
+    def _trace_phase(self, name: str):
+        with self.engine.query_metrics.labels(resolver=self.__class__.__name__):
+            with self.engine.trace_span(name, "resolver", resolver=self.__class__.__name__):
+                yield
 
-        return all_batches
+    def _process_task_result(self, full_name: str, f: Future):
+        try:
+            result = f.result()
+
+            if result in (ResolveResult.REPLACE, ResolveResult.DROP):
+                self.engine.intention_cache.add_object_drop_intention(self.object_type, full_name)
+
+            if result == ResolveResult.NOCHANGE:
+                self.engine.logger.debug(f"Resolved {self.object_type.name} [{full_name}]: {result.value}")
+            else:
+                self.engine.logger.info(f"Resolved {self.object_type.name} [{full_name}]: {result.value}")
+        except Exception as e:
+            if isinstance(e, SnowDDLUnsupportedError):
+                result = ResolveResult.UNSUPPORTED
+            else:
+                result = ResolveResult.ERROR
+
+            if isinstance(e, SnowDDLExecuteError):
+                error_text = e.verbose_message()
+            else:
+                error_text = format_exc()
+
+            self.engine.logger.warning(f"Resolved {self.object_type.name} [{full_name}]: {result.value}\n{error_text}")
+            self.errors[full_name] = e
+
+        self.resolved_objects[full_name] = result
+        self._update_state(full_name, result)
+
+    def _is_unchanged_since_previous_run(self, full_name: str):
+        if not self.engine.state or not self.skip_unchanged_compare:
+            return False
+
+        if self.skip_unchanged_compare_without_ddl_only and self.engine.has_executed_ddl():
+            return False
+
+        return self.engine.state.is_unchanged(
+            self.object_type,
+            full_name,
+            self.blueprints[full_name].get_fingerprint(),
+            get_fingerprint(self.existing_objects[full_name]),
+        )
+
+    def _update_state(self, full_name: str, result: ResolveResult):
+        if not self.engine.state or not self.skip_unchanged_compare:
+            return
+
+        # Only objects which were compared and matched blueprint exactly are saved in state
+        if result == ResolveResult.NOCHANGE and full_name in self.blueprints and full_name in self.existing_objects:
+            self.engine.state.set_unchanged(
+                self.object_type,
+                full_name,
+                self.blueprints[full_name].get_fingerprint(),
+                get_fingerprint(self.existing_objects[full_name]),
+            )
+        else:
+            self.engine.state.remove(self.object_type, full_name)
 
     def _is_skipped(self):
         if self.engine.context.edition < self.skip_min_edition:
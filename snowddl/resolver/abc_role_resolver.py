@@ -1,7 +1,9 @@
 from abc import abstractmethod
-from typing import List, Optional, Tuple, Union
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple, Union, TYPE_CHECKING
 
 from snowddl.blueprint import (
+    AbstractIdent,
     AccountGrant,
     AccountObjectIdent,
     ApplicationRoleIdent,
@@ -14,14 +16,52 @@ from snowddl.blueprint import (
     RoleBlueprint,
     SchemaBlueprint,
     SchemaIdent,
+    SchemaObjectIdent,
     build_role_ident,
     build_grant_name_ident,
     build_future_grant_name_ident,
 )
+from snowddl.error import SnowDDLExecuteError
 from snowddl.resolver.abc_resolver import AbstractResolver, ResolveResult, ObjectType
 
+if TYPE_CHECKING:
+    from snowddl.engine import SnowDDLEngine
+
 
 class AbstractRoleResolver(AbstractResolver):
+    # Queries used by get_existing_role_grants(), loaded in bulk for all existing roles
+    prefetch_grants_sql = (
+        "SHOW GRANTS TO ROLE {role_name:i}",
+        "SHOW FUTURE GRANTS TO ROLE {role_name:i}",
+    )
+
+    # Object types which can be granted using GRANT ... ON ALL ... IN SCHEMA
+    # Objects are listed by SHOW ... IN SCHEMA with the same object type, which is never narrower than ON ALL
+    bulk_grant_object_types = (
+        ObjectType.DYNAMIC_TABLE,
+        ObjectType.FILE_FORMAT,
+        ObjectType.SEQUENCE,
+        ObjectType.STAGE,
+        ObjectType.STREAM,
+        ObjectType.TABLE,
+        ObjectType.VIEW,
+    )
+
+    # Minimum number of grants on objects of the same type in schema to check if GRANT ... ON ALL can be used instead
+    bulk_grant_min_objects = 10
+
+    # Flags in output of SHOW ... IN SCHEMA for objects of other types, e.g. dynamic tables are listed by SHOW TABLES
+    bulk_grant_other_type_flags = ("is_dynamic", "is_event", "is_external", "is_hybrid", "is_iceberg", "is_materialized")
+
+    # Maximum number of rows returned by SHOW ... IN SCHEMA and SHOW ... IN DATABASE, result is truncated if limit was reached
+    bulk_grant_show_limit = 10000
+
+    def __init__(self, engine: "SnowDDLEngine"):
+        super().__init__(engine)
+
+        # Existing objects in schemas and databases used to refresh future grants, role resolvers do not change objects
+        self.future_grant_object_names: Dict[Tuple, Optional[Set[AbstractIdent]]] = {}
+
     @abstractmethod
     def get_role_suffix(self) -> str:
         pass
@@ -42,28 +82,32 @@ class AbstractRoleResolver(AbstractResolver):
         return ObjectType.ROLE
 
     def get_existing_objects(self):
-        existing_roles = {}
+        return self._get_existing_roles()
 
-        cur = self.engine.execute_meta(
-            "SHOW ROLES LIKE {pattern:lse}",
-            {
-                "pattern": self.get_role_pattern(),
-            },
-        )
+    def get_existing_objects_by_names(self, object_names: Set[str]):
+        # Only grants of requested roles are loaded
+        return self._get_existing_roles(object_names)
+
+    def _get_existing_roles(self, role_names: Optional[Set[str]] = None):
+        existing_roles = {}
 
-        for r in cur:
+        for r in self.engine.grant_cache.get_roles(self.get_role_pattern()):
             if r["owner"] != self.engine.context.current_role:
                 continue
 
+            if role_names is not None and r["name"] not in role_names:
+                continue
+
             existing_roles[r["name"]] = {
                 "role_name": r["name"],
                 "comment": r["comment"] if r["comment"] else None,
             }
 
+        if self.prefetch_grants_sql:
+            self.engine.grant_cache.prefetch_grants(self.prefetch_grants_sql, list(existing_roles))
+
         # Retrieve role grants in parallel
-        for role_name, grants, account_grants, future_grants in self.engine.executor.map(
-            self.get_existing_role_grants, existing_roles
-        ):
+        for role_name, grants, account_grants, future_grants in self.engine.map(self.get_existing_role_grants, existing_roles):
             existing_roles[role_name]["grants"] = grants
             existing_roles[role_name]["account_grants"] = account_grants
             existing_roles[role_name]["future_grants"] = future_grants
@@ -76,12 +120,7 @@ class AbstractRoleResolver(AbstractResolver):
         future_grants = []
 
         # Normal and account grants
-        cur = self.engine.execute_meta(
-            "SHOW GRANTS TO ROLE {role_name:i}",
-            {
-                "role_name": role_name,
-            },
-        )
+        cur = self.engine.grant_cache.show_grants("SHOW GRANTS TO ROLE {role_name:i}", role_name)
 
         for r in sorted(cur, key=self.sort_existing_grants):
             # Skip grants on unknown object types
@@ -112,12 +151,7 @@ class AbstractRoleResolver(AbstractResolver):
                 )
 
         # Future grants
-        cur = self.engine.execute_meta(
-            "SHOW FUTURE GRANTS TO ROLE {role_name:i}",
-            {
-                "role_name": role_name,
-            },
-        )
+        cur = self.engine.grant_cache.show_grants("SHOW FUTURE GRANTS TO ROLE {role_name:i}", role_name)
 
         for r in sorted(cur, key=self.sort_existing_grants):
             try:
@@ -180,8 +214,7 @@ class AbstractRoleResolver(AbstractResolver):
             },
         )
 
-        for bp_grant in bp.grants:
-            self.create_grant(bp.full_name, bp_grant)
+        self.create_grants(bp.full_name, bp.grants, bp.grants)
 
         for bp_account_grant in bp.account_grants:
             self.create_account_grant(bp.full_name, bp_account_grant)
@@ -206,42 +239,59 @@ class AbstractRoleResolver(AbstractResolver):
 
             result = ResolveResult.ALTER
 
+        # Roles may have tens of thousands of grants, so grants are compared using sets
+        # Lists are still iterated to keep order of statements (e.g. WRITE is revoked before READ)
+        bp_grants = set(bp.grants)
+        bp_account_grants = set(bp.account_grants)
+        bp_future_grants = set(bp.future_grants)
+        bp_future_grant_keys = {fg.get_key() for fg in bp.future_grants}
+
+        existing_grants = set(row["grants"])
+        existing_account_grants = set(row["account_grants"])
+        existing_future_grants = set(row["future_grants"])
+
         # Normal grants
-        for existing_grant in row["grants"]:
-            if existing_grant not in bp.grants and not any(fg.is_matching_grant(existing_grant) for fg in bp.future_grants):
-                self.drop_grant(bp.full_name, existing_grant)
-                result = ResolveResult.GRANT
+        drop_grants = [
+            existing_grant
+            for existing_grant in row["grants"]
+            if existing_grant not in bp_grants and bp_future_grant_keys.isdisjoint(existing_grant.get_future_grant_keys())
+        ]
 
-        for bp_grant in bp.grants:
-            if bp_grant not in row["grants"]:
-                self.create_grant(bp.full_name, bp_grant)
-                result = ResolveResult.GRANT
+        if drop_grants:
+            self.drop_grants(bp.full_name, drop_grants)
+            result = ResolveResult.GRANT
+
+        create_grants = [bp_grant for bp_grant in bp.grants if bp_grant not in existing_grants]
+
+        if create_grants:
+            self.create_grants(bp.full_name, create_grants, bp.grants)
+            result = ResolveResult.GRANT
 
         # Account grants
         for existing_account_grant in row["account_grants"]:
-            if existing_account_grant not in bp.account_grants:
+            if existing_account_grant not in bp_account_grants:
                 self.drop_account_grant(bp.full_name, existing_account_grant)
                 result = ResolveResult.GRANT
 
         for bp_account_grant in bp.account_grants:
-            if bp_account_grant not in row["account_grants"]:
+            if bp_account_grant not in existing_account_grants:
                 self.create_account_grant(bp.full_name, bp_account_grant)
                 result = ResolveResult.GRANT
 
         # Future grants
         for existing_future_grant in row["future_grants"]:
-            if existing_future_grant not in bp.future_grants:
+            if existing_future_grant not in bp_future_grants:
                 self.drop_future_grant(bp.full_name, existing_future_grant)
                 result = ResolveResult.GRANT
 
         for bp_future_grant in bp.future_grants:
-            if bp_future_grant not in row["future_grants"]:
+            if bp_future_grant not in existing_future_grants:
                 self.create_future_grant(bp.full_name, bp_future_grant)
                 self.apply_future_grant_to_existing_objects(bp.full_name, bp_future_grant)
                 result = ResolveResult.GRANT
             elif self.engine.settings.refresh_future_grants:
-                self.apply_future_grant_to_existing_objects(bp.full_name, bp_future_grant)
-                result = ResolveResult.GRANT
+                if self.refresh_future_grant_on_existing_objects(bp.full_name, bp_future_grant, existing_grants):
+                    result = ResolveResult.GRANT
 
         return result
 
@@ -316,6 +366,146 @@ class AbstractRoleResolver(AbstractResolver):
                 },
             )
 
+    def create_grants(self, role_name, grants: List[Grant], bp_grants: List[Grant]):
+        # Privileges on all objects of the same type in schema are granted by one GRANT ... ON ALL statement
+        # Remaining privileges on the same object are granted by one GRANT statement
+        grants = self.create_bulk_grants(role_name, grants, bp_grants)
+
+        for privileges, grant in self.coalesce_grant_privileges(grants):
+            if len(privileges) == 1:
+                self.create_grant(role_name, grant)
+                continue
+
+            self.engine.execute_safe_ddl(
+                "GRANT {privileges:r} ON {on:r} {name:i} TO ROLE {role_name:i}",
+                {
+                    "privileges": privileges,
+                    "on": grant.on.singular_for_grant,
+                    "name": grant.name,
+                    "role_name": role_name,
+                },
+            )
+
+    def drop_grants(self, role_name, grants: List[Grant]):
+        for privileges, grant in self.coalesce_grant_privileges(grants):
+            if len(privileges) == 1:
+                self.drop_grant(role_name, grant)
+                continue
+
+            self.engine.execute_safe_ddl(
+                "REVOKE {privileges:r} ON {on:r} {name:i} FROM ROLE {role_name:i}",
+                {
+                    "privileges": privileges,
+                    "on": grant.on.singular_for_grant,
+                    "name": grant.name,
+                    "role_name": role_name,
+                },
+            )
+
+    def coalesce_grant_privileges(self, grants: List[Grant]) -> List[Tuple[List[str], Grant]]:
+        coalesced: Dict[tuple, Tuple[List[str], Grant]] = {}
+
+        for grant in grants:
+            # OWNERSHIP and roles have special syntax, these grants are never coalesced
+            if grant.privilege == "OWNERSHIP" or grant.on in (
+                ObjectType.ROLE,
+                ObjectType.APPLICATION_ROLE,
+                ObjectType.DATABASE_ROLE,
+            ):
+                coalesced[(grant.on.singular_for_grant, grant.name, grant.privilege)] = ([grant.privilege], grant)
+            elif (grant.on.singular_for_grant, grant.name, None) in coalesced:
+                coalesced[(grant.on.singular_for_grant, grant.name, None)][0].append(grant.privilege)
+            else:
+                coalesced[(grant.on.singular_for_grant, grant.name, None)] = ([grant.privilege], grant)
+
+        return list(coalesced.values())
+
+    def create_bulk_grants(self, role_name, grants: List[Grant], bp_grants: List[Grant]) -> List[Grant]:
+        # Returns grants which were not granted in bulk
+        grant_names_by_schema = defaultdict(lambda: defaultdict(set))
+
+        for grant in grants:
+            if self.is_bulk_grant_supported(grant):
+                grant_names_by_schema[(grant.on, grant.name.schema_full_name)][grant.privilege].add(grant.name.name)
+
+        bp_grant_names_by_schema = None
+        bulk_grant_keys = set()
+
+        for (object_type, schema_name), privilege_names in grant_names_by_schema.items():
+            privilege_names = {p: names for p, names in privilege_names.items() if len(names) >= self.bulk_grant_min_objects}
+
+            if not privilege_names:
+                continue
+
+            existing_names = self.get_existing_object_names_in_schema(object_type, schema_name)
+
+            if not existing_names:
+                continue
+
+            if bp_grant_names_by_schema is None:
+                bp_grant_names_by_schema = defaultdict(lambda: defaultdict(set))
+
+                for bp_grant in bp_grants:
+                    if self.is_bulk_grant_supported(bp_grant):
+                        bp_grant_names_by_schema[(bp_grant.on, bp_grant.name.schema_full_name)][bp_grant.privilege].add(
+                            bp_grant.name.name
+                        )
+
+            # Privilege in blueprint must cover all existing objects of this type in schema and nothing else
+            bp_privilege_names = bp_grant_names_by_schema[(object_type, schema_name)]
+            privileges = [p for p in privilege_names if bp_privilege_names[p] == existing_names]
+
+            if not privileges:
+                continue
+
+            self.engine.execute_safe_ddl(
+                "GRANT {privileges:r} ON ALL {on_plural:r} IN SCHEMA {schema_name:i} TO ROLE {role_name:i}",
+                {
+                    "privileges": privileges,
+                    "on_plural": object_type.plural,
+                    "schema_name": schema_name,
+                    "role_name": role_name,
+                },
+            )
+
+            for privilege in privileges:
+                bulk_grant_keys.add((object_type, schema_name, privilege))
+
+        return [
+            grant
+            for grant in grants
+            if not self.is_bulk_grant_supported(grant)
+            or (grant.on, grant.name.schema_full_name, grant.privilege) not in bulk_grant_keys
+        ]
+
+    def is_bulk_grant_supported(self, grant: Grant):
+        return (
+            grant.privilege != "OWNERSHIP"
+            and grant.on in self.bulk_grant_object_types
+            and isinstance(grant.name, SchemaObjectIdent)
+        )
+
+    def get_existing_object_names_in_schema(self, object_type: ObjectType, schema_name: SchemaIdent):
+        try:
+            cur = self.engine.execute_meta(
+                "SHOW {on_plural:r} IN SCHEMA {schema_name:i}",
+                {
+                    "on_plural": object_type.plural,
+                    "schema_name": schema_name,
+                },
+            )
+        except SnowDDLExecuteError:
+            # Schema does not exist yet, e.g. in plan mode
+            return set()
+
+        rows = list(cur)
+
+        # Truncated list cannot be compared with blueprints, grants are created one by one
+        if len(rows) >= self.bulk_grant_show_limit:
+            return set()
+
+        return {r["name"] for r in rows}
+
     def create_account_grant(self, role_name, account_grant: AccountGrant):
         self.engine.execute_safe_ddl(
             "GRANT {privilege:r} ON ACCOUNT TO ROLE {role_name:i}",
@@ -375,6 +565,91 @@ class AbstractRoleResolver(AbstractResolver):
             },
         )
 
+    def refresh_future_grant_on_existing_objects(self, role_name, grant: FutureGrant, existing_grants: Set[Grant]):
+        # Grants privilege only on existing objects which do not have it yet, returns True if anything was granted
+        if grant.on_future == ObjectType.PIPE:
+            return False
+
+        object_names = self.get_future_grant_object_names(grant)
+
+        # Objects cannot be listed reliably, fall back to GRANT ... ON ALL
+        if object_names is None:
+            self.apply_future_grant_to_existing_objects(role_name, grant)
+            return True
+
+        missing_names = sorted(
+            (
+                name
+                for name in object_names
+                if Grant(privilege=grant.privilege, on=grant.on_future, name=name) not in existing_grants
+            ),
+            key=str,
+        )
+
+        if not missing_names:
+            return False
+
+        # OWNERSHIP must be transferred with COPY CURRENT GRANTS, which is handled by GRANT ... ON ALL
+        if grant.privilege == "OWNERSHIP" or len(missing_names) >= self.bulk_grant_min_objects:
+            self.apply_future_grant_to_existing_objects(role_name, grant)
+            return True
+
+        for name in missing_names:
+            self.create_grant(role_name, Grant(privilege=grant.privilege, on=grant.on_future, name=name))
+
+        return True
+
+    def get_future_grant_object_names(self, grant: FutureGrant) -> Optional[Set[AbstractIdent]]:
+        if grant.on_future not in self.bulk_grant_object_types:
+            return None
+
+        cache_key = (grant.on_future, grant.in_parent, grant.name)
+
+        if cache_key not in self.future_grant_object_names:
+            self.future_grant_object_names[cache_key] = self.get_existing_object_names_in_parent(grant)
+
+        return self.future_grant_object_names[cache_key]
+
+    def get_existing_object_names_in_parent(self, grant: FutureGrant) -> Optional[Set[AbstractIdent]]:
+        object_names = set()
+
+        try:
+            cur = self.engine.execute_meta(
+                "SHOW {on_future_plural:r} IN {in_parent_singular:r} {name:i}",
+                {
+                    "on_future_plural": grant.on_future.plural,
+                    "in_parent_singular": grant.in_parent.singular,
+                    "name": grant.name,
+                },
+            )
+        except SnowDDLExecuteError:
+            return None
+
+        rows = list(cur)
+
+        # Objects missing from truncated list would never receive privilege
+        if len(rows) >= self.bulk_grant_show_limit:
+            return None
+
+        for r in rows:
+            if r["schema_name"] == "INFORMATION_SCHEMA":
+                continue
+
+            if any(str(r.get(flag, "")).upper() in ("Y", "TRUE") for flag in self.bulk_grant_other_type_flags):
+                continue
+
+            try:
+                object_names.add(
+                    build_grant_name_ident(
+                        self.config.env_prefix, f"{r['database_name']}.{r['schema_name']}.{r['name']}", grant.on_future
+                    )
+                )
+            except (KeyError, ValueError):
+                # Object name cannot be used as identifier
+                return None
+
+        return object_names
+
     def build_database_role_grants(self, database_name_pattern: IdentPattern, role_type: str) -> List[Grant]:
         grants = []
 
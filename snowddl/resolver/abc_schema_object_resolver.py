@@ -1,25 +1,242 @@
 from abc import abstractmethod
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, TYPE_CHECKING
 
 from snowddl.blueprint import SchemaBlueprint
+from snowddl.error import SnowDDLExecuteError
 from snowddl.resolver.abc_resolver import AbstractResolver, ResolveResult, ObjectType
 
+if TYPE_CHECKING:
+    from snowddl.engine import SnowDDLEngine
+
 
 class AbstractSchemaObjectResolver(AbstractResolver):
+    # Object type name for SHOW command (e.g. "TABLES"), enables bulk SHOW ... IN DATABASE and SHOW ... IN ACCOUNT
+    # Can be set only for object types returning "database_name" and "schema_name" columns
+    bulk_show_object_type: Optional[str] = None
+
+    # SHOW command for this object type accepts LIMIT clause
+    bulk_show_supports_limit = True
+
+    # Maximum number of rows returned by bulk SHOW, result is considered truncated if limit was reached
+    # SHOW commands without LIMIT clause return the same maximum number of rows
+    bulk_show_limit = 10000
+
+    # Bulk SHOW is only used for databases with at least this number of schemas
+    bulk_show_min_schemas = 2
+
+    # Bulk SHOW ... IN ACCOUNT is only used when at least this number of databases requires bulk SHOW
+    bulk_show_min_databases = 3
+
+    # Bulk SHOW ... IN ACCOUNT is not used for accounts with more schemas, since result is likely to be truncated
+    bulk_show_account_max_schemas = 100
+
+    # INFORMATION_SCHEMA view with LAST_ALTERED column for this object type (e.g. "TABLES") and prefix of its name columns
+    # SHOW commands do not return last altered timestamp, but it is required to skip compare of unchanged objects
+    last_altered_view: Optional[str] = None
+    last_altered_column_prefix = "TABLE"
+
+    # Last altered timestamp is also changed by DML
+    runtime_fields = ("last_altered",)
+
+    def __init__(self, engine: "SnowDDLEngine"):
+        super().__init__(engine)
+
+        self.prefetched_rows: Dict[str, List[Dict]] = {}
+
     def get_existing_objects(self):
+        if self.bulk_show_object_type:
+            self.prefetched_rows = self._prefetch_rows()
+
+        return self._get_existing_objects_in_schemas(list(self.engine.schema_cache.schemas.values()))
+
+    def get_existing_objects_by_names(self, object_names: Set[str]):
+        # Only schemas of requested objects are loaded
+        schema_full_names = {".".join(object_full_name.split(".")[:2]) for object_full_name in object_names}
+        schemas = self.engine.schema_cache.schemas
+
+        return self._get_existing_objects_in_schemas([schemas[name] for name in sorted(schema_full_names) if name in schemas])
+
+    def _get_existing_objects_in_schemas(self, schemas: List[Dict]):
         existing_objects = {}
 
         # Process schemas in parallel
-        for schema_objects in self.engine.executor.map(
-            self.get_existing_objects_in_schema, self.engine.schema_cache.schemas.values()
-        ):
+        for schema_objects in self.engine.map(self.get_existing_objects_in_schema, schemas):
             existing_objects.update(schema_objects)
 
+        if self.engine.state and self.skip_unchanged_compare and self.last_altered_view:
+            self._load_last_altered(existing_objects)
+
         return existing_objects
 
     @abstractmethod
     def get_existing_objects_in_schema(self, schema: dict):
         pass
 
+    def show_objects_in_schema(self, schema: dict):
+        schema_full_name = f"{schema['database']}.{schema['schema']}"
+
+        if schema_full_name in self.prefetched_rows:
+            return self.prefetched_rows[schema_full_name]
+
+        return self.engine.execute_meta(
+            "SHOW {object_type:r} IN SCHEMA {database:i}.{schema:i}",
+            {
+                "object_type": self.bulk_show_object_type,
+                "database": schema["database"],
+                "schema": schema["schema"],
+            },
+        )
+
+    def _prefetch_rows(self):
+        schemas_by_database = defaultdict(list)
+        expected_rows_by_database = defaultdict(int)
+
+        for schema_full_name, schema in self.engine.schema_cache.schemas.items():
+            schemas_by_database[schema["database"]].append(schema_full_name)
+
+        for bp in self.blueprints.values():
+            expected_rows_by_database[str(bp.full_name.database_full_name)] += 1
+
+        bulk_databases = [
+            database
+            for database, schema_full_names in schemas_by_database.items()
+            if self._is_bulk_show_efficient(len(schema_full_names), expected_rows_by_database[database])
+        ]
+
+        if not bulk_databases:
+            return {}
+
+        # Single SHOW ... IN ACCOUNT replaces multiple SHOW ... IN DATABASE
+        # Objects of all databases in account are counted, including databases without blueprints
+        if (
+            len(bulk_databases) >= self.bulk_show_min_databases
+            and len(self.engine.schema_cache.schemas) <= self.bulk_show_account_max_schemas
+            and self._is_bulk_show_efficient(
+                self.bulk_show_min_schemas, sum(expected_rows_by_database[database] for database in bulk_databases)
+            )
+        ):
+            account_rows = self._show_objects_bulk()
+
+            if account_rows is not None:
+                self.engine.logger.debug(
+                    f"Prefetched {self.bulk_show_object_type} for [{len(bulk_databases)}] databases in account"
+                )
+                return self._partition_rows_by_schema(account_rows, bulk_databases, schemas_by_database)
+
+        prefetched_rows = {}
+
+        # SHOW ... IN DATABASE for each database in parallel, truncated results fall back to SHOW ... IN SCHEMA
+        for database, database_rows in zip(bulk_databases, self.engine.map(self._show_objects_bulk, bulk_databases)):
+            if database_rows is not None:
+                self.engine.logger.debug(f"Prefetched {self.bulk_show_object_type} for database [{database}]")
+                prefetched_rows.update(self._partition_rows_by_schema(database_rows, [database], schemas_by_database))
+
+        return prefetched_rows
+
+    def _is_bulk_show_efficient(self, schema_count: int, expected_row_count: int):
+        # Bulk SHOW does not save any round-trips for a single schema
+        if schema_count < self.bulk_show_min_schemas:
+            return False
+
+        # Result should fit into a single page with enough headroom for objects without blueprints,
+        # otherwise bulk SHOW is likely to be truncated and wasted
+        return expected_row_count * 2 <= self.bulk_show_limit
+
+    def _show_objects_bulk(self, database: Optional[str] = None):
+        query = self.engine.query_builder()
+
+        if database:
+            query.append(
+                "SHOW {object_type:r} IN DATABASE {database:i}",
+                {
+                    "object_type": self.bulk_show_object_type,
+                    "database": database,
+                },
+            )
+        else:
+            query.append(
+                "SHOW {object_type:r} IN ACCOUNT",
+                {
+                    "object_type": self.bulk_show_object_type,
+                },
+            )
+
+        if self.bulk_show_supports_limit:
+            query.append(
+                "LIMIT {limit:d}",
+                {
+                    "limit": self.bulk_show_limit,
+                },
+            )
+
+        cur = self.engine.execute_meta(query)
+
+        rows = list(cur)
+
+        # Result was truncated, it cannot be used
+        if len(rows) >= self.bulk_show_limit:
+            return None
+
+        return rows
+
+    def _load_last_altered(self, existing_objects: Dict[str, Dict]):
+        databases = sorted({row["database"] for row in existing_objects.values()})
+
+        # Overloaded functions and procedures share the latest timestamp of all objects with the same name
+        last_altered = {}
+
+        for database_last_altered in self.engine.map(self._show_last_altered_in_database, databases):
+            last_altered.update(database_last_altered)
+
+        for row in existing_objects.values():
+            row["last_altered"] = last_altered.get(f"{row['database']}.{row['schema']}.{row['name']}")
+
+    def _show_last_altered_in_database(self, database: str):
+        try:
+            cur = self.engine.execute_meta(
+                "SELECT {schema_column:i} AS schema_name, {name_column:i} AS name, MAX(last_altered) AS last_altered "
+                "FROM {database:i}.information_schema.{view:i} "
+                "WHERE {schema_column:i} != 'INFORMATION_SCHEMA' "
+                "GROUP BY 1, 2",
+                {
+                    "schema_column": f"{self.last_altered_column_prefix}_SCHEMA",
+                    "name_column": f"{self.last_altered_column_prefix}_NAME",
+                    "database": database,
+                    "view": self.last_altered_view,
+                },
+            )
+        except SnowDDLExecuteError as e:
+            # Objects without last altered timestamp are always compared
+            self.engine.logger.debug(f"Could not load last altered timestamps for database [{database}]: {e.verbose_message()}")
+            return {}
+
+        return {f"{database}.{r['SCHEMA_NAME']}.{r['NAME']}": r["LAST_ALTERED"] for r in cur}
+
+    def _is_unchanged_since_previous_run(self, full_name: str):
+        # Existing object without last altered timestamp might have been changed since previous run
+        if self.existing_objects[full_name].get("last_altered") is None:
+            return False
+
+        return super()._is_unchanged_since_previous_run(full_name)
+
+    def _partition_rows_by_schema(self, rows: List[Dict], databases: List[str], schemas_by_database: Dict[str, List[str]]):
+        partitioned_rows = {}
+
+        # Schemas without objects must be present in result, so SHOW ... IN SCHEMA is not executed for them
+        for database in databases:
+            for schema_full_name in schemas_by_database[database]:
+                partitioned_rows[schema_full_name] = []
+
+        # Rows for unknown schemas (e.g. INFORMATION_SCHEMA, other databases) are skipped
+        for r in rows:
+            schema_full_name = f"{r['database_name']}.{r['schema_name']}"
+
+            if schema_full_name in partitioned_rows:
+                partitioned_rows[schema_full_name].append(r)
+
+        return partitioned_rows
+
     def _resolve_drop(self):
         tasks = {}
 
@@ -2,11 +2,13 @@ from json import loads
 
 from snowddl.blueprint import AggregationPolicyBlueprint, ObjectType, Edition, SchemaObjectIdent
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult
+from snowddl.resolver.user import UserResolver
 
 
 class AggregationPolicyResolver(AbstractSchemaObjectResolver):
     skip_on_empty_blueprints = True
     skip_min_edition = Edition.ENTERPRISE
+    resolve_after = [UserResolver]
 
     def get_object_type(self) -> ObjectType:
         return ObjectType.AGGREGATION_POLICY
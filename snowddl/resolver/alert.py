@@ -3,7 +3,9 @@ from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectReso
 
 
 class AlertResolver(AbstractSchemaObjectResolver):
+    bulk_show_object_type = "ALERTS"
     skip_on_empty_blueprints = True
+    runtime_fields = ("last_altered", "state")
 
     def get_object_type(self) -> ObjectType:
         return ObjectType.ALERT
@@ -11,13 +13,7 @@ class AlertResolver(AbstractSchemaObjectResolver):
     def get_existing_objects_in_schema(self, schema: dict):
         existing_objects = {}
 
-        cur = self.engine.execute_meta(
-            "SHOW ALERTS IN SCHEMA {database:i}.{schema:i}",
-            {
-                "database": schema["database"],
-                "schema": schema["schema"],
-            },
-        )
+        cur = self.show_objects_in_schema(schema)
 
         for r in cur:
             existing_objects[f"{r['database_name']}.{r['schema_name']}.{r['name']}"] = {
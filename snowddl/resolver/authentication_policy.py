@@ -1,9 +1,11 @@
 from snowddl.blueprint import AuthenticationPolicyBlueprint, ObjectType, SchemaObjectIdent
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult
+from snowddl.resolver.user import UserResolver
 
 
 class AuthenticationPolicyResolver(AbstractSchemaObjectResolver):
     skip_on_empty_blueprints = True
+    resolve_after = [UserResolver]
 
     def get_object_type(self) -> ObjectType:
         return ObjectType.AUTHENTICATION_POLICY
@@ -1,9 +1,11 @@
 from snowddl.blueprint import BackupPolicyBlueprint
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult, ObjectType
+from snowddl.resolver.user import UserResolver
 
 
 class BackupPolicyResolver(AbstractSchemaObjectResolver):
     skip_on_empty_blueprints = True
+    resolve_after = [UserResolver]
 
     def get_object_type(self) -> ObjectType:
         return ObjectType.BACKUP_POLICY
@@ -1,9 +1,11 @@
 from snowddl.blueprint import BackupSetBlueprint
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult, ObjectType
+from snowddl.resolver.backup_policy import BackupPolicyResolver
 
 
 class BackupSetResolver(AbstractSchemaObjectResolver):
     skip_on_empty_blueprints = True
+    resolve_after = [BackupPolicyResolver]
 
     def get_object_type(self) -> ObjectType:
         return ObjectType.BACKUP_SET
@@ -1,8 +1,11 @@
 from snowddl.blueprint import TableBlueprint, SchemaObjectIdent
 from snowddl.resolver.abc_schema_object_resolver import AbstractResolver, ResolveResult, ObjectType
+from snowddl.resolver.schema_owner_role import SchemaOwnerRoleResolver
 
 
 class CloneTableResolver(AbstractResolver):
+    resolve_after = [SchemaOwnerRoleResolver]
+
     def get_object_type(self) -> ObjectType:
         return ObjectType.CLONE_TABLE
 
@@ -15,11 +18,11 @@ class CloneTableResolver(AbstractResolver):
         tables_for_clone = {}
 
         # Get schemas for clone in parallel
-        for schema_objects in self.engine.executor.map(self.get_schemas_for_clone, databases_for_clone.values()):
+        for schema_objects in self.engine.map(self.get_schemas_for_clone, databases_for_clone.values()):
             schemas_for_clone.update(schema_objects)
 
         # Get tables for clone in parallel
-        for table_objects in self.engine.executor.map(self.get_tables_for_clone, schemas_for_clone.values()):
+        for table_objects in self.engine.map(self.get_tables_for_clone, schemas_for_clone.values()):
             tables_for_clone.update(table_objects)
 
         return tables_for_clone
@@ -1,8 +1,11 @@
 from snowddl.blueprint import DatabaseBlueprint
 from snowddl.resolver.abc_resolver import AbstractResolver, ResolveResult, ObjectType, SnowDDLUnsupportedError
+from snowddl.resolver.account_params import AccountParameterResolver
 
 
 class DatabaseResolver(AbstractResolver):
+    resolve_after = [AccountParameterResolver]
+
     def get_object_type(self) -> ObjectType:
         return ObjectType.DATABASE
 
@@ -75,7 +78,7 @@ class DatabaseResolver(AbstractResolver):
 
     def compare_object(self, bp: DatabaseBlueprint, row: dict):
         result = ResolveResult.NOCHANGE
-        database_params = self.engine.schema_cache.database_params[str(bp.full_name)]
+        database_params = self.engine.schema_cache.get_database_params(str(bp.full_name))
 
         if bp.is_transient != row["is_transient"]:
             if bp.is_transient:
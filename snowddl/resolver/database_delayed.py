@@ -31,7 +31,7 @@ class DatabaseDelayedResolver(AbstractResolver):
 
     def compare_object(self, bp: DatabaseBlueprint, row: dict):
         result = ResolveResult.NOCHANGE
-        database_params = self.engine.schema_cache.database_params[str(bp.full_name)]
+        database_params = self.engine.schema_cache.get_database_params(str(bp.full_name))
 
         if bp.event_table != database_params.get("EVENT_TABLE"):
             if bp.event_table:
@@ -14,7 +14,7 @@ class DatabaseRoleResolver(AbstractResolver):
         existing_objects = {}
 
         # Process schemas in parallel
-        for database_objects in self.engine.executor.map(
+        for database_objects in self.engine.map(
             self.get_existing_objects_in_database, self.engine.schema_cache.databases.values()
         ):
             existing_objects.update(database_objects)
@@ -45,6 +45,17 @@ class DatabaseRoleResolver(AbstractResolver):
     def get_blueprints(self):
         return self.config.get_blueprints_by_type(DatabaseRoleBlueprint)
 
+    def _pre_process(self):
+        # Grants of existing database roles are loaded in bulk, since every compare starts with SHOW GRANTS
+        self.engine.grant_cache.prefetch_grants(
+            ["SHOW GRANTS TO DATABASE ROLE {role_name:i}"],
+            [
+                bp.full_name
+                for full_name, bp in self.blueprints.items()
+                if full_name in self.existing_objects and not self._is_unchanged_since_previous_run(full_name)
+            ],
+        )
+
     def create_object(self, bp: DatabaseRoleBlueprint):
         query = self.engine.query_builder()
 
@@ -135,12 +146,7 @@ class DatabaseRoleResolver(AbstractResolver):
     def get_existing_grants(self, role_name):
         grants = []
 
-        cur = self.engine.execute_meta(
-            "SHOW GRANTS TO DATABASE ROLE {role_name:i}",
-            {
-                "role_name": role_name,
-            },
-        )
+        cur = self.engine.grant_cache.show_grants("SHOW GRANTS TO DATABASE ROLE {role_name:i}", role_name)
 
         for r in cur:
             grants.append(
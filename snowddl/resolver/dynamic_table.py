@@ -6,6 +6,9 @@ from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectReso
 
 class DynamicTableResolver(AbstractSchemaObjectResolver):
     skip_on_empty_blueprints = True
+    skip_unchanged_compare = True
+    skip_unchanged_compare_without_ddl_only = True
+    last_altered_view = "TABLES"
 
     unit_to_seconds_multiplier = {
         "second": 1,
@@ -39,6 +42,7 @@ class DynamicTableResolver(AbstractSchemaObjectResolver):
                 "database": r["database_name"],
                 "schema": r["schema_name"],
                 "name": r["name"],
+                "created_on": r["created_on"],
                 "owner": r["owner"],
                 "is_transient": r["kind"] == "TRANSIENT",
                 "retention_time": r["data_retention_time_in_days"],
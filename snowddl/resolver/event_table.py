@@ -1,9 +1,12 @@
 from snowddl.blueprint import EventTableBlueprint
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult, ObjectType
+from snowddl.resolver.schema_owner_role import SchemaOwnerRoleResolver
 
 
 class EventTableResolver(AbstractSchemaObjectResolver):
+    bulk_show_object_type = "EVENT TABLES"
     skip_on_empty_blueprints = True
+    resolve_after = [SchemaOwnerRoleResolver]
 
     def get_object_type(self) -> ObjectType:
         return ObjectType.EVENT_TABLE
@@ -11,13 +14,7 @@ class EventTableResolver(AbstractSchemaObjectResolver):
     def get_existing_objects_in_schema(self, schema: dict):
         existing_objects = {}
 
-        cur = self.engine.execute_meta(
-            "SHOW EVENT TABLES IN SCHEMA {database:i}.{schema:i}",
-            {
-                "database": schema["database"],
-                "schema": schema["schema"],
-            },
-        )
+        cur = self.show_objects_in_schema(schema)
 
         for r in cur:
             full_name = f"{r['database_name']}.{r['schema_name']}.{r['name']}"
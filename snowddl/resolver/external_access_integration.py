@@ -1,9 +1,12 @@
 from snowddl.blueprint import ExternalAccessIntegrationBlueprint
 from snowddl.resolver.abc_resolver import AbstractResolver, ResolveResult, ObjectType
+from snowddl.resolver.network_rule import NetworkRuleResolver
+from snowddl.resolver.secret import SecretResolver
 
 
 class ExternalAccessIntegrationResolver(AbstractResolver):
     skip_on_empty_blueprints = True
+    resolve_after = [NetworkRuleResolver, SecretResolver]
 
     def get_object_type(self) -> ObjectType:
         return ObjectType.EXTERNAL_ACCESS_INTEGRATION
@@ -25,7 +28,7 @@ class ExternalAccessIntegrationResolver(AbstractResolver):
                 "comment": r["comment"] if r["comment"] else None,
             }
 
-        for name, owner in self.engine.executor.map(self.get_owner_from_grant, existing_objects.keys()):
+        for name, owner in self.engine.map(self.get_owner_from_grant, existing_objects.keys()):
             if owner != self.engine.context.current_role:
                 del existing_objects[name]
 
@@ -1,9 +1,12 @@
 from snowddl.blueprint import ExternalFunctionBlueprint
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult, ObjectType
 from snowddl.resolver._utils import dtypes_from_arguments
+from snowddl.resolver.schema_owner_role import SchemaOwnerRoleResolver
 
 
 class ExternalFunctionResolver(AbstractSchemaObjectResolver):
+    resolve_after = [SchemaOwnerRoleResolver]
+
     def get_object_type(self) -> ObjectType:
         return ObjectType.EXTERNAL_FUNCTION
 
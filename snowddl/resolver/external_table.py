@@ -1,22 +1,21 @@
 from snowddl.blueprint import ExternalTableBlueprint
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult, ObjectType
 from snowddl.resolver._utils import coalesce
+from snowddl.resolver.file_format import FileFormatResolver
+from snowddl.resolver.stage import StageResolver
 
 
 class ExternalTableResolver(AbstractSchemaObjectResolver):
+    bulk_show_object_type = "EXTERNAL TABLES"
+    resolve_after = [FileFormatResolver, StageResolver]
+
     def get_object_type(self) -> ObjectType:
         return ObjectType.EXTERNAL_TABLE
 
     def get_existing_objects_in_schema(self, schema: dict):
         existing_objects = {}
 
-        cur = self.engine.execute_meta(
-            "SHOW EXTERNAL TABLES IN SCHEMA {database:i}.{schema:i}",
-            {
-                "database": schema["database"],
-                "schema": schema["schema"],
-            },
-        )
+        cur = self.show_objects_in_schema(schema)
 
         for r in cur:
             full_name = f"{r['database_name']}.{r['schema_name']}.{r['name']}"
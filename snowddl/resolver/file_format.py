@@ -1,21 +1,20 @@
 from snowddl.blueprint import FileFormatBlueprint
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult, ObjectType
+from snowddl.resolver.schema_owner_role import SchemaOwnerRoleResolver
 
 
 class FileFormatResolver(AbstractSchemaObjectResolver):
+    bulk_show_object_type = "FILE FORMATS"
+    bulk_show_supports_limit = False
+    resolve_after = [SchemaOwnerRoleResolver]
+
     def get_object_type(self) -> ObjectType:
         return ObjectType.FILE_FORMAT
 
     def get_existing_objects_in_schema(self, schema: dict):
         existing_objects = {}
 
-        cur = self.engine.execute_meta(
-            "SHOW FILE FORMATS IN SCHEMA {database:i}.{schema:i}",
-            {
-                "database": schema["database"],
-                "schema": schema["schema"],
-            },
-        )
+        cur = self.show_objects_in_schema(schema)
 
         for r in cur:
             existing_objects[f"{r['database_name']}.{r['schema_name']}.{r['name']}"] = {
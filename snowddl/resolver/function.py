@@ -1,9 +1,17 @@
 from snowddl.blueprint import FunctionBlueprint
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult, ObjectType
 from snowddl.resolver._utils import dtypes_from_arguments
+from snowddl.resolver.external_access_integration import ExternalAccessIntegrationResolver
+from snowddl.resolver.sequence import SequenceResolver
+from snowddl.resolver.stage_file import StageFileResolver
 
 
 class FunctionResolver(AbstractSchemaObjectResolver):
+    resolve_after = [ExternalAccessIntegrationResolver, SequenceResolver, StageFileResolver]
+    skip_unchanged_compare = True
+    last_altered_view = "FUNCTIONS"
+    last_altered_column_prefix = "FUNCTION"
+
     def get_object_type(self) -> ObjectType:
         return ObjectType.FUNCTION
 
@@ -28,6 +36,7 @@ class FunctionResolver(AbstractSchemaObjectResolver):
                 "database": r["catalog_name"],
                 "schema": r["schema_name"],
                 "name": r["name"],
+                "created_on": r["created_on"],
                 "arguments": r["arguments"],
                 "comment": r["description"],
                 "is_aggregate": r["is_aggregate"] == "Y",
@@ -8,12 +8,16 @@ from snowddl.blueprint import (
     TableColumn,
 )
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult, ObjectType
+from snowddl.resolver.function import FunctionResolver
+from snowddl.resolver.sequence import SequenceResolver
 
 collate_type_syntax_re = compile(r"^(.*) COLLATE \'(.*)\'$")
 
 
 class HybridTableResolver(AbstractSchemaObjectResolver):
+    bulk_show_object_type = "HYBRID TABLES"
     skip_on_empty_blueprints = True
+    resolve_after = [FunctionResolver, SequenceResolver]
 
     def get_object_type(self) -> ObjectType:
         return ObjectType.HYBRID_TABLE
@@ -21,13 +25,7 @@ class HybridTableResolver(AbstractSchemaObjectResolver):
     def get_existing_objects_in_schema(self, schema: dict):
         existing_objects = {}
 
-        cur = self.engine.execute_meta(
-            "SHOW HYBRID TABLES IN SCHEMA {database:i}.{schema:i}",
-            {
-                "database": schema["database"],
-                "schema": schema["schema"],
-            },
-        )
+        cur = self.show_objects_in_schema(schema)
 
         for r in cur:
             full_name = f"{r['database_name']}.{r['schema_name']}.{r['name']}"
@@ -281,11 +279,10 @@ class HybridTableResolver(AbstractSchemaObjectResolver):
     def _get_existing_columns(self, bp: HybridTableBlueprint):
         existing_columns = {}
 
-        cur = self.engine.execute_meta(
-            "DESC TABLE {full_name:i}",
-            {
-                "full_name": bp.full_name,
-            },
+        cur = self.engine.table_column_cache.desc_table(
+            str(bp.full_name.database_full_name),
+            bp.full_name.schema,
+            bp.full_name.name,
         )
 
         for r in cur:
@@ -3,7 +3,12 @@ from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectReso
 
 
 class MaterializedViewResolver(AbstractSchemaObjectResolver):
+    bulk_show_object_type = "MATERIALIZED VIEWS"
+    bulk_show_supports_limit = False
     skip_min_edition = Edition.ENTERPRISE
+    skip_unchanged_compare = True
+    skip_unchanged_compare_without_ddl_only = True
+    last_altered_view = "TABLES"
 
     def get_object_type(self) -> ObjectType:
         return ObjectType.MATERIALIZED_VIEW
@@ -11,19 +16,14 @@ class MaterializedViewResolver(AbstractSchemaObjectResolver):
     def get_existing_objects_in_schema(self, schema: dict):
         existing_objects = {}
 
-        cur = self.engine.execute_meta(
-            "SHOW MATERIALIZED VIEWS IN SCHEMA {database:i}.{schema:i}",
-            {
-                "database": schema["database"],
-                "schema": schema["schema"],
-            },
-        )
+        cur = self.show_objects_in_schema(schema)
 
         for r in cur:
             existing_objects[f"{r['database_name']}.{r['schema_name']}.{r['name']}"] = {
                 "database": r["database_name"],
                 "schema": r["schema_name"],
                 "name": r["name"],
+                "created_on": r["created_on"],
                 "owner": r["owner"],
                 "text": str(r["text"]).rstrip(";"),
                 "is_secure": r["is_secure"] == "true",
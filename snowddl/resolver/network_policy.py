@@ -2,10 +2,12 @@ from snowddl.blueprint import AccountObjectIdent, NetworkPolicyBlueprint
 from snowddl.resolver.abc_resolver import AbstractResolver, ResolveResult, ObjectType
 
 from json import loads
+from snowddl.resolver.user import UserResolver
 
 
 class NetworkPolicyResolver(AbstractResolver):
     skip_on_empty_blueprints = True
+    resolve_after = [UserResolver]
 
     def get_object_type(self) -> ObjectType:
         return ObjectType.NETWORK_POLICY
@@ -28,7 +30,7 @@ class NetworkPolicyResolver(AbstractResolver):
 
         # Ownership is not available in SHOW NETWORK POLICIES
         # But it can be derived from grants
-        for name, owner in self.engine.executor.map(self.get_owner_from_grant, existing_objects.keys()):
+        for name, owner in self.engine.map(self.get_owner_from_grant, existing_objects.keys()):
             if owner != self.engine.context.current_role:
                 del existing_objects[name]
 
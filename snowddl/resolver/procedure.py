@@ -1,9 +1,16 @@
 from snowddl.blueprint import ProcedureBlueprint
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult, ObjectType
 from snowddl.resolver._utils import dtypes_from_arguments
+from snowddl.resolver.external_function import ExternalFunctionResolver
+from snowddl.resolver.function import FunctionResolver
 
 
 class ProcedureResolver(AbstractSchemaObjectResolver):
+    resolve_after = [ExternalFunctionResolver, FunctionResolver]
+    skip_unchanged_compare = True
+    last_altered_view = "PROCEDURES"
+    last_altered_column_prefix = "PROCEDURE"
+
     def get_object_type(self) -> ObjectType:
         return ObjectType.PROCEDURE
 
@@ -25,6 +32,7 @@ class ProcedureResolver(AbstractSchemaObjectResolver):
                 "database": r["catalog_name"],
                 "schema": r["schema_name"],
                 "name": r["name"],
+                "created_on": r["created_on"],
                 "arguments": r["arguments"],
                 "comment": r["description"],
             }
@@ -1,9 +1,11 @@
 from snowddl.blueprint import ResourceMonitorBlueprint
 from snowddl.resolver.abc_resolver import AbstractResolver, ResolveResult, ObjectType
+from snowddl.resolver.account_params import AccountParameterResolver
 
 
 class ResourceMonitorResolver(AbstractResolver):
     skip_on_empty_blueprints = True
+    resolve_after = [AccountParameterResolver]
 
     def get_object_type(self) -> ObjectType:
         return ObjectType.RESOURCE_MONITOR
@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Set, Type
+
+from snowddl.resolver.abc_resolver import AbstractResolver
+
+
+class ResolverScheduler:
+    def __init__(self, resolver_sequence: List[Type[AbstractResolver]], max_workers: int = 1):
+        self.resolver_sequence = resolver_sequence
+        self.max_workers = max_workers
+
+        self.dependencies = self.build_dependencies()
+
+    def build_dependencies(self) -> Dict[Type[AbstractResolver], Set[Type[AbstractResolver]]]:
+        dependencies = {}
+
+        for idx, resolver_cls in enumerate(self.resolver_sequence):
+            dependencies[resolver_cls] = self._expand_dependencies(resolver_cls, self.resolver_sequence[:idx])
+
+        return dependencies
+
+    def run(self, resolver_fn: Callable[[Type[AbstractResolver]], AbstractResolver]) -> List[AbstractResolver]:
+        # Run resolvers one by one in exactly the same order as defined in sequence
+        if self.max_workers <= 1:
+            return [resolver_fn(resolver_cls) for resolver_cls in self.resolver_sequence]
+
+        results = {}
+        pending = list(self.resolver_sequence)
+        running = {}
+        completed = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.__class__.__name__) as executor:
+            while pending or running:
+                # Start all resolvers with completed dependencies, in order of sequence
+                for resolver_cls in list(pending):
+                    if len(running) >= self.max_workers:
+                        break
+
+                    if self.dependencies[resolver_cls].issubset(completed):
+                        running[executor.submit(resolver_fn, resolver_cls)] = resolver_cls
+                        pending.remove(resolver_cls)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for f in done:
+                    resolver_cls = running.pop(f)
+
+                    try:
+                        results[resolver_cls] = f.result()
+                    except Exception:
+                        # Do not start any new resolvers, wait for running resolvers and re-raise original exception
+                        wait(running)
+                        raise
+
+                    completed.add(resolver_cls)
+
+        return [results[resolver_cls] for resolver_cls in self.resolver_sequence]
+
+    def _expand_dependencies(self, resolver_cls: Type[AbstractResolver], previous_resolvers: List[Type[AbstractResolver]]):
+        # Resolver without explicit dependencies depends on all previous resolvers in sequence
+        if resolver_cls.resolve_after is None:
+            return set(previous_resolvers)
+
+        dependencies = set()
+
+        for dependency_cls in resolver_cls.resolve_after:
+            if dependency_cls in previous_resolvers:
+                dependencies.add(dependency_cls)
+            elif dependency_cls in self.resolver_sequence:
+                raise ValueError(
+                    f"Resolver [{resolver_cls.__name__}] depends on [{dependency_cls.__name__}], which comes later in sequence"
+                )
+            else:
+                # Dependency is not a part of this sequence, use its own dependencies instead
+                dependencies.update(self._expand_dependencies(dependency_cls, previous_resolvers))
+
+        return dependencies
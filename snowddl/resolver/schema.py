@@ -1,8 +1,11 @@
 from snowddl.blueprint import SchemaBlueprint, DatabaseBlueprint
 from snowddl.resolver.abc_resolver import AbstractResolver, ResolveResult, ObjectType, SnowDDLUnsupportedError
+from snowddl.resolver.database import DatabaseResolver
 
 
 class SchemaResolver(AbstractResolver):
+    resolve_after = [DatabaseResolver]
+
     def get_object_type(self) -> ObjectType:
         return ObjectType.SCHEMA
 
@@ -70,7 +73,7 @@ class SchemaResolver(AbstractResolver):
 
     def compare_object(self, bp: SchemaBlueprint, row: dict):
         result = ResolveResult.NOCHANGE
-        schema_params = self.engine.schema_cache.schema_params[str(bp.full_name)]
+        schema_params = self.engine.schema_cache.get_schema_params(str(bp.full_name))
 
         if bp.is_transient != row["is_transient"]:
             if bp.is_transient:
@@ -265,6 +268,12 @@ class SchemaResolver(AbstractResolver):
 
         return ResolveResult.DROP
 
+    def _pre_process(self):
+        # Parameters are used only to compare existing schemas with blueprints
+        self.engine.schema_cache.prefetch_schema_params(
+            [full_name for full_name in self.blueprints if full_name in self.existing_objects]
+        )
+
     def _post_process(self):
         for result in self.resolved_objects.values():
             if result != ResolveResult.NOCHANGE:
@@ -1,9 +1,11 @@
 from snowddl.blueprint import SecretBlueprint
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult, ObjectType
+from snowddl.resolver.schema_owner_role import SchemaOwnerRoleResolver
 
 
 class SecretResolver(AbstractSchemaObjectResolver):
     skip_on_empty_blueprints = True
+    resolve_after = [SchemaOwnerRoleResolver]
 
     def get_object_type(self) -> ObjectType:
         return ObjectType.SECRET
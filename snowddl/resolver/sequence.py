@@ -1,22 +1,22 @@
 from snowddl.blueprint import SequenceBlueprint
 from snowddl.error import SnowDDLUnsupportedError
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult, ObjectType
+from snowddl.resolver.schema_owner_role import SchemaOwnerRoleResolver
 
 
 class SequenceResolver(AbstractSchemaObjectResolver):
+    bulk_show_object_type = "SEQUENCES"
+    bulk_show_supports_limit = False
+    resolve_after = [SchemaOwnerRoleResolver]
+    runtime_fields = ("last_altered", "next_value")
+
     def get_object_type(self) -> ObjectType:
         return ObjectType.SEQUENCE
 
     def get_existing_objects_in_schema(self, schema: dict):
         existing_objects = {}
 
-        cur = self.engine.execute_meta(
-            "SHOW SEQUENCES IN SCHEMA {database:i}.{schema:i}",
-            {
-                "database": schema["database"],
-                "schema": schema["schema"],
-            },
-        )
+        cur = self.show_objects_in_schema(schema)
 
         for r in cur:
             existing_objects[f"{r['database_name']}.{r['schema_name']}.{r['name']}"] = {
@@ -11,6 +11,9 @@ from snowddl.resolver.abc_role_resolver import AbstractRoleResolver, ObjectType
 
 
 class ShareAccessRoleResolver(AbstractRoleResolver):
+    # Grants are checked on shared databases instead of roles
+    prefetch_grants_sql = ()
+
     def get_role_suffix(self):
         return self.config.SHARE_ACCESS_ROLE_SUFFIX
 
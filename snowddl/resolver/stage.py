@@ -1,22 +1,21 @@
 from snowddl.blueprint import StageBlueprint
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult, ObjectType
 from snowddl.resolver._utils import coalesce, compare_dynamic_param_value
+from snowddl.resolver.file_format import FileFormatResolver
 
 
 class StageResolver(AbstractSchemaObjectResolver):
+    bulk_show_object_type = "STAGES"
+    bulk_show_supports_limit = False
+    resolve_after = [FileFormatResolver]
+
     def get_object_type(self) -> ObjectType:
         return ObjectType.STAGE
 
     def get_existing_objects_in_schema(self, schema: dict):
         existing_objects = {}
 
-        cur = self.engine.execute_meta(
-            "SHOW STAGES IN SCHEMA {database:i}.{schema:i}",
-            {
-                "database": schema["database"],
-                "schema": schema["schema"],
-            },
-        )
+        cur = self.show_objects_in_schema(schema)
 
         for r in cur:
             if "TEMPORARY" in r["type"]:
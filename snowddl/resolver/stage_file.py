@@ -1,13 +1,69 @@
+from collections import defaultdict
+from glob import glob
 from io import BytesIO
 from hashlib import md5
+from math import ceil
 from pathlib import Path
+from tempfile import TemporaryDirectory, mkdtemp
+from threading import Lock
+from typing import Dict, List, Optional, TYPE_CHECKING
 
 from snowddl.blueprint import StageBlueprint, StageFileBlueprint
 from snowddl.error import SnowDDLExecuteError
 from snowddl.resolver.abc_resolver import AbstractResolver, ResolveResult, ObjectType
+from snowddl.resolver.stage import StageResolver
+
+if TYPE_CHECKING:
+    from snowddl.engine import SnowDDLEngine
+
+
+class StageFileUpload:
+    def __init__(self, bps: List[StageFileBlueprint]):
+        self.bps = bps
+
+        self.is_uploaded = False
+        self.error: Optional[Exception] = None
+
+        self._lock = Lock()
+
+    def upload(self, resolver: "StageFileResolver"):
+        with self._lock:
+            if not self.is_uploaded:
+                self.is_uploaded = True
+
+                try:
+                    resolver._upload_files(self.bps)
+                    resolver._upload_md5_markers(self.bps)
+                except Exception as e:
+                    self.error = e
+
+            if self.error:
+                raise self.error
 
 
 class StageFileResolver(AbstractResolver):
+    resolve_after = [StageResolver]
+
+    # Size of chunks used to calculate MD5 of local files
+    md5_chunk_size = 1024 * 1024
+
+    # Files larger than this size are split by PUT into chunks, which are uploaded in parallel
+    put_chunk_size = 64 * 1024 * 1024
+
+    # Maximum value of PARALLEL option for one PUT command
+    put_max_parallel = 16
+
+    def __init__(self, engine: "SnowDDLEngine"):
+        super().__init__(engine)
+
+        self.local_md5: Dict[Path, str] = {}
+
+        # Files of the same local directory are uploaded by one PUT command with wildcard, if all files should be uploaded
+        self.bulk_uploads: Dict[str, StageFileUpload] = {}
+        self.md5_marker_dir: Optional[TemporaryDirectory] = None
+
+        self._lock = Lock()
+
     def get_object_type(self) -> ObjectType:
         return ObjectType.STAGE_FILE
 
@@ -62,17 +118,15 @@ class StageFileResolver(AbstractResolver):
         return self.config.get_blueprints_by_type(StageFileBlueprint)
 
     def create_object(self, bp: StageFileBlueprint):
-        self._upload_file(bp)
-        self._upload_md5_marker(bp)
+        self._upload(bp)
 
         return ResolveResult.CREATE
 
     def compare_object(self, bp: StageFileBlueprint, row: dict):
-        if row["original_md5"] == self._md5_file(bp.local_path):
+        if row["original_md5"] == self._get_local_md5(bp):
             return ResolveResult.NOCHANGE
 
-        self._upload_file(bp)
-        self._upload_md5_marker(bp)
+        self._upload(bp)
 
         return ResolveResult.REPLACE
 
@@ -88,20 +142,102 @@ class StageFileResolver(AbstractResolver):
 
         return ResolveResult.DROP
 
-    def _upload_file(self, bp: StageFileBlueprint):
+    def _pre_process(self):
+        # Local files are hashed in parallel, hashlib releases GIL while processing large chunks
+        local_paths = [bp.local_path for bp in self.blueprints.values()]
+
+        for local_path, local_md5 in zip(local_paths, self.engine.map(self._md5_file, local_paths)):
+            self.local_md5[local_path] = local_md5
+
+        upload_bps_by_dir = defaultdict(list)
+
+        for full_name, bp in self.blueprints.items():
+            existing_object = self.existing_objects.get(full_name)
+
+            if existing_object is None or existing_object["original_md5"] != self._get_local_md5(bp):
+                upload_bps_by_dir[bp.local_path.parent].append(bp)
+
+        for local_dir, bps in upload_bps_by_dir.items():
+            if len(bps) > 1 and self._is_bulk_upload_supported(local_dir, bps):
+                upload = StageFileUpload(bps)
+
+                for bp in bps:
+                    self.bulk_uploads[str(bp.full_name)] = upload
+
+    def _post_process(self):
+        if self.md5_marker_dir:
+            self.md5_marker_dir.cleanup()
+
+    def _is_bulk_upload_supported(self, local_dir: Path, bps: List[StageFileBlueprint]):
+        # Wildcard is expanded by Snowflake connector, directory name must not contain wildcard characters
+        if any(c in str(local_dir) for c in "*?["):
+            return False
+
+        # Wildcard must match files which should be uploaded and nothing else, including files skipped by --target
+        matched_paths = {Path(p) for p in glob(str(local_dir / "*"))}
+
+        if not all(p.is_file() for p in matched_paths):
+            return False
+
+        return matched_paths == {bp.local_path for bp in bps}
+
+    def _upload(self, bp: StageFileBlueprint):
+        if str(bp.full_name) in self.bulk_uploads:
+            self.bulk_uploads[str(bp.full_name)].upload(self)
+        else:
+            self._upload_files([bp])
+            self._upload_md5_markers([bp])
+
+    def _upload_files(self, bps: List[StageFileBlueprint]):
+        if len(bps) == 1:
+            local_path = bps[0].local_path
+        else:
+            local_path = bps[0].local_path.parent / "*"
+
         self.engine.execute_safe_ddl(
-            "PUT {local_path} @{stage_name:i}{stage_target:r} PARALLEL=1 OVERWRITE=TRUE AUTO_COMPRESS=FALSE",
+            "PUT {local_path} @{stage_name:i}{stage_target:r} PARALLEL={parallel:d} OVERWRITE=TRUE AUTO_COMPRESS=FALSE",
             {
-                "local_path": f"file://{bp.local_path.as_posix()}",
-                "stage_name": bp.stage_name,
-                "stage_target": bp.stage_path.parent.as_posix(),
+                "local_path": f"file://{local_path.as_posix()}",
+                "stage_name": bps[0].stage_name,
+                "stage_target": bps[0].stage_path.parent.as_posix(),
+                "parallel": self._get_put_parallel([bp.local_path.stat().st_size for bp in bps]),
+            },
+        )
+
+    def _upload_md5_markers(self, bps: List[StageFileBlueprint]):
+        # Markers are uploaded after files, so interrupted upload is repeated on the next run
+        if len(bps) == 1 or not self.engine.settings.execute_safe_ddl:
+            # Temporary directory is created only if PUT is actually executed
+            # Suggested and saved plan commands would point to directory which no longer exists, file streams are kept instead
+            for bp in bps:
+                self._upload_md5_marker(bp)
+
+            return
+
+        with self._lock:
+            if self.md5_marker_dir is None:
+                self.md5_marker_dir = TemporaryDirectory()
+
+        # Empty marker files of each upload are created in a separate directory and uploaded by one PUT command
+        local_dir = Path(mkdtemp(dir=self.md5_marker_dir.name))
+
+        for bp in bps:
+            (local_dir / self._get_md5_marker_name(bp)).touch()
+
+        self.engine.execute_safe_ddl(
+            "PUT {local_path} @{stage_name:i}{stage_target:r} PARALLEL={parallel:d} OVERWRITE=TRUE AUTO_COMPRESS=FALSE",
+            {
+                "local_path": f"file://{(local_dir / '*').as_posix()}",
+                "stage_name": bps[0].stage_name,
+                "stage_target": bps[0].stage_path.parent.as_posix(),
+                "parallel": self._get_put_parallel([0] * len(bps)),
             },
         )
 
     def _upload_md5_marker(self, bp: StageFileBlueprint):
         # Placeholder path for PUT command, directory does not matter
         # Actual contents of marker pseudo-file is empty and come from zero-length BytesIO in file_stream
-        md5_marker_path = bp.local_path.parent / (bp.local_path.name + f".{self._md5_file(bp.local_path)}.md5")
+        md5_marker_path = bp.local_path.parent / self._get_md5_marker_name(bp)
 
         self.engine.execute_safe_ddl(
             "PUT {local_path} @{stage_name:i}{stage_target:r} PARALLEL=1 OVERWRITE=TRUE AUTO_COMPRESS=FALSE",
@@ -113,11 +249,26 @@ class StageFileResolver(AbstractResolver):
             file_stream=BytesIO(),
         )
 
+    def _get_md5_marker_name(self, bp: StageFileBlueprint):
+        return bp.local_path.name + f".{self._get_local_md5(bp)}.md5"
+
+    def _get_put_parallel(self, file_sizes: List[int]):
+        # Small files are uploaded by separate threads, large files are split into chunks uploaded by separate threads
+        threads = sum(max(1, ceil(file_size / self.put_chunk_size)) for file_size in file_sizes)
+
+        return min(self.put_max_parallel, threads)
+
+    def _get_local_md5(self, bp: StageFileBlueprint):
+        if bp.local_path not in self.local_md5:
+            self.local_md5[bp.local_path] = self._md5_file(bp.local_path)
+
+        return self.local_md5[bp.local_path]
+
     def _md5_file(self, local_path: Path):
         hash_md5 = md5()
 
         with local_path.open("rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            for chunk in iter(lambda: f.read(self.md5_chunk_size), b""):
                 hash_md5.update(chunk)
 
         return hash_md5.hexdigest()
@@ -3,6 +3,8 @@ from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectReso
 
 
 class StreamResolver(AbstractSchemaObjectResolver):
+    bulk_show_object_type = "STREAMS"
+
     object_type_to_source_type_map = {
         ObjectType.EXTERNAL_TABLE: "External Table",
         ObjectType.EVENT_TABLE: "Table",
@@ -18,13 +20,7 @@ class StreamResolver(AbstractSchemaObjectResolver):
     def get_existing_objects_in_schema(self, schema: dict):
         existing_objects = {}
 
-        cur = self.engine.execute_meta(
-            "SHOW STREAMS IN SCHEMA {database:i}.{schema:i}",
-            {
-                "database": schema["database"],
-                "schema": schema["schema"],
-            },
-        )
+        cur = self.show_objects_in_schema(schema)
 
         for r in cur:
             existing_objects[f"{r['database_name']}.{r['schema_name']}.{r['name']}"] = {
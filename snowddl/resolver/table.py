@@ -11,25 +11,37 @@ from snowddl.blueprint import (
     SearchOptimizationItem,
 )
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult, ObjectType
+from snowddl.resolver.clone_table import CloneTableResolver
+from snowddl.resolver.function import FunctionResolver
+from snowddl.resolver.sequence import SequenceResolver
 
 cluster_by_syntax_re = compile(r"^(\w+)?\((.*)\)$")
 collate_type_syntax_re = compile(r"^(.*) COLLATE \'(.*)\'$")
 
 
 class TableResolver(AbstractSchemaObjectResolver):
+    bulk_show_object_type = "TABLES"
+    resolve_after = [CloneTableResolver, FunctionResolver, SequenceResolver]
+    skip_unchanged_compare = True
+    last_altered_view = "TABLES"
+
     def get_object_type(self) -> ObjectType:
         return ObjectType.TABLE
 
+    def _pre_process(self):
+        # Columns of existing tables are described in bulk, since every compare starts with DESC TABLE
+        self.engine.table_column_cache.register_tables(
+            [
+                self.existing_objects[full_name]
+                for full_name in self.blueprints
+                if full_name in self.existing_objects and not self._is_unchanged_since_previous_run(full_name)
+            ]
+        )
+
     def get_existing_objects_in_schema(self, schema: dict):
         existing_objects = {}
 
-        cur = self.engine.execute_meta(
-            "SHOW TABLES IN SCHEMA {database:i}.{schema:i}",
-            {
-                "database": schema["database"],
-                "schema": schema["schema"],
-            },
-        )
+        cur = self.show_objects_in_schema(schema)
 
         for r in cur:
             # Skip other table types
@@ -47,6 +59,7 @@ class TableResolver(AbstractSchemaObjectResolver):
                 "database": r["database_name"],
                 "schema": r["schema_name"],
                 "name": r["name"],
+                "created_on": r["created_on"],
                 "owner": r["owner"],
                 "is_transient": r["kind"] == "TRANSIENT",
                 "retention_time": int(r["retention_time"]),
@@ -384,11 +397,10 @@ class TableResolver(AbstractSchemaObjectResolver):
     def _get_existing_columns(self, bp: TableBlueprint):
         existing_columns = {}
 
-        cur = self.engine.execute_meta(
-            "DESC TABLE {full_name:i}",
-            {
-                "full_name": bp.full_name,
-            },
+        cur = self.engine.table_column_cache.desc_table(
+            str(bp.full_name.database_full_name),
+            bp.full_name.schema,
+            bp.full_name.name,
         )
 
         for r in cur:
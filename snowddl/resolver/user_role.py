@@ -3,18 +3,16 @@ from snowddl.resolver.abc_role_resolver import AbstractRoleResolver, ObjectType
 
 
 class UserRoleResolver(AbstractRoleResolver):
+    # User roles have no future grants
+    prefetch_grants_sql = ("SHOW GRANTS TO ROLE {role_name:i}",)
+
     def get_role_suffix(self):
         return self.config.USER_ROLE_SUFFIX
 
     def get_existing_role_grants(self, role_name):
         grants = []
 
-        cur = self.engine.execute_meta(
-            "SHOW GRANTS TO ROLE {role_name:i}",
-            {
-                "role_name": role_name,
-            },
-        )
+        cur = self.engine.grant_cache.show_grants("SHOW GRANTS TO ROLE {role_name:i}", role_name)
 
         for r in cur:
             # Check ROLE grants only, ignore everything else
@@ -1,23 +1,38 @@
+from re import compile
+from typing import Optional, Set, TYPE_CHECKING
+
 from snowddl.blueprint import ViewBlueprint
 
 from snowddl.error import SnowDDLExecuteError
 from snowddl.resolver.abc_schema_object_resolver import AbstractSchemaObjectResolver, ResolveResult, ObjectType
 
+if TYPE_CHECKING:
+    from snowddl.engine import SnowDDLEngine
+
+
+# Quoted or unquoted identifier in view text
+view_text_ident_re = compile(r'"((?:[^"]|"")*)"|([A-Za-z_][A-Za-z0-9_$]*)')
+
 
 class ViewResolver(AbstractSchemaObjectResolver):
+    bulk_show_object_type = "VIEWS"
+    skip_unchanged_compare = True
+    skip_unchanged_compare_without_ddl_only = True
+    last_altered_view = "VIEWS"
+
+    def __init__(self, engine: "SnowDDLEngine"):
+        super().__init__(engine)
+
+        # Views which might refer to objects changed during this run, None means all views must be checked
+        self.affected_view_names: Optional[Set[str]] = None
+
     def get_object_type(self) -> ObjectType:
         return ObjectType.VIEW
 
     def get_existing_objects_in_schema(self, schema: dict):
         existing_objects = {}
 
-        cur = self.engine.execute_meta(
-            "SHOW VIEWS IN SCHEMA {database:i}.{schema:i}",
-            {
-                "database": schema["database"],
-                "schema": schema["schema"],
-            },
-        )
+        cur = self.show_objects_in_schema(schema)
 
         for r in cur:
             if r["is_materialized"] == "true":
@@ -27,6 +42,7 @@ class ViewResolver(AbstractSchemaObjectResolver):
                 "database": r["database_name"],
                 "schema": r["schema_name"],
                 "name": r["name"],
+                "created_on": r["created_on"],
                 "owner": r["owner"],
                 "text": str(r["text"]).rstrip(";"),
                 "is_secure": r["is_secure"] == "true",
@@ -58,19 +74,8 @@ class ViewResolver(AbstractSchemaObjectResolver):
 
         # If view text is exactly the same
         if row["text"] == str(query):
-            try:
-                # ... and it is possible to query view (underlying objects were not changed)
-                self.engine.describe_meta(
-                    "SELECT * FROM {full_name:i}",
-                    {
-                        "full_name": bp.full_name,
-                    },
-                )
-            except SnowDDLExecuteError as e:
-                self.engine.logger.debug(
-                    f"View [{bp.full_name}] caused describe error [{e.snow_exc.errno}]: {e.snow_exc.raw_msg}"
-                )
-            else:
+            # ... and it is possible to query view (underlying objects were not changed)
+            if self._is_queryable_view(bp):
                 # Comments on views are broken and must be applied separately
                 if bp.comment != row["comment"]:
                     self.engine.execute_safe_ddl(
@@ -114,6 +119,77 @@ class ViewResolver(AbstractSchemaObjectResolver):
 
         return ResolveResult.DROP
 
+    def _resolve_create_compare(self):
+        if self.engine.settings.check_affected_views_only:
+            self.affected_view_names = self._get_affected_view_names()
+
+        super()._resolve_create_compare()
+
+    def _get_affected_view_names(self):
+        # Objects changed by DDL executed before this point, including views dropped by this resolver
+        changed_names = set(self.engine.intention_cache.changed_object_names)
+        referenced_names = {}
+
+        # View referring to changed database or schema might refer to any object inside
+        changed_names.update(self.engine.intention_cache.changed_database_names)
+        changed_names.update(schema_name for _, schema_name in self.engine.intention_cache.changed_schema_names)
+
+        for full_name, bp in self.blueprints.items():
+            referenced_names[full_name] = self._get_referenced_names(bp.text)
+
+            # Views which are going to be created or replaced
+            existing_object = self.existing_objects.get(full_name)
+
+            if existing_object is None or existing_object["text"] != str(self._build_create_view(bp)):
+                changed_names.add(bp.full_name.name)
+
+        affected_view_names = set()
+
+        # Views referring to affected views are affected as well
+        while True:
+            new_affected_view_names = {
+                full_name
+                for full_name, names in referenced_names.items()
+                if full_name not in affected_view_names and not names.isdisjoint(changed_names)
+            }
+
+            if not new_affected_view_names:
+                break
+
+            affected_view_names.update(new_affected_view_names)
+            changed_names.update(self.blueprints[full_name].full_name.name for full_name in new_affected_view_names)
+
+        return affected_view_names
+
+    def _get_referenced_names(self, text: str):
+        names = set()
+
+        for m in view_text_ident_re.finditer(text):
+            if m.group(1) is not None:
+                names.add(m.group(1).replace('""', '"'))
+            else:
+                names.add(m.group(2).upper())
+
+        return names
+
+    def _is_queryable_view(self, bp: ViewBlueprint):
+        # Objects referred by view were not changed during this run, view remains valid
+        if self.affected_view_names is not None and str(bp.full_name) not in self.affected_view_names:
+            return True
+
+        try:
+            self.engine.describe_meta(
+                "SELECT * FROM {full_name:i}",
+                {
+                    "full_name": bp.full_name,
+                },
+            )
+        except SnowDDLExecuteError as e:
+            self.engine.logger.debug(f"View [{bp.full_name}] caused describe error [{e.snow_exc.errno}]: {e.snow_exc.raw_msg}")
+            return False
+
+        return True
+
     def _build_create_view(self, bp: ViewBlueprint):
         query = self.engine.query_builder()
 
@@ -1,9 +1,13 @@
 from snowddl.blueprint import WarehouseBlueprint
 from snowddl.resolver.abc_resolver import AbstractResolver, ResolveResult, ObjectType, Edition
 from snowddl.resolver._utils import compare_dynamic_param_value
+from snowddl.resolver.resource_monitor import ResourceMonitorResolver
 
 
 class WarehouseResolver(AbstractResolver):
+    resolve_after = [ResourceMonitorResolver]
+    runtime_fields = ("state",)
+
     def get_object_type(self) -> ObjectType:
         return ObjectType.WAREHOUSE
 
@@ -295,7 +299,7 @@ class WarehouseResolver(AbstractResolver):
         for result in self.resolved_objects.values():
             if result == ResolveResult.CREATE:
                 # Revert current warehouse to original state if at least one object was created
-                self.engine.execute_context_ddl(
+                self.engine.execute_session_ddl(
                     "USE WAREHOUSE {full_name:i}", {"full_name": self.engine.context.current_warehouse}
                 )
 
@@ -1,8 +1,11 @@
 from snowddl.blueprint import RoleBlueprint, WarehouseBlueprint, Grant, build_role_ident
 from snowddl.resolver.abc_role_resolver import AbstractRoleResolver, ObjectType
+from snowddl.resolver.warehouse import WarehouseResolver
 
 
 class WarehouseUsageRoleResolver(AbstractRoleResolver):
+    resolve_after = [WarehouseResolver]
+
     def get_role_suffix(self):
         return self.config.WAREHOUSE_ACCESS_ROLE_SUFFIX
 
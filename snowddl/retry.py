@@ -0,0 +1,154 @@
+from collections import Counter
+from logging import getLogger, NullHandler
+from random import uniform
+from re import compile, IGNORECASE
+from threading import Lock
+from time import sleep
+from typing import Callable, Optional, TypeVar
+
+from snowflake.connector import Error
+from snowflake.connector.errors import (
+    BadGatewayError,
+    GatewayTimeoutError,
+    InternalServerError,
+    NonRetryableTlsError,
+    OperationalError,
+    OtherHTTPRetryableError,
+    RequestExceedMaxRetryError,
+    RequestTimeoutError,
+    RevocationCheckError,
+    ServiceUnavailableError,
+    TooManyRequests,
+)
+
+logger = getLogger(__name__)
+logger.addHandler(NullHandler())
+
+T = TypeVar("T")
+
+# Snowflake error codes for statements rejected due to concurrency, statement was not applied
+# 000625 - number of waiters for lock exceeds limit
+# Statement timeouts are not throttling, statement might have been running and could fail again after retry
+THROTTLING_ERRNOS = (625,)
+
+# Full phrase only, short fragments (e.g. "429") match unrelated errors mentioning object names or numbers
+# Statements rejected due to concurrency limits of account or warehouse were not started
+THROTTLING_MESSAGES = (
+    "too many requests",
+    "too many concurrent requests",
+    "too many concurrent queries",
+    "exceeded the maximum number of concurrent",
+)
+
+# 000630 - statement reached its statement or warehouse timeout
+# Only timeouts while statement was still queued are throttling, statement did not start and was not applied
+QUEUED_TIMEOUT_ERRNOS = (630,)
+QUEUED_TIMEOUT_MESSAGES = ("statement_queued_timeout_in_seconds", "while queued", "queued for")
+THROTTLING_ERROR_CLASSES = (TooManyRequests,)
+
+# Errors of network and HTTP layer which remain after internal retries of connector
+NETWORK_ERROR_CLASSES = (
+    BadGatewayError,
+    GatewayTimeoutError,
+    InternalServerError,
+    OperationalError,
+    OtherHTTPRetryableError,
+    RequestExceedMaxRetryError,
+    RequestTimeoutError,
+    ServiceUnavailableError,
+)
+NON_RETRYABLE_NETWORK_ERROR_CLASSES = (NonRetryableTlsError, RevocationCheckError)
+
+# Statements which produce the same result when executed more than once
+IDEMPOTENT_SQL_PATTERN = compile(
+    r"^\s*(SHOW|DESC|DESCRIBE|SELECT|USE|GRANT|REVOKE|CREATE\s+OR\s+REPLACE|CREATE\s.*\sIF\s+NOT\s+EXISTS|DROP\s.*\sIF\s+EXISTS)\s",
+    IGNORECASE,
+)
+
+
+def is_throttling_error(e: Error):
+    if isinstance(e, THROTTLING_ERROR_CLASSES) or e.errno in THROTTLING_ERRNOS:
+        return True
+
+    message = str(e.msg or "").lower()
+
+    if e.errno in QUEUED_TIMEOUT_ERRNOS and any(m in message for m in QUEUED_TIMEOUT_MESSAGES):
+        return True
+
+    return any(m in message for m in THROTTLING_MESSAGES)
+
+
+def is_network_error(e: Error):
+    return isinstance(e, NETWORK_ERROR_CLASSES) and not isinstance(e, NON_RETRYABLE_NETWORK_ERROR_CLASSES)
+
+
+def is_idempotent_sql(sql: str):
+    return bool(IDEMPOTENT_SQL_PATTERN.match(sql))
+
+
+# Retries queries failed due to transient errors with capped exponential backoff and full jitter
+# Throttled statements were not applied and are always retried
+# Statements failed due to network errors might have been applied, so only idempotent statements are retried
+class SnowDDLRetryPolicy:
+    def __init__(self, max_retries: int, base_delay: float = 0.5, max_delay: float = 30.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.retry_counts = Counter()
+        self.recovered_count = 0
+        self.exhausted_count = 0
+
+        self._lock = Lock()
+
+    def execute(self, sql: str, fn: Callable[[], T], is_retryable_sql: bool = True) -> T:
+        attempt = 0
+
+        while True:
+            try:
+                result = fn()
+            except Error as e:
+                reason = self.get_retry_reason(e, sql) if is_retryable_sql else None
+
+                if reason is None:
+                    raise
+
+                if attempt >= self.max_retries:
+                    with self._lock:
+                        self.exhausted_count += 1
+
+                    raise
+
+                attempt += 1
+                delay = self.get_delay(attempt)
+
+                with self._lock:
+                    self.retry_counts[reason] += 1
+
+                logger.info(
+                    f"Retrying query after {reason} error in {delay:.2f}s (attempt {attempt} of {self.max_retries}): {e}\n{sql}"
+                )
+                sleep(delay)
+            else:
+                if attempt > 0:
+                    with self._lock:
+                        self.recovered_count += 1
+
+                return result
+
+    def get_retry_reason(self, e: Error, sql: str) -> Optional[str]:
+        if is_throttling_error(e):
+            return "throttling"
+
+        if is_network_error(e) and is_idempotent_sql(sql):
+            return "network"
+
+        return None
+
+    def get_delay(self, attempt: int):
+        # Full jitter spreads retries of many concurrent workers hitting the same limit
+        return uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def get_retry_count(self):
+        with self._lock:
+            return sum(self.retry_counts.values())
@@ -0,0 +1,171 @@
+from base64 import b64decode, b64encode
+from datetime import datetime, timezone
+from io import BytesIO
+from json import dump as json_dump, load as json_load
+from os import replace
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from snowflake.connector import Error
+
+from snowddl.blueprint import get_fingerprint
+from snowddl.settings import SnowDDLSettings
+from snowddl.state import SnowDDLState
+
+
+# Statements resolved by "plan" together with fingerprints of existing objects they were based on
+# Plan is applied later without resolving objects again, if existing objects were not changed since plan was created
+# Steps are stored in order of execution, which respects dependencies between objects
+# Step of object stores fingerprint of this object and results of metadata queries executed for this object (e.g. DESC)
+# Step without object (e.g. pre-process) stores fingerprint of all existing objects of resolver
+class SnowDDLSavedPlan:
+    format_version = 2
+
+    def __init__(self, path: Path, version: str, settings: SnowDDLSettings, scope: str):
+        self.path = path
+        self.version = version
+        self.settings_fingerprint = get_fingerprint(settings.model_dump(exclude=SnowDDLState.ignored_settings))
+        self.scope = scope
+
+        self.object_fingerprints: Dict[str, Dict[str, str]] = {}
+        self.steps: List[Dict] = []
+
+        self._lock = Lock()
+
+    def load(self):
+        if not self.path.is_file():
+            raise ValueError(f"Saved plan path [{self.path}] does not exist or not a file")
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json_load(f)
+
+        if data.get("format_version") != self.format_version or data.get("version") != self.version:
+            raise ValueError(f"Saved plan [{self.path}] was created by another version of SnowDDL")
+
+        if data.get("scope") != self.scope:
+            raise ValueError(f"Saved plan [{self.path}] was created for another account, role or env prefix")
+
+        if data.get("settings_fingerprint") != self.settings_fingerprint:
+            raise ValueError(
+                f"Saved plan [{self.path}] was created with other arguments, use the same arguments for plan and apply"
+            )
+
+        self.steps = data["steps"]
+
+    def save(self):
+        with self._lock:
+            for step in self.steps:
+                step["existing_fingerprint"] = self.get_existing_fingerprint(
+                    self.object_fingerprints.get(step["resolver"], {}), step["object"]
+                )
+
+            data = {
+                "format_version": self.format_version,
+                "version": self.version,
+                "settings_fingerprint": self.settings_fingerprint,
+                "scope": self.scope,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "steps": self.steps,
+            }
+
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json_dump(data, f, indent=2)
+
+        replace(tmp_path, self.path)
+
+    def set_existing_objects(self, resolver: str, existing_objects: Dict[str, Dict], runtime_fields: Tuple[str, ...] = ()):
+        object_fingerprints = self.get_object_fingerprints(existing_objects, runtime_fields)
+
+        with self._lock:
+            self.object_fingerprints[resolver] = object_fingerprints
+
+    def add_step(
+        self, statements: List[Dict], queries: List[Dict], resolver: Optional[str] = None, object_name: Optional[str] = None
+    ):
+        if not statements:
+            return
+
+        with self._lock:
+            self.steps.append(
+                {
+                    "resolver": resolver,
+                    "object": object_name,
+                    "statements": statements,
+                    "queries": queries,
+                }
+            )
+
+    def get_planned_steps_by_resolver(self) -> Dict[str, List[Dict]]:
+        # Staleness check is required only for steps with statements to execute
+        planned_steps = {}
+
+        for step in self.steps:
+            if any(s["execute"] for s in step["statements"]):
+                planned_steps.setdefault(step["resolver"], []).append(step)
+
+        return planned_steps
+
+    def get_statement_count(self):
+        with self._lock:
+            return sum(len(step["statements"]) for step in self.steps)
+
+    @staticmethod
+    def make_statement(sql: str, execute: bool, file_stream: Optional[BytesIO] = None, is_session: bool = False):
+        statement = {
+            "sql": sql,
+            "execute": execute,
+        }
+
+        if file_stream is not None:
+            statement["file_stream"] = b64encode(file_stream.getvalue()).decode("ascii")
+
+        if is_session:
+            statement["session"] = True
+
+        return statement
+
+    @staticmethod
+    def make_query(sql: str, fingerprint: str, is_describe: bool = False):
+        query = {
+            "sql": sql,
+            "fingerprint": fingerprint,
+        }
+
+        if is_describe:
+            query["describe"] = True
+
+        return query
+
+    @staticmethod
+    def get_query_fingerprint(rows: Optional[List] = None, error: Optional[Error] = None):
+        # Order of rows is not guaranteed for some metadata queries (e.g. SELECT from table functions)
+        if error is not None:
+            return get_fingerprint({"errno": error.errno})
+
+        return get_fingerprint(sorted(get_fingerprint(r) for r in rows))
+
+    @staticmethod
+    def get_object_fingerprints(existing_objects: Dict[str, Dict], runtime_fields: Tuple[str, ...] = ()) -> Dict[str, str]:
+        # Runtime fields might change between plan and apply without any changes of configuration
+        return {
+            full_name: get_fingerprint({k: v for k, v in row.items() if k not in runtime_fields})
+            for full_name, row in existing_objects.items()
+        }
+
+    @staticmethod
+    def get_existing_fingerprint(object_fingerprints: Dict[str, str], object_name: Optional[str]) -> Optional[str]:
+        # Object which did not exist must not exist when plan is applied
+        if object_name is None:
+            return get_fingerprint(object_fingerprints)
+
+        return object_fingerprints.get(object_name)
+
+    @staticmethod
+    def get_file_stream(statement: Dict) -> Optional[BytesIO]:
+        if "file_stream" in statement:
+            return BytesIO(b64decode(statement["file_stream"]))
+
+        return None
@@ -1,6 +1,6 @@
 from typing import Optional, List
 
-from snowddl.blueprint import DatabaseIdent, ObjectType, Ident
+from snowddl.blueprint import DatabaseIdent, ObjectType, Ident, IdentPattern
 from snowddl.model import BaseModelWithConfig
 
 
@@ -31,8 +31,21 @@ class SnowDDLSettings(BaseModelWithConfig):
     exclude_object_types: List[ObjectType] = []
     include_object_types: List[ObjectType] = []
     include_databases: List[DatabaseIdent] = []
+    target: Optional[IdentPattern] = None
+    check_affected_views_only: bool = False
     ignore_ownership: bool = False
     max_workers: int = 32
+    max_resolver_workers: int = 1
+    connection_pool_size: int = 0
+    execute_async_ddl: bool = False
+    max_async_queries: int = 200
+    max_batch_statements: int = 0
+    adaptive_concurrency: bool = False
+    max_query_retries: int = 0
+    metadata_cache_path: Optional[str] = None
+    metadata_cache_ttl: int = 3600
+    state_file_path: Optional[str] = None
+    saved_plan_path: Optional[str] = None
 
     # Options specific for snowddl-convert
     convert_function_body_to_file: bool = False
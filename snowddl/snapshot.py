@@ -0,0 +1,279 @@
+from base64 import b64decode, b64encode
+from collections import defaultdict
+from datetime import date, datetime, time
+from decimal import Decimal
+from gzip import open as gzip_open
+from json import dump as json_dump, load as json_load
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional
+
+from snowflake.connector import SnowflakeConnection, errors as snowflake_errors
+from snowflake.connector.cursor import ResultMetadata
+
+
+# Collection of query results captured from Snowflake, keyed by formatted SQL text
+# The same SQL text may be executed more than once with different results (e.g. SHOW after CREATE)
+# All results are stored in order of execution and returned in the same order during replay
+# The last result is returned repeatedly if query was executed more times than it was recorded
+class SnowDDLSnapshot:
+    format_version = 1
+
+    def __init__(self):
+        self.execute_results: Dict[str, List[dict]] = defaultdict(list)
+        self.describe_results: Dict[str, List[dict]] = defaultdict(list)
+
+        self._replay_positions: Dict[tuple, int] = defaultdict(int)
+        self._lock = Lock()
+
+    @classmethod
+    def load(cls, path: Path):
+        snapshot = cls()
+
+        with gzip_open(path, "rt", encoding="utf-8") as f:
+            data = json_load(f, object_hook=decode_json_value)
+
+        if data.get("format_version") != cls.format_version:
+            raise ValueError(f"Snapshot [{path}] has unsupported format version [{data.get('format_version')}]")
+
+        snapshot.execute_results.update(data["execute"])
+        snapshot.describe_results.update(data["describe"])
+
+        return snapshot
+
+    def save(self, path: Path):
+        data = {
+            "format_version": self.format_version,
+            "execute": self.execute_results,
+            "describe": self.describe_results,
+        }
+
+        with gzip_open(path, "wt", encoding="utf-8") as f:
+            json_dump(data, f, default=encode_json_value, separators=(",", ":"))
+
+    def add_execute_result(self, sql: str, result: dict):
+        with self._lock:
+            self.execute_results[sql].append(result)
+
+    def add_describe_result(self, sql: str, result: dict):
+        with self._lock:
+            self.describe_results[sql].append(result)
+
+    def get_execute_result(self, sql: str) -> Optional[dict]:
+        return self._get_result(self.execute_results, "execute", sql)
+
+    def get_describe_result(self, sql: str) -> Optional[dict]:
+        return self._get_result(self.describe_results, "describe", sql)
+
+    def _get_result(self, results: Dict[str, List[dict]], kind: str, sql: str):
+        if sql not in results:
+            return None
+
+        with self._lock:
+            position = self._replay_positions[(kind, sql)]
+            self._replay_positions[(kind, sql)] = position + 1
+
+        return results[sql][min(position, len(results[sql]) - 1)]
+
+
+# Minimal cursor holding pre-fetched rows, compatible with DictCursor usage in SnowDDL
+class SnowDDLSnapshotCursor:
+    def __init__(self, rows: List[dict], rowcount: Optional[int] = None, sfqid: Optional[str] = None):
+        self._rows = rows
+        self._position = 0
+
+        self.rowcount = len(rows) if rowcount is None else rowcount
+        self.sfqid = sfqid
+
+    def __iter__(self):
+        while self._position < len(self._rows):
+            yield self.fetchone()
+
+    def fetchone(self):
+        if self._position >= len(self._rows):
+            return None
+
+        row = self._rows[self._position]
+        self._position += 1
+
+        return row
+
+    def fetchall(self):
+        rows = self._rows[self._position :]
+        self._position = len(self._rows)
+
+        return rows
+
+
+# Wrapper for Snowflake connection, which records results of all executed queries into snapshot file
+# Snapshot file is written on connection close
+class SnowDDLRecordConnection:
+    def __init__(self, connection: SnowflakeConnection, snapshot_path: Path):
+        self.connection = connection
+        self.snapshot_path = snapshot_path
+        self.snapshot = SnowDDLSnapshot()
+
+    def cursor(self, cursor_class):
+        return SnowDDLRecordCursor(self, self.connection.cursor(cursor_class))
+
+    def close(self):
+        self.connection.close()
+        self.snapshot.save(self.snapshot_path)
+
+
+class SnowDDLRecordCursor:
+    def __init__(self, record_connection: SnowDDLRecordConnection, cursor):
+        self.record_connection = record_connection
+        self.cursor = cursor
+
+    def execute(self, sql, **kwargs):
+        try:
+            self.cursor.execute(sql, **kwargs)
+        except snowflake_errors.Error as e:
+            self.record_connection.snapshot.add_execute_result(sql, _error_to_result(e))
+            raise
+
+        rows = self.cursor.fetchall()
+
+        self.record_connection.snapshot.add_execute_result(
+            sql,
+            {
+                "rows": rows,
+                "rowcount": self.cursor.rowcount,
+                "sfqid": self.cursor.sfqid,
+            },
+        )
+
+        return SnowDDLSnapshotCursor(rows, self.cursor.rowcount, self.cursor.sfqid)
+
+    def describe(self, sql, **kwargs):
+        try:
+            metadata = self.cursor.describe(sql, **kwargs)
+        except snowflake_errors.Error as e:
+            self.record_connection.snapshot.add_describe_result(sql, _error_to_result(e))
+            raise
+
+        self.record_connection.snapshot.add_describe_result(
+            sql,
+            {
+                "metadata": [list(m) for m in metadata] if metadata else [],
+            },
+        )
+
+        return metadata
+
+
+# Replacement for Snowflake connection, which serves results of queries from snapshot file
+# No queries are sent to Snowflake; query missing in snapshot raises an error
+class SnowDDLReplayConnection:
+    def __init__(self, snapshot_path: Path):
+        self.snapshot_path = snapshot_path
+        self.snapshot = SnowDDLSnapshot.load(snapshot_path)
+
+    def cursor(self, cursor_class):
+        return SnowDDLReplayCursor(self)
+
+    def close(self):
+        pass
+
+
+class SnowDDLReplayCursor:
+    def __init__(self, replay_connection: SnowDDLReplayConnection):
+        self.replay_connection = replay_connection
+
+    def execute(self, sql, **kwargs):
+        result = self.replay_connection.snapshot.get_execute_result(sql)
+
+        if result is None:
+            raise _missing_query_error(self.replay_connection.snapshot_path)
+
+        if "error" in result:
+            raise _result_to_error(result)
+
+        return SnowDDLSnapshotCursor(result["rows"], result["rowcount"], result["sfqid"])
+
+    def describe(self, sql, **kwargs):
+        result = self.replay_connection.snapshot.get_describe_result(sql)
+
+        if result is None:
+            raise _missing_query_error(self.replay_connection.snapshot_path)
+
+        if "error" in result:
+            raise _result_to_error(result)
+
+        return [ResultMetadata(*m) for m in result["metadata"]]
+
+
+def _error_to_result(e: snowflake_errors.Error):
+    return {
+        "error": {
+            "class": e.__class__.__name__,
+            "message": e.raw_msg,
+            "errno": e.errno,
+            "sqlstate": e.sqlstate,
+            "sfqid": e.sfqid,
+        }
+    }
+
+
+def _result_to_error(result: dict):
+    error_cls = getattr(snowflake_errors, result["error"]["class"], snowflake_errors.Error)
+
+    if not (isinstance(error_cls, type) and issubclass(error_cls, snowflake_errors.Error)):
+        error_cls = snowflake_errors.Error
+
+    return error_cls(
+        msg=result["error"]["message"],
+        errno=result["error"]["errno"],
+        sqlstate=result["error"]["sqlstate"],
+        sfqid=result["error"]["sfqid"],
+        send_telemetry=False,
+    )
+
+
+def _missing_query_error(snapshot_path: Path):
+    return snowflake_errors.ProgrammingError(
+        msg=f"Query was not found in snapshot [{snapshot_path}], please record snapshot again",
+        send_telemetry=False,
+    )
+
+
+def encode_json_value(value):
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+
+    if isinstance(value, time):
+        return {"$time": value.isoformat()}
+
+    if isinstance(value, Decimal):
+        return {"$decimal": str(value)}
+
+    if isinstance(value, (bytes, bytearray)):
+        return {"$bytes": b64encode(value).decode("ascii")}
+
+    raise TypeError(f"Value of type [{value.__class__.__name__}] cannot be stored in snapshot")
+
+
+def decode_json_value(obj: dict):
+    if len(obj) == 1:
+        key, value = next(iter(obj.items()))
+
+        if key == "$datetime":
+            return datetime.fromisoformat(value)
+
+        if key == "$date":
+            return date.fromisoformat(value)
+
+        if key == "$time":
+            return time.fromisoformat(value)
+
+        if key == "$decimal":
+            return Decimal(value)
+
+        if key == "$bytes":
+            return b64decode(value)
+
+    return obj
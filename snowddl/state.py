@@ -0,0 +1,105 @@
+from json import dump as json_dump, load as json_load
+from os import replace
+from pathlib import Path
+from threading import Lock
+from typing import Dict
+
+from snowddl.blueprint import ObjectType, get_fingerprint
+from snowddl.settings import SnowDDLSettings
+
+
+# Local state of objects which were verified to match blueprints during previous runs
+# Each object is stored with fingerprint of blueprint and fingerprint of existing object observed in Snowflake
+# State is discarded entirely if it was produced by different version, settings or scope (account, role, env prefix)
+class SnowDDLState:
+    format_version = 1
+
+    # Settings which affect performance and outputs only, changing these settings does not discard state
+    ignored_settings = {
+        "max_workers",
+        "max_resolver_workers",
+        "connection_pool_size",
+        "execute_async_ddl",
+        "max_async_queries",
+        "max_batch_statements",
+        "adaptive_concurrency",
+        "max_query_retries",
+        "metadata_cache_path",
+        "metadata_cache_ttl",
+        "state_file_path",
+        "saved_plan_path",
+    }
+
+    def __init__(self, path: Path, version: str, settings: SnowDDLSettings, scope: str):
+        self.path = path
+        self.version = version
+        self.settings_fingerprint = get_fingerprint(settings.model_dump(exclude=self.ignored_settings))
+        self.scope = scope
+
+        self.objects: Dict[str, Dict[str, Dict[str, str]]] = {}
+        self.skip_count = 0
+
+        self._lock = Lock()
+
+    def load(self):
+        if not self.path.is_file():
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json_load(f)
+        except (OSError, ValueError):
+            # Broken state file is ignored and overwritten on save
+            return
+
+        if (
+            data.get("format_version") != self.format_version
+            or data.get("version") != self.version
+            or data.get("settings_fingerprint") != self.settings_fingerprint
+            or data.get("scope") != self.scope
+        ):
+            return
+
+        self.objects = data.get("objects", {})
+
+    def save(self):
+        with self._lock:
+            data = {
+                "format_version": self.format_version,
+                "version": self.version,
+                "settings_fingerprint": self.settings_fingerprint,
+                "scope": self.scope,
+                "objects": {object_type: dict(sorted(objects.items())) for object_type, objects in sorted(self.objects.items())},
+            }
+
+        # State file is replaced atomically, interrupted write never leaves partially written file
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json_dump(data, f, indent=2)
+
+        replace(tmp_path, self.path)
+
+    def is_unchanged(self, object_type: ObjectType, full_name: str, blueprint_fingerprint: str, existing_fingerprint: str):
+        with self._lock:
+            entry = self.objects.get(object_type.name, {}).get(full_name)
+
+        if entry is None:
+            return False
+
+        return entry["blueprint"] == blueprint_fingerprint and entry["existing"] == existing_fingerprint
+
+    def set_unchanged(self, object_type: ObjectType, full_name: str, blueprint_fingerprint: str, existing_fingerprint: str):
+        with self._lock:
+            self.objects.setdefault(object_type.name, {})[full_name] = {
+                "blueprint": blueprint_fingerprint,
+                "existing": existing_fingerprint,
+            }
+
+    def add_skipped(self):
+        with self._lock:
+            self.skip_count += 1
+
+    def remove(self, object_type: ObjectType, full_name: str):
+        with self._lock:
+            self.objects.get(object_type.name, {}).pop(full_name, None)
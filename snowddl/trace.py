@@ -0,0 +1,87 @@
+from contextlib import contextmanager
+from json import dump as json_dump
+from os import getpid
+from pathlib import Path
+from threading import Lock, current_thread, get_ident as threading_get_ident, local as threading_local
+from time import perf_counter
+from typing import Dict, List
+
+
+# Collects execution spans and writes them in Chrome trace event format (Perfetto, speedscope, chrome://tracing)
+# Arguments of span are inherited by nested spans in the same thread, e.g. resolver and object name for SQL spans
+class SnowDDLTracer:
+    def __init__(self, path: Path):
+        self.path = path
+        self.events: List[Dict] = []
+
+        self._pid = getpid()
+        self._start_counter = perf_counter()
+        self._thread_names: Dict[int, str] = {}
+        self._thread_local = threading_local()
+        self._lock = Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str, **args):
+        parent_args = getattr(self._thread_local, "args", {})
+        span_args = {**parent_args, **args}
+
+        self._thread_local.args = span_args
+        start_counter = perf_counter()
+
+        try:
+            yield span_args
+        finally:
+            end_counter = perf_counter()
+            self._thread_local.args = parent_args
+
+            self._add_event(name, category, start_counter, end_counter, span_args)
+
+    def wrap(self, fn, name: str, category: str, **args):
+        # Function is executed inside span, used for tasks running in worker threads
+        def wrapper(*fn_args):
+            with self.span(name, category, **args):
+                return fn(*fn_args)
+
+        return wrapper
+
+    def get_current_args(self):
+        return dict(getattr(self._thread_local, "args", {}))
+
+    def save(self):
+        with self._lock:
+            events = list(self.events)
+            thread_names = dict(self._thread_names)
+
+        for tid, thread_name in thread_names.items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self._pid,
+                    "tid": tid,
+                    "args": {"name": thread_name},
+                }
+            )
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            json_dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+    def _add_event(self, name: str, category: str, start_counter: float, end_counter: float, args: Dict):
+        tid = threading_get_ident()
+
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((start_counter - self._start_counter) * 1000000, 3),
+            "dur": round((end_counter - start_counter) * 1000000, 3),
+            "pid": self._pid,
+            "tid": tid,
+            "args": {"thread_id": tid, **args},
+        }
+
+        with self._lock:
+            self.events.append(event)
+
+            if tid not in self._thread_names:
+                self._thread_names[tid] = current_thread().name
@@ -1,4 +1,4 @@
-from .abc_validator import AbstractValidator
+from .abc_validator import AbstractValidator, AbstractDependsOnValidator
 from .business_role import BusinessRoleValidator
 from .database import DatabaseValidator
 from .dynamic_table import DynamicTableValidator
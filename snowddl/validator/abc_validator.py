@@ -3,7 +3,7 @@ from logging import getLogger, NullHandler
 from traceback import TracebackException
 from typing import Dict
 
-from snowddl.blueprint import AbstractBlueprint
+from snowddl.blueprint import AbstractBlueprint, DependencyGraph, DependsOnMixin
 from snowddl.config import SnowDDLConfig
 
 
@@ -35,3 +35,21 @@ class AbstractValidator(ABC):
     @abstractmethod
     def get_blueprints(self) -> Dict[str, AbstractBlueprint]:
         pass
+
+
+class AbstractDependsOnValidator(AbstractValidator):
+    def __init__(self, config: SnowDDLConfig):
+        super().__init__(config)
+
+        self.dependency_graph = DependencyGraph()
+
+    def validate(self):
+        # Graph is built once for all blueprints, cycles are reported for each blueprint in cycle
+        self.dependency_graph = DependencyGraph.build_from_blueprints(self.get_blueprints())
+        super().validate()
+
+    def _validate_depends_on_cycle(self, bp: DependsOnMixin, object_type_name: str):
+        cycle = self.dependency_graph.get_cycle(str(bp.full_name))
+
+        if cycle:
+            raise ValueError(f"{object_type_name} [{bp.full_name}] is a part of circular dependency [{', '.join(cycle)}]")
@@ -1,8 +1,8 @@
 from snowddl.blueprint import DynamicTableBlueprint
-from snowddl.validator.abc_validator import AbstractValidator
+from snowddl.validator.abc_validator import AbstractDependsOnValidator
 
 
-class DynamicTableValidator(AbstractValidator):
+class DynamicTableValidator(AbstractDependsOnValidator):
     def get_blueprints(self):
         return self.config.get_blueprints_by_type(DynamicTableBlueprint)
 
@@ -30,3 +30,5 @@ class DynamicTableValidator(AbstractValidator):
                     f"Dynamic table [{bp.full_name}] depends on another dynamic table "
                     f"[{depends_on_name}] which does not exist in config"
                 )
+
+        self._validate_depends_on_cycle(bp, "Dynamic table")
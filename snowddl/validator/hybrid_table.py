@@ -1,8 +1,8 @@
 from snowddl.blueprint import HybridTableBlueprint
-from snowddl.validator.abc_validator import AbstractValidator
+from snowddl.validator.abc_validator import AbstractDependsOnValidator
 
 
-class HybridTableValidator(AbstractValidator):
+class HybridTableValidator(AbstractDependsOnValidator):
     def get_blueprints(self):
         return self.config.get_blueprints_by_type(HybridTableBlueprint)
 
@@ -19,3 +19,5 @@ class HybridTableValidator(AbstractValidator):
                     f"Hybrid table [{bp.full_name}] depends on another hybrid table "
                     f"[{depends_on_name}] which does not exist in config"
                 )
+
+        self._validate_depends_on_cycle(bp, "Hybrid table")
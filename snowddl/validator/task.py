@@ -1,8 +1,8 @@
 from snowddl.blueprint import TaskBlueprint
-from snowddl.validator.abc_validator import AbstractValidator
+from snowddl.validator.abc_validator import AbstractDependsOnValidator
 
 
-class TaskValidator(AbstractValidator):
+class TaskValidator(AbstractDependsOnValidator):
     def get_blueprints(self):
         return self.config.get_blueprints_by_type(TaskBlueprint)
 
@@ -18,3 +18,5 @@ class TaskValidator(AbstractValidator):
                 raise ValueError(
                     f"Task [{bp.full_name}] depends on another task " f"[{depends_on_name}] which does not exist in config"
                 )
+
+        self._validate_depends_on_cycle(bp, "Task")
@@ -1,8 +1,8 @@
 from snowddl.blueprint import ViewBlueprint
-from snowddl.validator.abc_validator import AbstractValidator
+from snowddl.validator.abc_validator import AbstractDependsOnValidator
 
 
-class ViewValidator(AbstractValidator):
+class ViewValidator(AbstractDependsOnValidator):
     def get_blueprints(self):
         return self.config.get_blueprints_by_type(ViewBlueprint)
 
@@ -18,3 +18,5 @@ class ViewValidator(AbstractValidator):
                 raise ValueError(
                     f"View [{bp.full_name}] depends on another view " f"[{depends_on_name}] which does not exist in config"
                 )
+
+        self._validate_depends_on_cycle(bp, "View")